@@ -0,0 +1,429 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from consultas import contar_questoes
+
+# Dimensões do cubo de contagens. Cada questão cai em exatamente uma célula,
+# então somar "Quantidade" dá o número de questões (sem contagem dupla).
+DIMENSOES_CUBO = ["Ano", "Frente", "Tópico", "Tipo", "Subtópico 1", "Subtópico 2"]
+COLUNAS_SUBTOPICOS = ["Subtópico 1", "Subtópico 2"]
+
+# Colunas com contagens acumuladas por ano no índice de anos
+COLUNAS_PREFIXOS = ["Frente", "Tipo", "Tópico"]
+
+
+def construir_cubo(estado, nome_da_aba, aplicacoes=None):
+    """
+    Agrega as questões num cubo de contagens (Ano, Frente, Tópico, Tipo, Subtópicos).
+    A contagem sobre as questões é a parte pesada: roda no motor de consultas
+    (consultas.py, DuckDB ou numpy sobre os códigos da base compacta).
+    :param estado: Estado dos dados (utils.estado_dados())
+    :param nome_da_aba: Disciplina (aba) agregada
+    :param aplicacoes: Aplicações da prova incluídas (None = todas); só as partições
+                       delas são lidas
+    :return: DataFrame com as colunas DIMENSOES_CUBO + "Quantidade", ordenado por Ano
+    """
+    # Ano é a primeira dimensão: as combinações já saem ordenadas por Ano
+    cubo = contar_questoes(estado, nome_da_aba, DIMENSOES_CUBO, aplicacoes=aplicacoes)
+    if cubo.empty:
+        return pd.DataFrame(columns=DIMENSOES_CUBO + ["Quantidade"])
+    return cubo
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _cubo_em_cache(nome_da_aba, versao, aplicacoes, _estado):
+    # _estado não entra na chave: a versão da aba já identifica o conteúdo.
+    # Sem spinner: também é chamada pela thread do observador de dados
+    return construir_cubo(_estado, nome_da_aba, aplicacoes)
+
+
+def carregar_cubo(estado, nome_da_aba, versao, aplicacoes=None):
+    """
+    Cubo de contagens da disciplina, construído uma vez por versão da aba e seleção
+    de aplicações.
+    :param estado: Estado dos dados (utils.estado_dados())
+    :param nome_da_aba: Nome da aba, usado na chave do cache
+    :param versao: Versão da aba no mesmo estado (estado["versoes_abas"])
+    :param aplicacoes: Tupla de aplicações (None = todas), também na chave do cache
+    """
+    return _cubo_em_cache(nome_da_aba, versao, aplicacoes, estado)
+
+
+def construir_indice_anos(tabela, pesos="Quantidade"):
+    """
+    Índice ano -> linhas e contagens acumuladas por ano para uma tabela ordenada por Ano.
+    Com ele, um intervalo [ano_inicio, ano_fim] vira uma fatia e os totais viram
+    a diferença de duas somas de prefixo.
+    :param tabela: Cubo (ou questões) ordenado por Ano
+    :param pesos: Coluna com o peso de cada linha; None conta 1 por linha
+    :return: dict com "anos", "inicio" (deslocamento da 1ª linha de cada ano, com
+             o total de linhas no fim), "total" e "prefixos" {coluna: (categorias, matriz)}
+    """
+    anos_linhas = tabela["Ano"].to_numpy()
+    anos, inicio = np.unique(anos_linhas, return_index=True)
+    inicio = np.append(inicio, len(tabela))
+
+    # Posição do ano de cada linha (0..n_anos-1)
+    posicao_ano = np.repeat(np.arange(len(anos)), np.diff(inicio))
+    peso = np.ones(len(tabela), dtype=np.int64) if pesos is None else tabela[pesos].to_numpy(dtype=np.int64)
+
+    total = np.zeros(len(anos) + 1, dtype=np.int64)
+    total[1:] = np.cumsum(np.bincount(posicao_ano, weights=peso, minlength=len(anos)).astype(np.int64))
+
+    prefixos = {}
+    for coluna in COLUNAS_PREFIXOS:
+        if coluna not in tabela.columns:
+            continue
+        categorias = tabela[coluna].astype("category").cat
+        codigos = categorias.codes.to_numpy()
+        n_categorias = len(categorias.categories)
+        validos = codigos >= 0
+
+        contagem = np.bincount(
+            posicao_ano[validos] * n_categorias + codigos[validos],
+            weights=peso[validos],
+            minlength=len(anos) * n_categorias,
+        ).reshape(len(anos), n_categorias)
+
+        matriz = np.zeros((len(anos) + 1, n_categorias), dtype=np.int64)
+        np.cumsum(contagem, axis=0, out=matriz[1:])
+        prefixos[coluna] = (categorias.categories, matriz)
+
+    return {"anos": anos, "inicio": inicio, "total": total, "prefixos": prefixos}
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _indice_em_cache(nome_da_aba, versao, aplicacoes, _cubo):
+    return construir_indice_anos(_cubo)
+
+
+def carregar_indice_anos(cubo, nome_da_aba, versao, aplicacoes=None):
+    """
+    Índice de anos do cubo da disciplina, construído uma vez por versão da aba.
+    :param cubo: Cubo devolvido por carregar_cubo
+    :param nome_da_aba: Nome da aba, usado na chave do cache
+    :param versao: A mesma versão usada em carregar_cubo
+    :param aplicacoes: As mesmas aplicações usadas em carregar_cubo
+    """
+    return _indice_em_cache(nome_da_aba, versao, aplicacoes, cubo)
+
+
+def _posicoes_anos(indice, ano_inicio, ano_fim):
+    # Intervalo [i, j) de posições de ano dentro de [ano_inicio, ano_fim]
+    i = np.searchsorted(indice["anos"], ano_inicio, side="left")
+    j = np.searchsorted(indice["anos"], ano_fim, side="right")
+    return i, max(i, j)
+
+
+def fatiar_anos(tabela, indice, ano_inicio, ano_fim):
+    """
+    Linhas de [ano_inicio, ano_fim] como uma fatia (sem máscara booleana).
+    :param tabela: A mesma tabela usada para construir o índice
+    """
+    i, j = _posicoes_anos(indice, ano_inicio, ano_fim)
+    return tabela.iloc[indice["inicio"][i]:indice["inicio"][j]]
+
+
+def contar_total(indice, ano_inicio, ano_fim):
+    """Total de questões em [ano_inicio, ano_fim] pela diferença das somas de prefixo."""
+    i, j = _posicoes_anos(indice, ano_inicio, ano_fim)
+    return int(indice["total"][j] - indice["total"][i])
+
+
+def contar_por_categoria(indice, coluna, ano_inicio, ano_fim):
+    """
+    Questões por categoria em [ano_inicio, ano_fim], sem percorrer as linhas.
+    :param coluna: Uma das COLUNAS_PREFIXOS
+    :return: DataFrame [coluna, "Quantidade"], do maior para o menor (como contar)
+    """
+    i, j = _posicoes_anos(indice, ano_inicio, ano_fim)
+    categorias, matriz = indice["prefixos"][coluna]
+    contagem = pd.DataFrame({coluna: categorias, "Quantidade": matriz[j] - matriz[i]})
+    contagem = contagem[contagem["Quantidade"] > 0]
+    return contagem.sort_values("Quantidade", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _mascara_codigos(serie, valores):
+    # Valores fora das categorias não casam com nada (nem com as linhas vazias, código -1)
+    codigos = serie.cat.categories.get_indexer(valores)
+    return np.isin(serie.cat.codes.to_numpy(), codigos[codigos >= 0])
+
+
+def filtrar_cubo(cubo, frentes=None, topico=None):
+    """
+    Recorta o cubo por Frente(s) e/ou Tópico. Para anos, use fatiar_anos.
+    Compara os códigos das categorias, não os textos.
+    :param frentes: Uma Frente (str) ou uma lista de Frentes
+    """
+    mascara = np.ones(len(cubo), dtype=bool)
+    if frentes is not None:
+        if isinstance(frentes, str):
+            frentes = [frentes]
+        mascara &= _mascara_codigos(cubo["Frente"], frentes)
+    if topico is not None:
+        mascara &= _mascara_codigos(cubo["Tópico"], [topico])
+    return cubo[mascara]
+
+
+def contar(cubo, por):
+    """
+    Soma as contagens do cubo agrupando pela(s) coluna(s) pedida(s).
+    Equivale a value_counts()/groupby().size() sobre as questões originais.
+    :param por: Nome de coluna ou lista de colunas
+    :return: DataFrame [por..., "Quantidade"], do maior para o menor
+    """
+    por = [por] if isinstance(por, str) else list(por)
+    contagem = (
+        cubo.groupby(por, observed=True)["Quantidade"]
+        .sum()
+        .reset_index()
+    )
+    contagem = contagem[contagem["Quantidade"] > 0]
+    return contagem.sort_values("Quantidade", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _conteudos(cubo):
+    # Um único dicionário de conteúdos para as duas colunas de subtópico, em ordem alfabética
+    return sorted(
+        set(cubo[COLUNAS_SUBTOPICOS[0]].dropna().astype(str)) | set(cubo[COLUNAS_SUBTOPICOS[1]].dropna().astype(str))
+    )
+
+
+def _codigos_conteudos(cubo, coluna, conteudos):
+    return pd.Categorical(cubo[coluna].astype(object), categories=conteudos).codes
+
+
+def construir_subtopicos(cubo):
+    """
+    Tabela longa questão -> subtópico: Subtópico 1 e Subtópico 2 viram linhas de uma
+    única coluna "Conteúdo", em códigos inteiros, ordenadas por (Frente, Tópico, Ano).
+    Cada (Frente, Tópico) ocupa um trecho contíguo, e cada Frente também.
+    :param cubo: Cubo completo da disciplina (carregar_cubo)
+    :return: dict com arrays "ano", "frente", "topico", "conteudo", "quantidade" (uma
+             posição por linha), as categorias de cada código ("frentes", "topicos",
+             "conteudos") e os trechos "fatias" {(frente, tópico): (inicio, fim)} e
+             "trechos_frentes" {frente: (inicio, fim)}
+    """
+    frente = cubo["Frente"].astype("category").cat
+    topico = cubo["Tópico"].astype("category").cat
+
+    conteudos = _conteudos(cubo)
+    conteudo = np.concatenate([_codigos_conteudos(cubo, coluna, conteudos) for coluna in COLUNAS_SUBTOPICOS])
+    # As demais colunas se repetem: uma cópia para cada coluna de subtópico
+    ano = np.tile(cubo["Ano"].to_numpy(dtype=np.int64), 2)
+    # Códigos em int64: com mais de 127 tópicos a chave (Frente, Tópico) não cabe em int8
+    codigos_frente = np.tile(frente.codes.to_numpy(dtype=np.int64), 2)
+    codigos_topico = np.tile(topico.codes.to_numpy(dtype=np.int64), 2)
+    quantidade = np.tile(cubo["Quantidade"].to_numpy(dtype=np.int64), 2)
+
+    # Linhas sem conteúdo (Subtópico 2 vazio) ou sem Frente/Tópico não entram em contagem nenhuma
+    validas = (conteudo >= 0) & (codigos_frente >= 0) & (codigos_topico >= 0)
+    ordem = np.flatnonzero(validas)[
+        np.lexsort((ano[validas], codigos_topico[validas], codigos_frente[validas]))
+    ]
+    subtopicos = {
+        "ano": ano[ordem],
+        "frente": codigos_frente[ordem],
+        "topico": codigos_topico[ordem],
+        "conteudo": conteudo[ordem].astype(np.int64),
+        "quantidade": quantidade[ordem],
+        "frentes": frente.categories,
+        "topicos": topico.categories,
+        "conteudos": pd.Index(conteudos, dtype=object),
+    }
+
+    # Índice (Frente, Tópico) -> trecho, a partir das posições onde o par muda
+    chave = subtopicos["frente"] * max(len(topico.categories), 1) + subtopicos["topico"]
+    inicios = np.flatnonzero(np.diff(chave, prepend=-1))
+    fins = np.append(inicios[1:], len(chave))
+    subtopicos["fatias"] = {
+        (frente.categories[subtopicos["frente"][i]], topico.categories[subtopicos["topico"][i]]): (int(i), int(j))
+        for i, j in zip(inicios, fins)
+    }
+    trechos_frentes = {}
+    for (nome_frente, _), (i, j) in subtopicos["fatias"].items():
+        inicio, _ = trechos_frentes.get(nome_frente, (i, j))
+        trechos_frentes[nome_frente] = (inicio, j)
+    subtopicos["trechos_frentes"] = trechos_frentes
+    return subtopicos
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _subtopicos_em_cache(nome_da_aba, versao, aplicacoes, _cubo):
+    return construir_subtopicos(_cubo)
+
+
+def carregar_subtopicos(cubo, nome_da_aba, versao, aplicacoes=None):
+    """
+    Tabela longa de subtópicos da disciplina, construída uma vez por versão da aba.
+    :param cubo: Cubo completo devolvido por carregar_cubo (não o recortado nos anos)
+    :param nome_da_aba: Nome da aba, usado na chave do cache
+    :param versao: A mesma versão usada em carregar_cubo
+    :param aplicacoes: As mesmas aplicações usadas em carregar_cubo
+    """
+    return _subtopicos_em_cache(nome_da_aba, versao, aplicacoes, cubo)
+
+
+def contar_subtopicos(subtopicos, frente, ano_inicio, ano_fim, topico=None, por_topico=False):
+    """
+    Ocorrências de cada Conteúdo (Subtópico 1 ou 2) de uma Frente, ou de um Tópico dela,
+    em [ano_inicio, ano_fim]. Só lê o trecho do índice: nada é empilhado por interação.
+    :param subtopicos: Tabela de carregar_subtopicos
+    :param topico: Tópico da Frente; None conta a Frente inteira
+    :param por_topico: Separa as contagens também por Tópico
+    :return: DataFrame ["Conteúdo", ("Tópico",) "Quantidade"], do maior para o menor
+    """
+    if topico is None:
+        i, j = subtopicos["trechos_frentes"].get(frente, (0, 0))
+    else:
+        i, j = subtopicos["fatias"].get((frente, topico), (0, 0))
+
+    ano = subtopicos["ano"][i:j]
+    if topico is None:
+        # Vários tópicos no trecho, cada um ordenado por ano: máscara
+        linhas = np.flatnonzero((ano >= ano_inicio) & (ano <= ano_fim)) + i
+    else:
+        # Um só tópico: o trecho está ordenado por ano
+        linhas = np.arange(
+            i + np.searchsorted(ano, ano_inicio, side="left"), i + np.searchsorted(ano, ano_fim, side="right")
+        )
+
+    conteudo = subtopicos["conteudo"][linhas]
+    n_topicos = len(subtopicos["topicos"])
+    # Chave ordenada por Conteúdo e depois Tópico (a ordem do groupby)
+    chave = conteudo * n_topicos + subtopicos["topico"][linhas] if por_topico else conteudo
+    chaves, posicao = np.unique(chave, return_inverse=True)
+    quantidade = np.bincount(posicao, weights=subtopicos["quantidade"][linhas], minlength=len(chaves))
+
+    colunas = {"Conteúdo": subtopicos["conteudos"][chaves // n_topicos if por_topico else chaves]}
+    if por_topico:
+        colunas["Tópico"] = subtopicos["topicos"][chaves % n_topicos]
+    colunas["Quantidade"] = quantidade.astype(np.int64)
+    contagem = pd.DataFrame({coluna: np.asarray(valores) for coluna, valores in colunas.items()})
+    contagem = contagem[contagem["Quantidade"] > 0]
+    return contagem.sort_values("Quantidade", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def construir_coocorrencias(cubo):
+    """
+    Conteúdos cobrados juntos: pares (Subtópico 1, Subtópico 2) da mesma questão, com
+    contagens acumuladas por ano. A matriz conteúdo × conteúdo é esparsa: só os pares
+    que aparecem em alguma questão viram colunas, ordenadas por (Frente, par), e um
+    intervalo de anos é a diferença de duas linhas de prefixo (como no índice de anos).
+    :param cubo: Cubo completo da disciplina (carregar_cubo), ordenado por Ano
+    :return: dict com "anos", "prefixos" (matriz (anos + 1) × pares), os códigos "a" e
+             "b" de cada par (a < b), as categorias ("frentes", "conteudos") e os trechos
+             "trechos_frentes" {frente: (inicio, fim)} das colunas de cada Frente
+    """
+    frente = cubo["Frente"].astype("category").cat
+    conteudos = _conteudos(cubo)
+    n_conteudos = max(len(conteudos), 1)
+
+    a, b = (_codigos_conteudos(cubo, coluna, conteudos).astype(np.int64) for coluna in COLUNAS_SUBTOPICOS)
+    codigos_frente = frente.codes.to_numpy(dtype=np.int64)
+    # Só questões com dois conteúdos diferentes (e com Frente) formam um par
+    validas = (a >= 0) & (b >= 0) & (a != b) & (codigos_frente >= 0)
+    # O par não tem ordem: (menor, maior) é a mesma célula da matriz simétrica
+    primeiro, segundo = np.minimum(a, b)[validas], np.maximum(a, b)[validas]
+    chave = (codigos_frente[validas] * n_conteudos + primeiro) * n_conteudos + segundo
+    pares, coluna = np.unique(chave, return_inverse=True)
+
+    # Todos os anos do cubo (também os sem pares), como no índice de anos
+    anos, posicao_ano = np.unique(cubo["Ano"].to_numpy(dtype=np.int64), return_inverse=True)
+    contagem = np.bincount(
+        posicao_ano[validas] * len(pares) + coluna,
+        weights=cubo["Quantidade"].to_numpy(dtype=np.int64)[validas],
+        minlength=len(anos) * len(pares),
+    ).reshape(len(anos), len(pares))
+    prefixos = np.zeros((len(anos) + 1, len(pares)), dtype=np.int64)
+    np.cumsum(contagem, axis=0, out=prefixos[1:])
+
+    # Frente -> trecho de colunas, a partir das posições onde a Frente muda
+    frente_par = pares // (n_conteudos * n_conteudos)
+    inicios = np.flatnonzero(np.diff(frente_par, prepend=-1))
+    fins = np.append(inicios[1:], len(pares))
+    return {
+        "anos": anos,
+        "prefixos": prefixos,
+        "a": pares // n_conteudos % n_conteudos,
+        "b": pares % n_conteudos,
+        "frentes": frente.categories,
+        "conteudos": pd.Index(conteudos, dtype=object),
+        "trechos_frentes": {
+            frente.categories[frente_par[i]]: (int(i), int(j)) for i, j in zip(inicios, fins)
+        },
+    }
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _coocorrencias_em_cache(nome_da_aba, versao, aplicacoes, _cubo):
+    return construir_coocorrencias(_cubo)
+
+
+def carregar_coocorrencias(cubo, nome_da_aba, versao, aplicacoes=None):
+    """
+    Coocorrências de conteúdos da disciplina, construídas uma vez por versão da aba.
+    :param cubo: Cubo completo devolvido por carregar_cubo (não o recortado nos anos)
+    :param nome_da_aba: Nome da aba, usado na chave do cache
+    :param versao: A mesma versão usada em carregar_cubo
+    :param aplicacoes: As mesmas aplicações usadas em carregar_cubo
+    """
+    return _coocorrencias_em_cache(nome_da_aba, versao, aplicacoes, cubo)
+
+
+def contar_coocorrencias(coocorrencias, ano_inicio, ano_fim, frente=None):
+    """
+    Questões de cada par de conteúdos em [ano_inicio, ano_fim], pela diferença de duas
+    linhas de prefixo: não percorre questões nem monta pares.
+    :param coocorrencias: Coocorrências de carregar_coocorrencias
+    :param frente: Só os pares da Frente; None junta todas
+    :return: DataFrame ["Conteúdo A", "Conteúdo B", "Quantidade"], do maior para o menor
+    """
+    i, j = _posicoes_anos(coocorrencias, ano_inicio, ano_fim)
+    if frente is None:
+        inicio, fim = 0, len(coocorrencias["a"])
+    else:
+        inicio, fim = coocorrencias["trechos_frentes"].get(frente, (0, 0))
+    prefixos = coocorrencias["prefixos"]
+    quantidade = prefixos[j, inicio:fim] - prefixos[i, inicio:fim]
+    a, b = coocorrencias["a"][inicio:fim], coocorrencias["b"][inicio:fim]
+
+    if frente is None:
+        # O mesmo par pode aparecer em mais de uma Frente
+        n_conteudos = max(len(coocorrencias["conteudos"]), 1)
+        chaves, posicao = np.unique(a * n_conteudos + b, return_inverse=True)
+        quantidade = np.bincount(posicao, weights=quantidade, minlength=len(chaves)).astype(np.int64)
+        a, b = chaves // n_conteudos, chaves % n_conteudos
+
+    presentes = quantidade > 0
+    contagem = pd.DataFrame({
+        "Conteúdo A": np.asarray(coocorrencias["conteudos"][a[presentes]]),
+        "Conteúdo B": np.asarray(coocorrencias["conteudos"][b[presentes]]),
+        "Quantidade": quantidade[presentes],
+    })
+    return contagem.sort_values("Quantidade", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def matriz_coocorrencias(pares, limite=None):
+    """
+    Matriz simétrica conteúdo × conteúdo (diagonal zero) para o mapa de calor.
+    :param pares: DataFrame de contar_coocorrencias
+    :param limite: Conteúdos mantidos, os que mais aparecem em pares (None = todos)
+    :return: DataFrame quadrado, conteúdos do maior para o menor total
+    """
+    quantidade = pares["Quantidade"].to_numpy()
+    totais = (
+        pd.Series(np.concatenate([quantidade, quantidade]), index=np.concatenate([pares["Conteúdo A"], pares["Conteúdo B"]]))
+        .groupby(level=0)
+        .sum()
+        .sort_values(ascending=False, kind="stable")
+    )
+    conteudos = totais.index[:limite]
+
+    linha = conteudos.get_indexer(pares["Conteúdo A"])
+    coluna = conteudos.get_indexer(pares["Conteúdo B"])
+    mantidos = (linha >= 0) & (coluna >= 0)
+    matriz = np.zeros((len(conteudos), len(conteudos)), dtype=np.int64)
+    np.add.at(matriz, (linha[mantidos], coluna[mantidos]), quantidade[mantidos])
+    return pd.DataFrame(matriz + matriz.T, index=conteudos, columns=conteudos)
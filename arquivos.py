@@ -0,0 +1,22 @@
+import os
+import threading
+
+# Escrita de arquivos compartilhados entre processos e threads (cache colunar, base
+# publicada, snapshots): cada escritor usa um temporário próprio e troca o arquivo de
+# uma vez, então quem lê encontra o arquivo antigo ou o novo completo, nunca um pedaço.
+
+
+def escrever_atomico(caminho, escrever):
+    """
+    Escreve num arquivo temporário e troca de uma vez (seguro entre processos).
+    Se a escrita falhar, o temporário é apagado e o arquivo antigo fica como estava.
+    :param caminho: Arquivo de destino
+    :param escrever: Função que recebe o caminho do temporário e o grava
+    """
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        escrever(temporario)
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
@@ -0,0 +1,333 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+
+from arquivos import escrever_atomico
+
+# Base de questões compacta, compartilhada (somente leitura) por todas as sessões.
+#
+# Cada coluna de rótulos vira um array de códigos inteiros (int8/int16) e um
+# dicionário (pd.Index) com os textos; Subtópico 1 e Subtópico 2 usam o mesmo
+# dicionário. Ano e Número ficam no menor inteiro que os comporta (int16).
+# Filtros e contagens comparam códigos, nunca textos, e os DataFrames entregues
+# às páginas são vistas sobre os códigos.
+#
+# Entre processos (vários servidores Streamlit na mesma máquina), a base é publicada
+# uma vez em disco (<prefixo>.bin com os arrays + <prefixo>.json com o esquema) e os
+# demais processos a anexam por memory-map: as páginas do arquivo ficam no cache do
+# sistema operacional, numa única cópia para todos.
+#
+# Dentro de cada aba, as linhas estão ordenadas por (Ano, Aplicação): cada partição
+# (aba, ano, aplicação) é um trecho contíguo, listado em "particoes". Filtrar por anos
+# e aplicações só lê os trechos das partições pedidas.
+
+COLUNAS_CODIFICADAS = ["Disciplina", "Aplicação", "Frente", "Tópico", "Tipo", "Subtópico 1", "Subtópico 2"]
+
+# Colunas que compartilham o dicionário de outra
+DICIONARIOS_COMPARTILHADOS = {"Subtópico 2": "Subtópico 1"}
+
+COLUNAS_NUMERICAS = ["Ano", "Número (Cinza)"]
+
+# Aplicações da prova, na ordem de exibição (outras vêm depois, em ordem alfabética).
+# Linhas sem Aplicação na planilha são da aplicação regular
+APLICACOES = ["Regular", "PPL", "Reaplicação"]
+APLICACAO_PADRAO = APLICACOES[0]
+
+# Muda quando o layout do arquivo publicado muda (arquivos antigos são ignorados)
+FORMATO_PUBLICACAO = 2
+ALINHAMENTO = 64
+
+
+def _somente_leitura(array):
+    array.setflags(write=False)
+    return array
+
+
+def _rotulos(valores):
+    # Textos distintos da coluna (de uma coluna category, só as categorias)
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        return set(valores.cat.categories.astype(str))
+    return set(valores.dropna().astype(str))
+
+
+def _codificar(valores, dicionario):
+    # Códigos no menor tipo inteiro que comporta o dicionário; -1 = vazio
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        # Só traduz os códigos da categoria para os do dicionário (sem tocar nos textos)
+        mapa = np.append(dicionario.get_indexer(valores.cat.categories.astype(str)), -1)
+        codigos = mapa[valores.cat.codes.to_numpy()]
+    else:
+        codigos = dicionario.get_indexer(valores.astype(object))
+    tipo = np.int8 if len(dicionario) < 2**7 else np.int16 if len(dicionario) < 2**15 else np.int32
+    return _somente_leitura(codigos.astype(tipo))
+
+
+def _particoes(anos, aplicacoes, limites):
+    # {aba: [[ano, código da aplicação, inicio, fim], ...]}, a partir das posições
+    # onde (Ano, Aplicação) muda dentro de cada aba
+    particoes = {}
+    for aba, (inicio, fim) in limites.items():
+        chave = anos[inicio:fim].astype(np.int64) * 2**32 + aplicacoes[inicio:fim]
+        inicios = np.flatnonzero(np.diff(chave, prepend=chave[:1] - 1)) if fim > inicio else np.empty(0, int)
+        fins = np.append(inicios[1:], fim - inicio)
+        particoes[aba] = [
+            [int(anos[inicio + i]), int(aplicacoes[inicio + i]), inicio + int(i), inicio + int(j)]
+            for i, j in zip(inicios, fins)
+        ]
+    return particoes
+
+
+def construir_base_questoes(base, limites):
+    """
+    Converte a base (utils.normalizar_abas ou cache colunar) na base compacta.
+    :param base: DataFrame com as colunas de utils.COLUNAS_BASE, abas contíguas e
+                 ordenadas por (Ano, Aplicação)
+    :param limites: {nome_da_aba: (inicio, fim)}
+    :return: dict com "n", "colunas" (ordem original), "codigos" {coluna: array},
+             "dicionarios" {coluna: pd.Index}, "numeros" {coluna: array}, "limites" e
+             "particoes" {nome_da_aba: [[ano, código da aplicação, inicio, fim], ...]}
+    """
+    dicionarios = {}
+    for coluna in COLUNAS_CODIFICADAS:
+        if coluna in DICIONARIOS_COMPARTILHADOS:
+            continue
+        textos = _rotulos(base[coluna])
+        for outra, dona in DICIONARIOS_COMPARTILHADOS.items():
+            if dona == coluna:
+                textos |= _rotulos(base[outra])
+        dicionarios[coluna] = pd.Index(sorted(textos), dtype="str")
+    for coluna, dona in DICIONARIOS_COMPARTILHADOS.items():
+        dicionarios[coluna] = dicionarios[dona]
+
+    numeros = {}
+    for coluna in COLUNAS_NUMERICAS:
+        valores = pd.to_numeric(base[coluna])
+        # Sem vazios: inteiro mais estreito possível; com vazios fica float32
+        if valores.notna().all():
+            valores = pd.to_numeric(valores, downcast="integer")
+            numeros[coluna] = _somente_leitura(valores.to_numpy())
+        else:
+            numeros[coluna] = _somente_leitura(valores.to_numpy(dtype=np.float32))
+
+    codigos = {coluna: _codificar(base[coluna], dicionarios[coluna]) for coluna in COLUNAS_CODIFICADAS}
+    return {
+        "n": len(base),
+        "colunas": list(base.columns),
+        "codigos": codigos,
+        "dicionarios": dicionarios,
+        "numeros": numeros,
+        "limites": dict(limites),
+        "particoes": _particoes(numeros["Ano"], codigos["Aplicação"], limites),
+    }
+
+
+def codigos_de(questoes, coluna, valores):
+    """
+    Códigos dos valores na coluna (valores fora do dicionário são ignorados).
+    :param valores: Um valor ou uma lista de valores
+    """
+    if isinstance(valores, str) or not np.iterable(valores):
+        valores = [valores]
+    codigos = questoes["dicionarios"][coluna].get_indexer(list(valores))
+    return codigos[codigos >= 0]
+
+
+def aplicacoes_da_aba(questoes, nome_da_aba):
+    """Aplicações que têm questões na aba, na ordem de APLICACOES."""
+    dicionario = questoes["dicionarios"]["Aplicação"]
+    nomes = {dicionario[codigo] for _, codigo, _, _ in questoes["particoes"].get(nome_da_aba, []) if codigo >= 0}
+    return sorted(nomes, key=lambda nome: (APLICACOES.index(nome) if nome in APLICACOES else len(APLICACOES), nome))
+
+
+def trechos(questoes, nome_da_aba, ano_inicio=None, ano_fim=None, aplicacoes=None):
+    """
+    Trechos contíguos da base com as linhas de uma aba nos anos e aplicações pedidos.
+    :param ano_inicio: Primeiro ano (None = sem limite); as linhas da aba estão ordenadas por Ano
+    :param aplicacoes: Aplicações (None = todas); só as partições delas entram
+    :return: Lista de (inicio, fim), em ordem
+    """
+    inicio_aba, fim_aba = questoes["limites"].get(nome_da_aba, (0, 0))
+    if aplicacoes is None:
+        anos = questoes["numeros"]["Ano"][inicio_aba:fim_aba]
+        # Ano no tipo do array: com um int do Python o searchsorted converte o array inteiro
+        inicio = inicio_aba if ano_inicio is None else inicio_aba + int(np.searchsorted(anos, anos.dtype.type(ano_inicio), side="left"))
+        fim = fim_aba if ano_fim is None else inicio_aba + int(np.searchsorted(anos, anos.dtype.type(ano_fim), side="right"))
+        return [(inicio, max(inicio, fim))]
+    # Poda de partições: só os trechos (ano, aplicação) pedidos
+    codigos = set(codigos_de(questoes, "Aplicação", aplicacoes).tolist())
+    return [
+        (inicio, fim)
+        for ano, codigo, inicio, fim in questoes["particoes"].get(nome_da_aba, [])
+        if codigo in codigos
+        and (ano_inicio is None or ano >= ano_inicio)
+        and (ano_fim is None or ano <= ano_fim)
+    ]
+
+
+def filtrar(questoes, nome_da_aba, ano_inicio=None, ano_fim=None, filtros=None, aplicacoes=None):
+    """
+    Linhas de uma aba que passam nos filtros, comparando só códigos inteiros.
+    :param filtros: {coluna: valor ou lista de valores}
+    :param aplicacoes: Aplicações (None = todas); só as partições delas são lidas
+    :return: Array de posições das linhas na base, em ordem
+    """
+    partes = [np.arange(inicio, fim) for inicio, fim in trechos(questoes, nome_da_aba, ano_inicio, ano_fim, aplicacoes)]
+    linhas = np.concatenate(partes) if partes else np.arange(0)
+
+    for coluna, valores in (filtros or {}).items():
+        codigos = questoes["codigos"][coluna][linhas]
+        linhas = linhas[np.isin(codigos, codigos_de(questoes, coluna, valores))]
+    return linhas
+
+
+def contar_por(questoes, colunas, linhas=None):
+    """
+    Questões por combinação das colunas, via códigos empacotados num único inteiro.
+    Vazios (NaN) contam como uma categoria própria, depois das demais.
+    :param colunas: Colunas codificadas e/ou "Ano"
+    :param linhas: Posições das linhas (filtrar); None = base toda
+    :return: DataFrame [colunas..., "Quantidade"] na ordem das combinações (como um groupby),
+             com as colunas de rótulos em category
+    """
+    if linhas is None:
+        linhas = np.arange(questoes["n"])
+    chave = np.zeros(len(linhas), dtype=np.int64)
+    bases = []
+    for coluna in colunas:
+        if coluna in questoes["codigos"]:
+            valores = questoes["codigos"][coluna][linhas].astype(np.int64)
+            tamanho = len(questoes["dicionarios"][coluna]) + 1
+            # -1 (vazio) vai para o fim, como no groupby(dropna=False)
+            valores = np.where(valores < 0, tamanho - 1, valores)
+            minimo = 0
+        else:
+            valores = questoes["numeros"][coluna][linhas].astype(np.int64)
+            minimo = int(valores.min()) if len(valores) else 0
+            valores = valores - minimo
+            tamanho = int(valores.max()) + 1 if len(valores) else 1
+        chave = chave * tamanho + valores
+        bases.append((coluna, tamanho, minimo))
+
+    chaves, quantidade = np.unique(chave, return_counts=True)
+
+    resultado = {}
+    for coluna, tamanho, minimo in reversed(bases):
+        valores = chaves % tamanho
+        chaves = chaves // tamanho
+        if coluna in questoes["codigos"]:
+            dicionario = questoes["dicionarios"][coluna]
+            codigos = np.where(valores == len(dicionario), -1, valores)
+            resultado[coluna] = pd.Categorical.from_codes(codigos, dtype=pd.CategoricalDtype(dicionario))
+        else:
+            resultado[coluna] = (valores + minimo).astype(questoes["numeros"][coluna].dtype)
+    contagem = pd.DataFrame({coluna: resultado[coluna] for coluna in colunas})
+    contagem["Quantidade"] = quantidade
+    return contagem
+
+
+def dataframe(questoes, nome_da_aba=None, linhas=None):
+    """
+    Vista em DataFrame da base (ou de uma aba), com os rótulos em category sobre os
+    próprios códigos: os textos não são copiados. Não modifique o resultado.
+    :param linhas: Posições das linhas (filtrar); com elas, os códigos dessas linhas são copiados
+    """
+    if linhas is None:
+        inicio, fim = questoes["limites"][nome_da_aba] if nome_da_aba is not None else (0, questoes["n"])
+        linhas = slice(inicio, fim)
+    colunas = {}
+    for coluna in questoes["colunas"]:
+        if coluna in questoes["codigos"]:
+            dtype = pd.CategoricalDtype(questoes["dicionarios"][coluna])
+            colunas[coluna] = pd.Categorical.from_codes(questoes["codigos"][coluna][linhas], dtype=dtype)
+        else:
+            colunas[coluna] = questoes["numeros"][coluna][linhas]
+    return pd.DataFrame(colunas, copy=False)
+
+
+def _arrays(questoes):
+    # Todos os arrays da base, com um nome estável
+    yield from ((f"codigos/{coluna}", array) for coluna, array in questoes["codigos"].items())
+    yield from ((f"numeros/{coluna}", array) for coluna, array in questoes["numeros"].items())
+
+
+def publicar_base_questoes(questoes, prefixo, versao):
+    """
+    Grava a base compacta para outros processos anexarem (anexar_base_questoes).
+    Primeiro os arrays (<prefixo>.bin), depois o esquema (<prefixo>.json): quem encontra
+    o esquema sempre encontra os arrays completos.
+    :param versao: Versão dos dados, conferida por quem anexa
+    """
+    arrays = {}
+    deslocamento = 0
+    for nome, array in _arrays(questoes):
+        arrays[nome] = {"dtype": array.dtype.str, "deslocamento": deslocamento, "tamanho": len(array)}
+        deslocamento += -(-array.nbytes // ALINHAMENTO) * ALINHAMENTO
+    esquema = {
+        "formato": FORMATO_PUBLICACAO,
+        "versao": versao,
+        "n": questoes["n"],
+        "colunas": questoes["colunas"],
+        "limites": questoes["limites"],
+        "particoes": questoes["particoes"],
+        "dicionarios": {
+            coluna: list(dicionario)
+            for coluna, dicionario in questoes["dicionarios"].items()
+            if coluna not in DICIONARIOS_COMPARTILHADOS
+        },
+        "arrays": arrays,
+    }
+
+    def escrever_arrays(f):
+        for nome, array in _arrays(questoes):
+            f.seek(arrays[nome]["deslocamento"])
+            f.write(np.ascontiguousarray(array).tobytes())
+
+    def escrever_esquema(f):
+        f.write(json.dumps(esquema, ensure_ascii=False).encode("utf-8"))
+
+    for caminho, escrever in [(prefixo + ".bin", escrever_arrays), (prefixo + ".json", escrever_esquema)]:
+        # Temporário + troca: processos publicando a mesma versão não se atrapalham
+        def gravar(temporario, escrever=escrever):
+            with open(temporario, "wb") as f:
+                escrever(f)
+        escrever_atomico(caminho, gravar)
+
+
+def anexar_base_questoes(prefixo, versao):
+    """
+    Anexa (memory-map, sem cópia) a base publicada por outro processo.
+    :param versao: Versão esperada; outra versão ou formato levanta ValueError
+    :raise OSError: Se a base ainda não foi publicada
+    """
+    with open(prefixo + ".json", encoding="utf-8") as f:
+        esquema = json.load(f)
+    if esquema.get("formato") != FORMATO_PUBLICACAO or esquema.get("versao") != versao:
+        raise ValueError(f"Base publicada em {prefixo} é de outra versão")
+
+    dicionarios = {coluna: pd.Index(valores, dtype="str") for coluna, valores in esquema["dicionarios"].items()}
+    for coluna, dona in DICIONARIOS_COMPARTILHADOS.items():
+        dicionarios[coluna] = dicionarios[dona]
+
+    questoes = {
+        "n": esquema["n"],
+        "colunas": esquema["colunas"],
+        "codigos": {},
+        "dicionarios": dicionarios,
+        "numeros": {},
+        "limites": {aba: tuple(intervalo) for aba, intervalo in esquema["limites"].items()},
+        "particoes": esquema["particoes"],
+    }
+    # Um único mapeamento do arquivo; cada array é uma vista sobre ele.
+    # mode="r": somente leitura, as páginas são compartilhadas com os outros processos
+    caminho = prefixo + ".bin"
+    if os.path.getsize(caminho):
+        memoria = np.memmap(caminho, dtype=np.uint8, mode="r")
+    else:
+        memoria = _somente_leitura(np.empty(0, dtype=np.uint8))
+    for nome, info in esquema["arrays"].items():
+        grupo, coluna = nome.split("/", 1)
+        tipo = np.dtype(info["dtype"])
+        inicio = info["deslocamento"]
+        questoes[grupo][coluna] = memoria[inicio:inicio + info["tamanho"] * tipo.itemsize].view(tipo)
+    return questoes
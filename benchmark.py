@@ -0,0 +1,298 @@
+"""
+Benchmark das páginas de disciplina: carga, agregação e montagem das figuras.
+
+Para cada tamanho, gera (uma vez) uma planilha sintética em dados/benchmark/<n>-v<versão>/
+(gerar_dados_sinteticos.py: n questões divididas entre Física, Química e Biologia) e
+roda cada página de disciplina sem navegador (streamlit.testing.v1.AppTest), num
+processo separado, com interações roteirizadas:
+    - mudança do intervalo de anos (barra lateral)
+    - escolha de Frente (análise detalhada)
+    - escolha de Tópico (análise específica)
+
+Cada medição roda num processo próprio: compilação, tempos e memória (tracemalloc
+deixa tudo mais lento). Compilação e tempos rodam --repeticoes vezes e cada métrica
+fica com a mediana das repetições.
+
+Mede (compilacao_s uma vez por tamanho; as demais por página):
+    compilacao_s       Excel -> cache colunar (sem cache nenhum)
+    carga_fria_s       primeira execução da página num processo novo (cache colunar pronto)
+    rerun_*_s          mediana das reexecuções de cada tipo de interação
+    memoria_pico_mb    pico de alocações Python/NumPy (tracemalloc) durante as execuções
+                       (a base lida do cache colunar fica fora: é memória do Arrow)
+    rss_pico_mb        pico de memória residente do processo
+    payload_kb         bytes das figuras enviadas ao navegador (visão inicial)
+
+Os resultados são comparados com benchmark_baseline.json: métricas mais de
+--tolerancia acima da linha de base aparecem como regressão (código de saída 1).
+Tempos só contam como regressão se também piorarem mais de PIORA_MINIMA_S segundos:
+reruns de dezenas de milissegundos variam mais que isso entre execuções.
+
+Uso:
+    python benchmark.py                         # 10k, 100k e 1M questões
+    python benchmark.py --tamanhos 10000 100000
+    python benchmark.py --paginas Fisica        # só a página de Física
+    python benchmark.py --repeticoes 5          # mediana de 5 execuções
+    python benchmark.py --salvar-baseline       # grava os resultados como nova linha de base
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from disciplinas import DISCIPLINAS
+
+DIRETORIO_RAIZ = os.path.dirname(os.path.abspath(__file__))
+DIRETORIO_BENCHMARK = os.path.join(DIRETORIO_RAIZ, 'dados', 'benchmark')
+CAMINHO_BASELINE = os.path.join(DIRETORIO_RAIZ, 'benchmark_baseline.json')
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+TOLERANCIA_PADRAO = 0.25
+REPETICOES_PADRAO = 3
+# Piora absoluta mínima para um tempo (métricas *_s) contar como regressão
+PIORA_MINIMA_S = 0.05
+# Muda quando a planilha gerada muda (ex: gerador de dados): as planilhas antigas
+# ficam em outro diretório e não entram na comparação
+VERSAO_PLANILHA = 2
+
+# Métricas comparadas com a linha de base (todas: menor é melhor)
+METRICAS_COMPILACAO = ["compilacao_s"]
+METRICAS_PAGINA = [
+    "carga_fria_s", "rerun_anos_s", "rerun_frente_s", "rerun_topico_s",
+    "rerun_sem_mudanca_s", "memoria_pico_mb", "rss_pico_mb", "payload_kb",
+]
+
+
+def paginas_com_dados():
+    """Especificações (disciplinas.py) das páginas com vocabulário no gerador sintético."""
+    from gerar_dados_sinteticos import VOCABULARIO
+
+    return [espec for espec in DISCIPLINAS if espec["aba"] in VOCABULARIO]
+
+
+def gerar_planilha(caminho, n_questoes, semente=0):
+    """
+    Planilha sintética com n_questoes (anos 1998-2025), divididas igualmente entre as
+    abas de paginas_com_dados().
+    """
+    from gerar_dados_sinteticos import escrever_planilha, gerar
+
+    abas = gerar(n_questoes, disciplinas=[espec["aba"] for espec in paginas_com_dados()], semente=semente)
+    escrever_planilha(caminho, abas)
+
+
+def _payload(at):
+    # Bytes das figuras como vão para o navegador
+    total = sum(len(e.proto.spec) for e in at.get("plotly_chart"))
+    for e in at.get("vega_lite_chart"):
+        total += len(e.proto.spec) + sum(len(d.data.data) for d in e.proto.datasets)
+    return total
+
+
+def _rodar(at, tempos, tipo):
+    inicio = time.perf_counter()
+    at.run()
+    tempos.setdefault(tipo, []).append(time.perf_counter() - inicio)
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def medir_compilacao():
+    """Compila do zero o cache colunar da planilha de ENEM_DIRETORIO_DADOS (processo filho)."""
+    import utils
+
+    shutil.rmtree(utils.DIRETORIO_CACHE, ignore_errors=True)
+    inicio = time.perf_counter()
+    utils.compilar_cache_colunar()
+    return {"compilacao_s": time.perf_counter() - inicio}
+
+
+def medir(aba, memoria=False):
+    """
+    Roda a página da disciplina com as interações roteirizadas sobre a planilha de
+    ENEM_DIRETORIO_DADOS, já compilada (processo filho).
+    :param aba: Aba da disciplina (disciplinas.py)
+    :param memoria: Só mede o pico de alocações (tracemalloc deixa tudo mais lento)
+    """
+    from streamlit.testing.v1 import AppTest
+
+    espec = next(espec for espec in DISCIPLINAS if espec["aba"] == aba)
+    resultado = {}
+    if memoria:
+        tracemalloc.start()
+
+    tempos = {}
+    at = AppTest.from_file(os.path.join(DIRETORIO_RAIZ, "home.py"), default_timeout=600)
+    at.switch_page(espec["pagina"])
+    _rodar(at, tempos, "carga_fria")
+    resultado["payload_kb"] = _payload(at) / 1024
+
+    # Intervalo de anos: período completo e depois a metade mais recente
+    anos = at.selectbox(key=f"{aba}_ano_inicio").options
+    at.selectbox(key=f"{aba}_ano_fim").set_value(anos[-1])
+    _rodar(at, tempos, "anos")
+    at.selectbox(key=f"{aba}_ano_inicio").set_value(anos[len(anos) // 2])
+    _rodar(at, tempos, "anos")
+
+    for frente in at.selectbox(key=f"{aba}_frente_detalhe").options[:3]:
+        at.selectbox(key=f"{aba}_frente_detalhe").set_value(frente)
+        _rodar(at, tempos, "frente")
+        for topico in at.selectbox(key=f"{aba}_topico_analise").options[:3]:
+            at.selectbox(key=f"{aba}_topico_analise").set_value(topico)
+            _rodar(at, tempos, "topico")
+
+    for _ in range(3):
+        _rodar(at, tempos, "sem_mudanca")
+
+    if memoria:
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"memoria_pico_mb": pico / 2**20}
+
+    resultado["carga_fria_s"] = tempos.pop("carga_fria")[0]
+    for tipo, valores in tempos.items():
+        resultado[f"rerun_{tipo}_s"] = statistics.median(valores)
+    # ru_maxrss é em KB no Linux
+    resultado["rss_pico_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return resultado
+
+
+def _medir_em_processo(diretorio, n_questoes, *argumentos, repeticoes=1):
+    # Mediana de cada métrica entre as repetições (cada uma num processo novo)
+    medicoes = []
+    for _ in range(repeticoes):
+        processo = subprocess.run(
+            [sys.executable, __file__, "--medir", *argumentos],
+            env={**os.environ, "ENEM_DIRETORIO_DADOS": diretorio},
+            cwd=DIRETORIO_RAIZ,
+            capture_output=True,
+            text=True,
+        )
+        if processo.returncode != 0:
+            raise RuntimeError(f"Falha no benchmark de {n_questoes} questões ({' '.join(argumentos)}):\n{processo.stderr}")
+        medicoes.append(json.loads(processo.stdout.strip().splitlines()[-1]))
+    return {metrica: statistics.median(medicao[metrica] for medicao in medicoes) for metrica in medicoes[0]}
+
+
+def rodar_tamanho(n_questoes, abas, repeticoes=REPETICOES_PADRAO):
+    """
+    Compila a planilha do tamanho e mede cada página.
+    :param abas: Abas das páginas medidas
+    :param repeticoes: Execuções da compilação e dos tempos (fica a mediana); a
+             memória (tracemalloc) é medida uma vez
+    :return: {"compilacao_s": ..., "paginas": {aba: {métrica: valor}}}
+    """
+    diretorio = os.path.join(DIRETORIO_BENCHMARK, f"{n_questoes}-v{VERSAO_PLANILHA}")
+    planilha = os.path.join(diretorio, 'dados_enem_natureza.xlsx')
+    if not os.path.exists(planilha):
+        print(f"Gerando planilha com {n_questoes} questões...", file=sys.stderr)
+        gerar_planilha(planilha, n_questoes)
+
+    resultado = _medir_em_processo(diretorio, n_questoes, "compilacao", repeticoes=repeticoes)
+    resultado["paginas"] = {}
+    for aba in abas:
+        metricas = _medir_em_processo(diretorio, n_questoes, "tempo", "--pagina", aba, repeticoes=repeticoes)
+        metricas.update(_medir_em_processo(diretorio, n_questoes, "memoria", "--pagina", aba))
+        resultado["paginas"][aba] = metricas
+    return resultado
+
+
+def _valores(resultado):
+    # (nome, métrica, valor) de um tamanho: a compilação e as métricas de cada página
+    for metrica in METRICAS_COMPILACAO:
+        if metrica in resultado:
+            yield "compilacao", metrica, resultado[metrica]
+    for aba, metricas in resultado.get("paginas", {}).items():
+        for metrica in METRICAS_PAGINA:
+            if metrica in metricas:
+                yield aba, metrica, metricas[metrica]
+
+
+def _regrediu(metrica, valor, base, tolerancia):
+    if valor <= base * (1 + tolerancia):
+        return False
+    # Tempos curtos: só conta se a piora também for maior que o ruído entre execuções
+    return not metrica.endswith("_s") or valor - base > PIORA_MINIMA_S
+
+
+def comparar(resultados, baseline, tolerancia):
+    """:return: Lista de (tamanho, página, métrica, atual, base) acima da tolerância"""
+    regressoes = []
+    for tamanho, resultado in resultados.items():
+        base = {(nome, metrica): valor for nome, metrica, valor in _valores(baseline.get(tamanho, {}))}
+        for nome, metrica, valor in _valores(resultado):
+            if (nome, metrica) in base and _regrediu(metrica, valor, base[nome, metrica], tolerancia):
+                regressoes.append((tamanho, nome, metrica, valor, base[nome, metrica]))
+    return regressoes
+
+
+def _arredondar(resultado):
+    return {
+        chave: {aba: _arredondar(metricas) for aba, metricas in valor.items()} if chave == "paginas" else round(valor, 4)
+        for chave, valor in resultado.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=TAMANHOS_PADRAO, help="Números de questões")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO, help="Piora aceita (0.25 = 25%%)")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES_PADRAO,
+                        help="Execuções de cada medição de tempo (fica a mediana)")
+    parser.add_argument("--paginas", nargs="+", choices=[espec["aba"] for espec in paginas_com_dados()],
+                        help="Páginas medidas (padrão: todas com dados sintéticos)")
+    parser.add_argument("--salvar-baseline", action="store_true", help="Grava os resultados como linha de base")
+    parser.add_argument("--medir", choices=["compilacao", "tempo", "memoria"], help=argparse.SUPPRESS)
+    parser.add_argument("--pagina", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir == "compilacao":
+        print(json.dumps(medir_compilacao()))
+        return
+    if args.medir:
+        print(json.dumps(medir(args.pagina, memoria=args.medir == "memoria")))
+        return
+
+    abas = args.paginas or [espec["aba"] for espec in paginas_com_dados()]
+    resultados = {}
+    for n_questoes in args.tamanhos:
+        resultados[str(n_questoes)] = rodar_tamanho(n_questoes, abas, args.repeticoes)
+
+    linhas = [("compilacao", metrica) for metrica in METRICAS_COMPILACAO]
+    linhas += [(aba, metrica) for aba in abas for metrica in METRICAS_PAGINA]
+    print(f"{'página':<12}{'métrica':<22}" + "".join(f"{tamanho:>14}" for tamanho in resultados))
+    for nome, metrica in linhas:
+        valores = [{(n, m): v for n, m, v in _valores(resultado)}.get((nome, metrica), float("nan"))
+                   for resultado in resultados.values()]
+        print(f"{nome:<12}{metrica:<22}" + "".join(f"{valor:>14.3f}" for valor in valores))
+
+    if args.salvar_baseline:
+        baseline = {}
+        if os.path.exists(CAMINHO_BASELINE):
+            with open(CAMINHO_BASELINE, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({tamanho: _arredondar(resultado) for tamanho, resultado in resultados.items()})
+        with open(CAMINHO_BASELINE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Linha de base gravada em {CAMINHO_BASELINE}")
+        return
+
+    if not os.path.exists(CAMINHO_BASELINE):
+        print("Sem linha de base (rode com --salvar-baseline).")
+        return
+    with open(CAMINHO_BASELINE, encoding="utf-8") as f:
+        regressoes = comparar(resultados, json.load(f), args.tolerancia)
+    for tamanho, nome, metrica, atual, base in regressoes:
+        print(f"REGRESSÃO {tamanho} {nome}: {metrica} {atual:.3f} (linha de base {base:.3f})")
+    if regressoes:
+        sys.exit(1)
+    print("Sem regressões em relação à linha de base.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import re
+import unicodedata
+
+from base_questoes import codigos_de, trechos
+
+# Busca por palavras nas questões de uma disciplina, com contagens por faceta.
+#
+# O índice é montado uma vez por versão da aba (carregar_indice_busca):
+#   - cada linha da aba ganha o número da sua combinação de rótulos de CAMPOS_BUSCA
+#     (poucas combinações distintas, mesmo com milhões de questões)
+#   - índice invertido termo -> combinações: cada rótulo é quebrado em termos (sem
+#     acentos, em minúsculas), e os termos ficam num array ordenado; um termo digitado
+#     pela metade ("ohm", "eletros") é um intervalo desse array (busca por prefixo)
+# Uma busca cruza as listas de combinações dos termos (todos são exigidos), que são
+# pequenas, e só então marca as linhas: uma leitura do array de combinações nos
+# trechos dos anos e aplicações pedidos. Nenhum texto é percorrido, e as facetas são
+# bincount sobre os códigos das linhas encontradas.
+#
+# O índice só guarda posições relativas ao início da aba: a versão da aba (chave do
+# cache) não muda quando outra aba antes dela cresce ou encolhe, e o deslocamento da
+# aba na base vem de questoes["limites"] a cada busca.
+
+# Colunas indexadas (rótulos codificados da base compacta)
+CAMPOS_BUSCA = ["Tópico", "Subtópico 1", "Subtópico 2"]
+
+# Contagens devolvidas junto com o resultado
+FACETAS = ["Ano", "Frente", "Tipo"]
+
+# Palavras que não viram termos do índice (aparecem em quase todo rótulo)
+PALAVRAS_IGNORADAS = {
+    "a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "em", "na", "no", "nas", "nos",
+    "um", "uma", "por", "para", "com", "sem", "ao", "aos", "sobre", "entre",
+}
+
+
+def termos(texto):
+    """Termos de um texto: palavras sem acentos, em minúsculas, na ordem em que aparecem."""
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return re.findall(r"[a-z0-9]+", texto.casefold())
+
+
+def construir_indice_busca(questoes, nome_da_aba):
+    """
+    Índice de busca da aba sobre os rótulos de CAMPOS_BUSCA.
+    :param questoes: Base compacta (estado["questoes"])
+    :return: dict com "combinacao" (número da combinação de cada linha da aba, a
+             partir da primeira linha da aba), "n_combinacoes",
+             "termos" (array ordenado), "deslocamentos" e "combinacoes" (as combinações
+             do termo i são combinacoes[deslocamentos[i]:deslocamentos[i + 1]], em
+             ordem)
+    """
+    inicio, fim = questoes["limites"].get(nome_da_aba, (0, 0))
+    campos = [campo for campo in CAMPOS_BUSCA if campo in questoes["codigos"]]
+
+    # Combinação de rótulos de cada linha: os códigos dos campos num único inteiro
+    chave = np.zeros(fim - inicio, dtype=np.int64)
+    for campo in campos:
+        chave = chave * (len(questoes["dicionarios"][campo]) + 1) + questoes["codigos"][campo][inicio:fim] + 1
+    chaves, combinacao = np.unique(chave, return_inverse=True)
+
+    # Termo -> combinações em que algum campo tem um rótulo com o termo
+    postagens = {}
+    for campo in reversed(campos):
+        tamanho = len(questoes["dicionarios"][campo]) + 1
+        codigos = chaves % tamanho - 1
+        chaves = chaves // tamanho
+        ordem = np.argsort(codigos, kind="stable")
+        fronteiras = np.searchsorted(codigos[ordem], np.arange(tamanho))
+        for codigo in np.flatnonzero(np.diff(fronteiras)):
+            for termo in set(termos(questoes["dicionarios"][campo][codigo])) - PALAVRAS_IGNORADAS:
+                postagens.setdefault(termo, []).append(ordem[fronteiras[codigo]:fronteiras[codigo + 1]])
+
+    ordenados = sorted(postagens)
+    listas = [np.unique(np.concatenate(postagens[termo])) for termo in ordenados]
+    deslocamentos = np.zeros(len(listas) + 1, dtype=np.int64)
+    np.cumsum([len(lista) for lista in listas], out=deslocamentos[1:])
+    # Menor inteiro que comporta as combinações: cada busca lê o array inteiro
+    tipo = np.int16 if len(chaves) < 2**15 else np.int32
+    return {
+        "combinacao": combinacao.astype(tipo),
+        "n_combinacoes": len(chaves),
+        "termos": np.array(ordenados, dtype=str),
+        "deslocamentos": deslocamentos,
+        "combinacoes": np.concatenate(listas) if listas else np.zeros(0, dtype=np.int64),
+    }
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _indice_em_cache(nome_da_aba, versao, _questoes):
+    # _questoes não entra na chave: a versão da aba já identifica o conteúdo
+    return construir_indice_busca(_questoes, nome_da_aba)
+
+
+def carregar_indice_busca(estado, nome_da_aba, versao):
+    """
+    Índice de busca da disciplina, montado uma vez por versão da aba.
+    :param estado: Estado dos dados (utils.estado_dados())
+    :param versao: Versão da aba no mesmo estado (estado["versoes_abas"])
+    """
+    return _indice_em_cache(nome_da_aba, versao, estado["questoes"])
+
+
+def _combinacoes_do_prefixo(indice, prefixo):
+    # Todos os termos que começam com o prefixo formam um intervalo do array ordenado
+    i, j = np.searchsorted(indice["termos"], [prefixo, prefixo + "\uffff"])
+    combinacoes = indice["combinacoes"][indice["deslocamentos"][i]:indice["deslocamentos"][j]]
+    return combinacoes if j - i <= 1 else np.unique(combinacoes)
+
+
+def _faceta(questoes, coluna, linhas):
+    # Contagem de uma coluna nas linhas encontradas, sem vazios
+    if coluna in questoes["codigos"]:
+        dicionario = questoes["dicionarios"][coluna]
+        quantidade = np.bincount(questoes["codigos"][coluna][linhas].astype(np.intp) + 1, minlength=len(dicionario) + 1)[1:]
+        presentes = np.flatnonzero(quantidade)
+        ordem = presentes[np.argsort(-quantidade[presentes], kind="stable")]
+        return pd.DataFrame({coluna: dicionario[ordem], "Quantidade": quantidade[ordem]})
+    # Ano: as linhas vêm em ordem de ano (as abas são ordenadas por Ano)
+    valores = questoes["numeros"][coluna][linhas]
+    inicios = np.flatnonzero(np.diff(valores, prepend=valores[:1] - 1)) if len(valores) else np.zeros(0, dtype=np.intp)
+    return pd.DataFrame({coluna: valores[inicios], "Quantidade": np.diff(np.append(inicios, len(valores)))})
+
+
+def buscar(indice, questoes, nome_da_aba, texto, ano_inicio=None, ano_fim=None, aplicacoes=None):
+    """
+    Questões da aba cujos rótulos têm todos os termos do texto (cada termo também vale
+    como começo de palavra: "eletro" acha "Eletrostática" e "Eletrodinâmica").
+    :param indice: Índice da aba (carregar_indice_busca)
+    :param texto: Texto digitado; acentos e maiúsculas não importam
+    :param ano_inicio: Primeiro ano (None = sem limite)
+    :param ano_fim: Último ano (None = sem limite)
+    :param aplicacoes: Aplicações da prova (None = todas)
+    :return: dict com "linhas" (posições na base, em ordem) e "facetas" {coluna de
+             FACETAS: DataFrame [coluna, "Quantidade"], sem vazios; anos em ordem e
+             rótulos do maior para o menor}
+    """
+    busca = termos(texto)
+    # Palavras comuns só contam se forem tudo o que foi digitado
+    busca = [termo for termo in busca if termo not in PALAVRAS_IGNORADAS] or busca
+
+    partes = []
+    if busca:
+        # Combinações com todos os termos: interseção das listas (pequenas)
+        listas = sorted((_combinacoes_do_prefixo(indice, termo) for termo in set(busca)), key=len)
+        combinacoes = listas[0]
+        for lista in listas[1:]:
+            combinacoes = np.intersect1d(combinacoes, lista, assume_unique=True)
+        marcadas = np.zeros(indice["n_combinacoes"], dtype=bool)
+        marcadas[combinacoes] = True
+
+        # Linhas: só nos trechos das partições dos anos e aplicações pedidos; o índice
+        # conta a partir do início da aba na base atual
+        inicio_aba = questoes["limites"].get(nome_da_aba, (0, 0))[0]
+        if len(combinacoes):
+            for inicio, fim in trechos(questoes, nome_da_aba, ano_inicio, ano_fim, aplicacoes):
+                combinacao = indice["combinacao"][inicio - inicio_aba:fim - inicio_aba]
+                partes.append(np.flatnonzero(marcadas[combinacao]) + inicio)
+    linhas = np.concatenate(partes) if partes else np.zeros(0, dtype=np.intp)
+    return {"linhas": linhas, "facetas": {coluna: _faceta(questoes, coluna, linhas) for coluna in FACETAS}}
+
+
+def refinar(questoes, linhas, filtros):
+    """
+    Recorte de um resultado de busca pelas facetas escolhidas.
+    :param linhas: Posições das linhas (buscar()["linhas"])
+    :param filtros: {coluna: lista de valores}; listas vazias não filtram
+    """
+    for coluna, valores in filtros.items():
+        if valores:
+            if coluna in questoes["codigos"]:
+                linhas = linhas[np.isin(questoes["codigos"][coluna][linhas], codigos_de(questoes, coluna, valores))]
+            else:
+                linhas = linhas[np.isin(questoes["numeros"][coluna][linhas], valores)]
+    return linhas
@@ -0,0 +1,233 @@
+import streamlit as st
+import numpy as np
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from importlib.metadata import version
+
+from perfil import contar_cache
+
+# Limite de memória do cache de figuras (soma do tamanho do JSON de cada figura)
+LIMITE_BYTES_FIGURAS = 64 * 1024 * 1024
+
+# Snapshots gerados por exportar_snapshots.py: figuras já prontas, servidas
+# direto do disco quando seção, filtros e versão da aba batem
+DIRETORIO_SNAPSHOTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+CAMINHO_INDICE_SNAPSHOTS = os.path.join(DIRETORIO_SNAPSHOTS, "indice.json")
+# Template das figuras Plotly: só o layout do template padrão (no app, o "streamlit":
+# paleta e escalas de cor, com as cores provisórias que o navegador troca pelas do
+# tema). O template inteiro tem ~3,4 KB, quase tudo estilos de tipos de traço que o
+# painel não usa (candlestick, waterfall, tabela...), e ia repetido em cada figura
+# a cada rerun.
+_template_enxuto = None
+# Arquivos que definem os gráficos: se algum mudar, os snapshots deixam de valer
+ARQUIVOS_GRAFICOS = ["painel_disciplina.py", "disciplinas.py", "agregados.py", "tendencias.py", "cache_figuras.py",
+                     "orcamento_figuras.py"]
+
+
+class CacheFiguras:
+    """
+    Cache LRU de figuras prontas, compartilhado entre sessões, com limite de memória.
+    A chave é (seção, filtros, versão dos dados); o tamanho de cada entrada é o
+    tamanho do seu JSON (estimado para as figuras Plotly), que é o que vai para o navegador.
+    """
+
+    def __init__(self, limite_bytes=LIMITE_BYTES_FIGURAS):
+        self.limite_bytes = limite_bytes
+        self._entradas = OrderedDict()  # chave -> (figura, tamanho)
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, chave, construir, medir):
+        """
+        Devolve a figura da chave, construindo (fora da trava) se não estiver em cache.
+        :param construir: Função sem argumentos que monta a figura
+        :param medir: Função figura -> tamanho em bytes
+        """
+        with self._trava:
+            if chave in self._entradas:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                contar_cache(True)
+                return self._entradas[chave][0]
+            self.faltas += 1
+        contar_cache(False)
+
+        figura = construir()
+        tamanho = medir(figura)
+
+        with self._trava:
+            if chave not in self._entradas and tamanho <= self.limite_bytes:
+                self._entradas[chave] = (figura, tamanho)
+                self._bytes += tamanho
+                # Remove as menos usadas até caber no limite
+                while self._bytes > self.limite_bytes:
+                    _, (_, tamanho_antigo) = self._entradas.popitem(last=False)
+                    self._bytes -= tamanho_antigo
+        return figura
+
+    def itens(self):
+        """Lista de (chave, figura) em cache, da menos para a mais usada."""
+        with self._trava:
+            return [(chave, figura) for chave, (figura, _) in self._entradas.items()]
+
+    def limpar(self):
+        with self._trava:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        with self._trava:
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+            }
+
+
+@st.cache_resource
+def cache_figuras():
+    """Instância única do cache de figuras por processo (compartilhada entre sessões)."""
+    return CacheFiguras()
+
+
+def _chave(secao, filtros, versao):
+    # filtros é um dict {nome: valor}; listas viram tuplas para poder usar como chave
+    itens = tuple(
+        (nome, tuple(valor) if isinstance(valor, list) else valor)
+        for nome, valor in sorted(filtros.items())
+    )
+    return (secao, itens, versao)
+
+
+def versao_codigo():
+    """Identificador do código que monta as figuras (ARQUIVOS_GRAFICOS + versões do Plotly e do Altair)."""
+    # Versões pelos metadados dos pacotes: não precisa importar Plotly nem Altair
+    h = hashlib.sha256(f"plotly {version('plotly')}, altair {version('altair')}".encode())
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    for nome in ARQUIVOS_GRAFICOS:
+        with open(os.path.join(diretorio, nome), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _indice_snapshots(mtime_ns):
+    # mtime_ns só entra na chave: uma nova exportação é lida sem reiniciar o app
+    with open(CAMINHO_INDICE_SNAPSHOTS, encoding="utf-8") as f:
+        indice = json.load(f)
+    # Exportados com outro código de gráficos: não servem mais
+    if indice.get("codigo") != versao_codigo():
+        return {}
+    return {
+        _chave(figura["secao"], figura["filtros"], figura["versao"]): os.path.join(DIRETORIO_SNAPSHOTS, figura["arquivo"])
+        for figura in indice["figuras"]
+    }
+
+
+def ler_snapshot(chave):
+    """
+    JSON (texto) da figura exportada para a chave, ou None se não houver snapshot.
+    :param chave: Chave do cache (ver _chave)
+    """
+    try:
+        mtime_ns = os.stat(CAMINHO_INDICE_SNAPSHOTS).st_mtime_ns
+        caminho = _indice_snapshots(mtime_ns).get(chave)
+        if caminho is None:
+            return None
+        with open(caminho, encoding="utf-8") as f:
+            return f.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def template_enxuto():
+    """Template mínimo (dict) para as figuras do app: o layout do template padrão do Plotly."""
+    global _template_enxuto
+    if _template_enxuto is None:
+        import plotly.io as pio
+
+        _template_enxuto = {"layout": pio.templates[pio.templates.default].layout.to_plotly_json()}
+    return _template_enxuto
+
+
+def _tamanho_json(valor):
+    """
+    Estimativa do tamanho em bytes do JSON de uma figura Plotly, sem serializá-la.
+    Arrays numéricos vão em base64 ({"dtype", "bdata"}): 4 bytes de texto a cada 3.
+    """
+    if isinstance(valor, np.ndarray):
+        if valor.dtype.kind in "biuf":
+            return valor.nbytes * 4 // 3 + 30
+        return _tamanho_json(valor.tolist())
+    if isinstance(valor, dict):
+        return sum(len(chave) + 4 + _tamanho_json(item) for chave, item in valor.items()) + 2
+    if isinstance(valor, (list, tuple)):
+        return sum(_tamanho_json(item) + 1 for item in valor) + 2
+    if isinstance(valor, str):
+        return len(valor) + 2
+    return 8
+
+
+def figura_plotly(secao, filtros, versao, construir):
+    """
+    Figura Plotly da seção para os filtros dados, montada só na primeira vez.
+    A figura devolvida é compartilhada: não a modifique.
+    :param secao: Nome da seção/gráfico (ex: "fisica/frentes")
+    :param filtros: dict com todos os valores de que a figura depende
+    :param versao: Versão da aba de onde vêm os dados (estado["versoes_abas"][aba], ver utils.estado_dados)
+    :param construir: Função sem argumentos que devolve um go.Figure
+             (o template é trocado pelo template_enxuto)
+    """
+    import plotly.io as pio
+
+    chave = _chave(secao, filtros, versao)
+
+    def snapshot_ou_construir():
+        texto = ler_snapshot(chave)
+        if texto is not None:
+            try:
+                return pio.from_json(texto)
+            except ValueError:
+                pass  # Snapshot de outra versão do Plotly: monta de novo
+        figura = construir()
+        figura.layout.template = template_enxuto()  # Atribuição, não update_layout: substitui em vez de mesclar
+        return figura
+
+    return cache_figuras().obter(
+        chave,
+        snapshot_ou_construir,
+        # _data e _layout são os dicts que o Plotly serializa: percorrê-los não copia nada
+        lambda figura: _tamanho_json(figura._data) + _tamanho_json(figura._layout),
+    )
+
+
+def spec_altair(secao, filtros, versao, construir):
+    """
+    Especificação Vega-Lite (dict já serializável) de um gráfico Altair, montada só
+    na primeira vez. Mostre com st.vega_lite_chart.
+    :param construir: Função sem argumentos que devolve um alt.Chart
+    """
+    chave = _chave(secao, filtros, versao)
+
+    def snapshot_ou_construir():
+        texto = ler_snapshot(chave)
+        if texto is not None:
+            try:
+                return json.loads(texto)
+            except ValueError:
+                pass
+        return construir().to_dict()
+
+    spec = cache_figuras().obter(
+        chave,
+        snapshot_ou_construir,
+        lambda spec: len(json.dumps(spec)),
+    )
+    # Cópia rasa: o st.vega_lite_chart remove "datasets" do dict que recebe
+    return dict(spec)
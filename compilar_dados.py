@@ -0,0 +1,35 @@
+"""
+Compila as planilhas de dados/ (dados_enem_natureza.xlsx e outros .xlsx) para o
+cache colunar (Arrow), particionado por disciplina, ano e aplicação. Só as abas que
+mudaram são relidas do Excel, validadas e canonizadas (validacao.py); as linhas
+rejeitadas e os rótulos ajustados de cada aba ficam em cache/validacao/<aba>.json.
+
+Uso:
+    python compilar_dados.py            # recompila só as abas que mudaram
+    python compilar_dados.py --forcar   # recompila todas as abas
+"""
+import argparse
+import os
+
+from utils import DIRETORIO_CACHE, compilar_cache_colunar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--planilha", nargs="+", help="Arquivos Excel de origem (padrão: os .xlsx de dados/)")
+    parser.add_argument("--forcar", action="store_true", help="Recompila mesmo sem mudanças nas planilhas")
+    args = parser.parse_args()
+
+    manifesto = compilar_cache_colunar(args.planilha, forcar=args.forcar)
+    print(f"Cache em {DIRETORIO_CACHE} (versão {manifesto['versao'][:12]}, regras {manifesto['regras']})")
+    for aba, (inicio, fim) in manifesto["abas"].items():
+        particoes = sum(1 for particao in manifesto["particoes"] if particao["aba"] == aba)
+        print(f"  {aba}: {fim - inicio} questões em {particoes} partições (ano, aplicação)")
+        validacao = manifesto["validacao"][aba]
+        if validacao["rejeitadas"] or validacao["ajustes"]:
+            relatorio = os.path.join(DIRETORIO_CACHE, *validacao["relatorio"].split("/"))
+            print(f"    {validacao['rejeitadas']} linhas rejeitadas, {validacao['ajustes']} valores ajustados: {relatorio}")
+
+
+if __name__ == "__main__":
+    main()
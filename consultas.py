@@ -0,0 +1,152 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import importlib.util
+import logging
+import os
+
+from base_questoes import codigos_de, contar_por, filtrar, trechos
+
+# Consultas de agregação sobre as questões, com dois motores que devolvem exatamente
+# os mesmos DataFrames:
+#   duckdb  GROUP BY em SQL, vetorizado e em várias threads, direto sobre os arrays de
+#           códigos da base compacta (sem cópia: a memória é a mesma do memory-map);
+#           só os trechos das partições pedidas entram na consulta. Opcional:
+#           pip install duckdb
+#   numpy   contagem sobre os mesmos códigos (base_questoes.contar_por)
+# Os dois agrupam inteiros, nunca textos: os rótulos só voltam no resultado, que é
+# pequeno. Sem o DuckDB instalado vale o numpy; ENEM_MOTOR_CONSULTAS=numpy força o
+# numpy mesmo com o DuckDB instalado.
+
+MOTOR_PADRAO = os.environ.get("ENEM_MOTOR_CONSULTAS", "duckdb")
+
+# Abaixo disso o numpy (uma thread, sem a ida e volta do SQL) é mais rápido; medido em
+# 100 mil linhas: numpy 5 ms x DuckDB 8 ms; em 1 milhão: numpy 40 ms x DuckDB 26 ms
+LINHAS_MINIMAS_DUCKDB = 300_000
+
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource(show_spinner=False)
+def _conexao():
+    # Uma base DuckDB em memória por processo; cada consulta usa um cursor próprio
+    # (conexão independente), então threads diferentes podem consultar ao mesmo tempo
+    import duckdb
+
+    return duckdb.connect()
+
+
+def motor_consultas(linhas=None):
+    """
+    Motor usado numa consulta: "duckdb" (se instalado, não desligado e, com `linhas`,
+    a partir de LINHAS_MINIMAS_DUCKDB linhas) ou "numpy".
+    :param linhas: Linhas que a consulta vai ler (None = não considera o tamanho)
+    """
+    if MOTOR_PADRAO != "duckdb" or (linhas is not None and linhas < LINHAS_MINIMAS_DUCKDB):
+        return "numpy"
+    # Sem importar: o DuckDB só é carregado na primeira consulta grande
+    return "duckdb" if importlib.util.find_spec("duckdb") is not None else "numpy"
+
+
+def _contar_duckdb(questoes, colunas, trechos_linhas, filtros):
+    import pyarrow as pa
+
+    # Uma fatia (vista, sem cópia) de cada array por trecho; os filtros viram IN sobre os códigos
+    usadas = list(dict.fromkeys([*colunas, *(filtros or {})]))
+    arrays = {coluna: questoes["codigos"].get(coluna, questoes["numeros"].get(coluna)) for coluna in usadas}
+    lotes = [
+        pa.record_batch({coluna: array[inicio:fim] for coluna, array in arrays.items()})
+        for inicio, fim in trechos_linhas
+        if fim > inicio
+    ]
+
+    condicoes = []
+    for coluna, valores in (filtros or {}).items():
+        codigos = codigos_de(questoes, coluna, valores)
+        condicoes.append(f'"{coluna}" IN ({", ".join(map(str, codigos.tolist()))})' if len(codigos) else "FALSE")
+    selecao = ", ".join(f'"{coluna}"' for coluna in colunas)
+    onde = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+
+    cursor = _conexao().cursor()
+    try:
+        cursor.register("questoes", pa.Table.from_batches(lotes))
+        resultado = cursor.execute(
+            f'SELECT {selecao}, count(*) AS "Quantidade" FROM questoes {onde} GROUP BY ALL'
+        ).fetchnumpy()
+    finally:
+        cursor.close()
+    return {coluna: np.asarray(resultado[coluna]) for coluna in colunas}, np.asarray(resultado["Quantidade"])
+
+
+def _contagem(questoes, colunas, valores, quantidade):
+    # Mesmos tipos e ordem de base_questoes.contar_por: combinações em ordem de código,
+    # vazios (-1) no fim, e os rótulos em category sobre o dicionário da base
+    chaves = []
+    for coluna in colunas:
+        if coluna in questoes["codigos"]:
+            codigos = valores[coluna].astype(np.int64)
+            chaves.append(np.where(codigos < 0, len(questoes["dicionarios"][coluna]), codigos))
+        else:
+            chaves.append(valores[coluna])
+    ordem = np.lexsort(chaves[::-1])
+
+    contagem = {}
+    for coluna in colunas:
+        if coluna in questoes["codigos"]:
+            dtype = pd.CategoricalDtype(questoes["dicionarios"][coluna])
+            contagem[coluna] = pd.Categorical.from_codes(valores[coluna][ordem].astype(np.int64), dtype=dtype)
+        else:
+            contagem[coluna] = valores[coluna][ordem].astype(questoes["numeros"][coluna].dtype)
+    contagem = pd.DataFrame(contagem)
+    contagem["Quantidade"] = quantidade[ordem].astype(np.int64)
+    return contagem
+
+
+def contar_questoes(estado, nome_da_aba, colunas, ano_inicio=None, ano_fim=None, aplicacoes=None, filtros=None):
+    """
+    Questões por combinação das colunas, só das linhas que passam nos filtros.
+    :param estado: Estado de utils.estado_dados()
+    :param colunas: Colunas da base (rótulos e/ou "Ano")
+    :param ano_inicio: Primeiro ano (None = sem limite)
+    :param ano_fim: Último ano (None = sem limite)
+    :param aplicacoes: Aplicações da prova (None = todas)
+    :param filtros: {coluna: valor ou lista de valores}
+    :return: DataFrame [colunas..., "Quantidade"] na ordem das combinações (como um
+             groupby), com as colunas de rótulos em category
+    """
+    questoes = estado["questoes"]
+    colunas = list(colunas)
+    trechos_linhas = trechos(questoes, nome_da_aba, ano_inicio, ano_fim, aplicacoes)
+    if motor_consultas(sum(fim - inicio for inicio, fim in trechos_linhas)) == "duckdb":
+        try:
+            valores, quantidade = _contar_duckdb(questoes, colunas, trechos_linhas, filtros)
+            return _contagem(questoes, colunas, valores, quantidade)
+        except Exception:
+            logger.exception("Consulta no DuckDB falhou; usando o motor numpy")
+
+    linhas = filtrar(questoes, nome_da_aba, ano_inicio, ano_fim, filtros, aplicacoes)
+    return contar_por(questoes, colunas, linhas)
+
+
+def grade_anos(estado, nome_da_aba, coluna, ano_inicio, ano_fim, valores=None, todos_os_anos=True,
+               aplicacoes=None, filtros=None):
+    """
+    Contagem por (Ano, coluna) com zero nas combinações sem questões (ex: Ano × Frente,
+    Ano × Tópico). Só a contagem passa pelo motor; o preenchimento é sobre o resultado.
+    :param valores: Valores de `coluna` na grade (None = os que têm questões, em ordem)
+    :param todos_os_anos: Todos os anos de ano_inicio a ano_fim; False = só os que têm questões
+    :return: DataFrame ["Ano", coluna, "Quantidade"], ordenado por Ano
+    """
+    contagem = contar_questoes(estado, nome_da_aba, ["Ano", coluna], ano_inicio, ano_fim, aplicacoes, filtros)
+    contagem = contagem[contagem[coluna].notna()]
+    if valores is None:
+        valores = list(contagem[coluna].cat.remove_unused_categories().cat.categories)
+    anos = range(ano_inicio, ano_fim + 1) if todos_os_anos else sorted(set(contagem["Ano"].tolist()))
+    indice = pd.MultiIndex.from_product([list(anos), list(valores)], names=["Ano", coluna])
+    return (
+        contagem.groupby(["Ano", coluna], observed=True)["Quantidade"]
+        .sum()
+        .reindex(indice, fill_value=0)
+        .astype(int)
+        .reset_index()
+    )
@@ -0,0 +1,66 @@
+# Especificações das páginas de disciplina (usadas por painel_disciplina.renderizar_painel)
+#
+# Chaves:
+#   aba           -> nome da aba na planilha dados/dados_enem_natureza.xlsx
+#   pagina        -> arquivo da página (usado por exportar_snapshots.py)
+#   nome, titulo  -> textos exibidos na página
+#   kpis          -> lista de (rótulo, [frentes]) com a % de questões de cada grupo;
+#                    None usa as 3 frentes com mais questões no período
+#   cores_tipo    -> cor fixa de cada Tipo de questão
+#   cores_frentes -> sequência de cores da pizza de frentes
+#   secoes        -> seções do painel, na ordem (ver painel_disciplina.SECOES)
+
+# Mapeamento fixo de cores
+CORES_TIPO_QUESTAO = {
+    "Conta": "#0c3d0e",       # Verde Escuro (Sua cor preferida)
+    "Conceitual": "#f5ac19",  # Laranja (A terceira cor da sua lista anterior)
+    # Adicionei a cor vermelha da sua lista caso exista uma terceira categoria ou erro
+    "Mista": "#ed3d00",
+    "(?)": "#ed3d00"
+}
+
+# Usando tons de verde discretos (reverse para começar escuro)
+CORES_FRENTES = ['#0c3d0e', '#ed3d00', '#f5ac19']
+
+SECOES_PADRAO = ["kpis", "busca", "visao_geral", "evolucao", "tendencias", "detalhe", "coocorrencias"]
+
+FISICA = {
+    "aba": "Fisica",
+    "pagina": "pages/fisica.py",
+    "nome": "Física",
+    "titulo": "⚛️ Física ENEM",
+    "kpis": [
+        ("Mecânica", ["Mecânica"]),
+        ("Eletromagnetismo", ["Eletromagnetismo"]),
+        ("Termo / Ondul. / Óptica", ["Termofísica", "Ondulatória", "Óptica"]),
+    ],
+    "cores_tipo": CORES_TIPO_QUESTAO,
+    "cores_frentes": CORES_FRENTES,
+    "secoes": SECOES_PADRAO,
+}
+
+# Química e Biologia ainda não têm questões na planilha: os KPIs ficam
+# automáticos (frentes mais cobradas) até definirmos os agrupamentos.
+QUIMICA = {
+    "aba": "Quimica",
+    "pagina": "pages/quimica.py",
+    "nome": "Química",
+    "titulo": "🧪 Química ENEM",
+    "kpis": None,
+    "cores_tipo": CORES_TIPO_QUESTAO,
+    "cores_frentes": CORES_FRENTES,
+    "secoes": SECOES_PADRAO,
+}
+
+BIOLOGIA = {
+    "aba": "Biologia",
+    "pagina": "pages/biologia.py",
+    "nome": "Biologia",
+    "titulo": "🧬 Biologia ENEM",
+    "kpis": None,
+    "cores_tipo": CORES_TIPO_QUESTAO,
+    "cores_frentes": CORES_FRENTES,
+    "secoes": SECOES_PADRAO,
+}
+
+DISCIPLINAS = [FISICA, QUIMICA, BIOLOGIA]
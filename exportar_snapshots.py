@@ -0,0 +1,201 @@
+"""
+Exporta snapshots estáticos das visões mais acessadas das páginas de disciplina.
+
+Cada visão (disciplina + filtros) é renderizada pela própria página, sem navegador,
+e as figuras montadas vão para snapshots/:
+    snapshots/indice.json             -> índice lido pelo dashboard (cache_figuras.py)
+    snapshots/figuras/*.json          -> JSON de cada figura (Plotly ou Vega-Lite)
+    snapshots/<aba>/<visao>.html      -> página estática com os gráficos da visão
+
+Enquanto a versão dos dados e o código dos gráficos forem os mesmos, o dashboard
+serve essas figuras direto do disco em vez de montá-las.
+
+Visões exportadas: para cada disciplina, a visão inicial (sem mexer em nenhum filtro)
+e o período completo; mais as combinações do arquivo passado em --filtros, uma lista
+JSON como:
+    [{"disciplina": "Fisica", "ano_inicio": 2016, "ano_fim": 2025, "frente": "Mecânica"}]
+Chaves aceitas: disciplina (aba), nome, aplicacoes (lista), ano_inicio, ano_fim, frente,
+topico, nivel.
+
+Uso:
+    python exportar_snapshots.py
+    python exportar_snapshots.py --filtros visoes.json
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+
+import altair as alt
+import plotly.io as pio
+from streamlit.testing.v1 import AppTest
+
+from arquivos import escrever_atomico
+from utils import DIRETORIO_RAIZ, carregar_dados, estado_dados
+from disciplinas import DISCIPLINAS
+from cache_figuras import DIRETORIO_SNAPSHOTS, CAMINHO_INDICE_SNAPSHOTS, cache_figuras, versao_codigo
+
+# Filtro da visão -> chave do widget na página (o {aba} vem da especificação)
+WIDGETS_FILTROS = {
+    "aplicacoes": "{aba}_aplicacoes",
+    "ano_inicio": "{aba}_ano_inicio",
+    "ano_fim": "{aba}_ano_fim",
+    "frente": "{aba}_frente_detalhe",
+    "topico": "{aba}_topico_analise",
+    "nivel": "{aba}_nivel_tendencias",
+}
+
+
+def visoes_padrao(espec):
+    """Visão inicial e período completo da disciplina."""
+    visoes = [{"nome": "inicial"}]
+    anos = carregar_dados(espec["aba"], estado_dados())["Ano"]
+    if len(anos):
+        visoes.append({"nome": "periodo_completo", "ano_inicio": int(anos.min()), "ano_fim": int(anos.max())})
+    return visoes
+
+
+def renderizar_visao(espec, filtros):
+    """
+    Roda a página da disciplina com os filtros da visão e devolve o AppTest.
+    As figuras montadas ficam no cache de figuras do processo.
+    """
+    at = AppTest.from_file(os.path.join(DIRETORIO_RAIZ, "home.py"), default_timeout=120)
+    at.switch_page(espec["pagina"])
+    at.run()
+
+    # Aplica os filtros na ordem da página: cada widget só existe depois do anterior
+    for filtro, chave in WIDGETS_FILTROS.items():
+        if filtro not in filtros:
+            continue
+        chave = chave.format(aba=espec["aba"])
+        widgets = [w for w in [*at.multiselect, *at.selectbox, *at.radio] if w.key == chave]
+        if not widgets:
+            raise ValueError(f"Filtro '{filtro}' não existe na página de {espec['nome']}")
+        widgets[0].set_value(filtros[filtro])
+        at.run()
+
+    if at.exception:
+        raise RuntimeError(f"Erro ao renderizar {espec['nome']}: {at.exception[0].value}")
+    return at
+
+
+def _html_visao(espec, visao, figuras):
+    # Página estática: Plotly e Vega-Embed vêm de CDN
+    partes = [
+        "<!DOCTYPE html>",
+        '<html lang="pt-BR"><head><meta charset="utf-8">',
+        f"<title>{html.escape(espec['titulo'])} — {html.escape(visao['nome'])}</title>",
+        f'<script src="https://cdn.jsdelivr.net/npm/vega@{alt.VEGA_VERSION}"></script>',
+        f'<script src="https://cdn.jsdelivr.net/npm/vega-lite@{alt.VEGALITE_VERSION}"></script>',
+        f'<script src="https://cdn.jsdelivr.net/npm/vega-embed@{alt.VEGAEMBED_VERSION}"></script>',
+        "</head><body>",
+        f"<h1>{html.escape(espec['titulo'])}</h1>",
+        f"<p>{html.escape(json.dumps({k: v for k, v in visao.items() if k != 'nome'}, ensure_ascii=False))}</p>",
+    ]
+    primeira_plotly = True
+    for i, (tipo, figura) in enumerate(figuras):
+        if tipo == "plotly":
+            partes.append(pio.to_html(
+                figura, full_html=False, include_plotlyjs="cdn" if primeira_plotly else False, validate=False
+            ))
+            primeira_plotly = False
+        else:
+            partes.append(f'<div id="vega{i}"></div>')
+            partes.append(f'<script>vegaEmbed("#vega{i}", {json.dumps(figura)});</script>')
+    partes.append("</body></html>")
+    return "\n".join(partes)
+
+
+def _escrever(caminho, texto):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+    def escrever(temporario):
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(texto)
+    escrever_atomico(caminho, escrever)
+
+
+def exportar(combinacoes=()):
+    """
+    Renderiza as visões de todas as disciplinas e grava os snapshots.
+    :param combinacoes: Visões extras (dicts no formato do --filtros)
+    :return: Índice gravado em snapshots/indice.json
+    """
+    estado = estado_dados()
+    cache = cache_figuras()
+    figuras_indice = {}  # chave do cache -> entrada do índice
+    arquivos = set()
+    visoes_indice = []
+
+    for espec in DISCIPLINAS:
+        visoes = visoes_padrao(espec) + [
+            {"nome": f"filtros_{i}", **{k: v for k, v in c.items() if k != "disciplina"}}
+            for i, c in enumerate(combinacoes)
+            if c.get("disciplina") == espec["aba"]
+        ]
+        for visao in visoes:
+            # Cache vazio antes de cada visão: o que sobrar nele é exatamente o que ela usa
+            cache.limpar()
+            renderizar_visao(espec, visao)
+
+            figuras = []
+            for (secao, filtros, versao), figura in cache.itens():
+                tipo = "vega" if isinstance(figura, dict) else "plotly"
+                texto = json.dumps(figura) if tipo == "vega" else pio.to_json(figura, validate=False)
+                arquivo = f"figuras/{hashlib.sha256(texto.encode('utf-8')).hexdigest()[:16]}.json"
+                if arquivo not in arquivos:
+                    _escrever(os.path.join(DIRETORIO_SNAPSHOTS, arquivo), texto)
+                    arquivos.add(arquivo)
+                figuras_indice[(secao, filtros, versao)] = {
+                    "secao": secao,
+                    "filtros": dict(filtros),
+                    "versao": versao,
+                    "tipo": tipo,
+                    "arquivo": arquivo,
+                }
+                figuras.append((tipo, figura))
+
+            if not figuras:
+                continue
+            pagina = f"{espec['aba']}/{visao['nome']}.html"
+            _escrever(os.path.join(DIRETORIO_SNAPSHOTS, pagina), _html_visao(espec, visao, figuras))
+            visoes_indice.append({"disciplina": espec["aba"], **visao, "html": pagina})
+
+    indice = {
+        "versao_dados": estado["versao"],
+        "codigo": versao_codigo(),
+        "visoes": visoes_indice,
+        "figuras": list(figuras_indice.values()),
+    }
+    # Índice por último: o dashboard só passa a usar os snapshots quando tudo já está no disco
+    _escrever(CAMINHO_INDICE_SNAPSHOTS, json.dumps(indice, ensure_ascii=False, indent=2))
+
+    # Figuras de exportações anteriores que não fazem mais parte do índice
+    diretorio_figuras = os.path.join(DIRETORIO_SNAPSHOTS, "figuras")
+    if os.path.isdir(diretorio_figuras):
+        for nome in os.listdir(diretorio_figuras):
+            if f"figuras/{nome}" not in arquivos:
+                os.remove(os.path.join(diretorio_figuras, nome))
+    return indice
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filtros", help="Arquivo JSON com combinações extras de filtros")
+    args = parser.parse_args()
+
+    combinacoes = []
+    if args.filtros:
+        with open(args.filtros, encoding="utf-8") as f:
+            combinacoes = json.load(f)
+
+    indice = exportar(combinacoes)
+    print(f"Snapshots em {DIRETORIO_SNAPSHOTS}: {len(indice['visoes'])} visões, {len(indice['figuras'])} figuras")
+    for visao in indice["visoes"]:
+        print(f"  {visao['html']}")
+
+
+if __name__ == "__main__":
+    main()
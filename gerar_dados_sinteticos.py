@@ -0,0 +1,328 @@
+"""
+Gera questões sintéticas do ENEM (Ciências da Natureza) para testes de escala.
+
+Mesmo esquema da planilha real: Ano, Número (Cinza), Frente, Tópico, Subtópico 1,
+Subtópico 2 e Tipo, mais a coluna Aplicação com --aplicacoes 2 ou mais.
+
+Os rótulos de conteúdo são reais, com a concentração típica da prova: poucas frentes
+e tópicos respondem pela maior parte das questões (distribuição de Zipf).
+
+Saídas em --saida:
+    dados_enem_natureza.xlsx   -> uma aba por disciplina (formato xlsx)
+    <Aba>.arrow                -> uma tabela Arrow/Feather por disciplina (formato arrow)
+
+Uso:
+    python gerar_dados_sinteticos.py --questoes 100000 --saida /tmp/enem_100k
+    python gerar_dados_sinteticos.py --questoes 1000000 --formato arrow --topicos 12 --subtopicos 20
+
+Para abrir o dashboard com os dados gerados:
+    ENEM_DIRETORIO_DADOS=/tmp/enem_100k streamlit run home.py
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from base_questoes import APLICACOES
+from utils import tipar_colunas
+
+# Frente -> Tópico -> Subtópicos, na ordem de frequência usada pela distribuição de Zipf
+VOCABULARIO = {
+    "Fisica": {
+        "Mecânica": {
+            "Cinemática": ["Velocidade Média", "Movimento Retilíneo Uniforme (MRU)",
+                           "Movimento Retilíneo Uniformemente Variado (MUV)", "Lançamento Oblíquo",
+                           "Movimento Circular Uniforme (MCU)", "Composição de Movimentos"],
+            "Dinâmica": ["Leis de Newton", "Força de Atrito", "Tração e Polias", "Peso e Normal",
+                         "Resultante Centrípeta"],
+            "Energia": ["Energia e conversões", "Conservação da energia mecânica", "Potência", "Trabalho"],
+            "Hidrostática": ["Densidade e Pressão", "Teorema de Stevin", "Empuxo", "Princípio de Pascal"],
+            "Estática": ["Equilíbrio de corpo extenso", "Estática de ponto material", "Centro de Massa"],
+            "Gravitação": ["Lei da Gravitação Universal", "Leis de Kepler"],
+        },
+        "Eletromagnetismo": {
+            "Eletrodinâmica": ["Análise de Circuitos", "Primeira Lei de Ohm", "Energia elétrica",
+                               "Potência elétrica", "Geradores e Receptores", "Segunda Lei de Ohm"],
+            "Magnetismo": ["Ímã e campo magnético", "Indução e Força Eletromotriz",
+                           "Força magnética sobre cargas", "Transformadores"],
+            "Eletrostática": ["Carga elétrica e processos de eletrização", "Campo Elétrico",
+                              "Fenômenos Eletrostáticos", "Potencial Elétrico"],
+        },
+        "Ondulatória": {
+            "Ondas": ["Características de Ondas", "Fenômenos Ondulatórios", "Espectro Eletromagnético",
+                      "Equação Fundamental da Ondulatória", "Ondas Estacionárias"],
+            "Acústica": ["Estudo do Som", "Efeito Doppler", "Tubos sonoros", "Cordas vibrantes"],
+        },
+        "Termofísica": {
+            "Termologia": ["Calorimetria", "Transferência de Calor", "Dilatação Térmica", "Mudanças de Fase"],
+            "Termodinâmica": ["Gases e transformações gasosas", "Primeira Lei da Termodinâmica",
+                              "Máquinas Térmicas e Segunda Lei da Termodinâmica", "Ciclos Termodinâmicos"],
+        },
+        "Óptica": {
+            "Óptica Geométrica": ["Refração", "Espelhos Esféricos", "Princípios de propagação da luz",
+                                  "Lentes", "Espelhos Planos"],
+            "Óptica da visão": ["Olho Humano", "Defeitos da visão"],
+        },
+        "Física Moderna": {
+            "Estrutura Atômica": ["Radiação", "Efeito Fotoelétrico", "Modelos Atômicos"],
+            "Relatividade": ["Dilatação do tempo", "Equivalência massa-energia"],
+        },
+    },
+    "Quimica": {
+        "Físico-Química": {
+            "Soluções": ["Concentração Comum", "Diluição", "Molaridade", "Propriedades Coligativas"],
+            "Termoquímica": ["Entalpia de Reação", "Lei de Hess", "Energia de Ligação"],
+            "Eletroquímica": ["Pilhas", "Eletrólise", "Potencial de Redução", "Corrosão"],
+            "Equilíbrio Químico": ["Constante de Equilíbrio", "pH e pOH", "Princípio de Le Chatelier",
+                                   "Hidrólise Salina"],
+            "Cinética Química": ["Velocidade de Reação", "Fatores que Alteram a Velocidade", "Catalisadores"],
+        },
+        "Química Geral": {
+            "Estequiometria": ["Cálculo Estequiométrico", "Reagente Limitante", "Rendimento", "Pureza"],
+            "Atomística": ["Modelos Atômicos", "Distribuição Eletrônica", "Radioatividade"],
+            "Ligações Químicas": ["Ligação Iônica", "Ligação Covalente", "Polaridade", "Forças Intermoleculares"],
+            "Separação de Misturas": ["Destilação", "Filtração", "Cromatografia"],
+        },
+        "Química Orgânica": {
+            "Funções Orgânicas": ["Identificação de Funções", "Nomenclatura", "Álcoois e Fenóis",
+                                  "Ácidos Carboxílicos"],
+            "Reações Orgânicas": ["Combustão", "Esterificação", "Polimerização", "Saponificação"],
+            "Isomeria": ["Isomeria Plana", "Isomeria Óptica", "Isomeria Geométrica"],
+        },
+        "Química Inorgânica": {
+            "Funções Inorgânicas": ["Ácidos e Bases", "Sais", "Óxidos"],
+            "Reações Inorgânicas": ["Neutralização", "Oxirredução", "Precipitação"],
+        },
+        "Química Ambiental": {
+            "Poluição": ["Chuva Ácida", "Efeito Estufa", "Tratamento de Água", "Camada de Ozônio"],
+            "Ciclos Biogeoquímicos": ["Ciclo do Carbono", "Ciclo do Nitrogênio"],
+        },
+    },
+    "Biologia": {
+        "Ecologia": {
+            "Relações Ecológicas": ["Predação", "Mutualismo", "Parasitismo", "Competição"],
+            "Cadeias e Teias Alimentares": ["Níveis Tróficos", "Fluxo de Energia", "Pirâmides Ecológicas"],
+            "Ciclos Biogeoquímicos": ["Ciclo do Carbono", "Ciclo do Nitrogênio", "Ciclo da Água"],
+            "Impactos Ambientais": ["Desmatamento", "Eutrofização", "Bioacumulação", "Espécies Invasoras"],
+            "Biomas": ["Cerrado", "Amazônia", "Caatinga", "Mata Atlântica"],
+        },
+        "Genética": {
+            "Leis de Mendel": ["Primeira Lei de Mendel", "Segunda Lei de Mendel", "Heredogramas"],
+            "Biotecnologia": ["DNA Recombinante", "Clonagem", "Transgênicos", "PCR"],
+            "Herança": ["Grupos Sanguíneos", "Herança Ligada ao Sexo", "Polialelia"],
+        },
+        "Fisiologia Humana": {
+            "Sistema Imunológico": ["Vacinas e Soros", "Resposta Imune", "Doenças Autoimunes"],
+            "Sistema Digestório": ["Enzimas Digestivas", "Absorção de Nutrientes"],
+            "Sistema Endócrino": ["Hormônios", "Diabetes"],
+            "Sistema Nervoso": ["Neurônios e Sinapses", "Drogas e Sistema Nervoso"],
+        },
+        "Citologia": {
+            "Metabolismo Energético": ["Respiração Celular", "Fotossíntese", "Fermentação"],
+            "Organelas": ["Mitocôndria", "Cloroplasto", "Ribossomos"],
+            "Divisão Celular": ["Mitose", "Meiose"],
+            "Síntese Proteica": ["Transcrição", "Tradução", "Código Genético"],
+        },
+        "Evolução": {
+            "Teorias Evolutivas": ["Seleção Natural", "Lamarckismo", "Especiação"],
+            "Evidências da Evolução": ["Fósseis", "Órgãos Homólogos e Análogos"],
+        },
+        "Saúde e Doenças": {
+            "Doenças Infecciosas": ["Viroses", "Bacterioses", "Protozooses", "Verminoses"],
+            "Saneamento": ["Tratamento de Esgoto", "Doenças de Veiculação Hídrica"],
+        },
+        "Botânica": {
+            "Fisiologia Vegetal": ["Transpiração", "Hormônios Vegetais", "Fotoperiodismo"],
+            "Reprodução Vegetal": ["Polinização", "Ciclo de Vida das Plantas"],
+        },
+    },
+}
+
+# Proporção de questões de Conta por disciplina (o resto é Conceitual)
+PROPORCAO_CONTA = {"Fisica": 0.47, "Quimica": 0.4, "Biologia": 0.08}
+
+COLUNAS_ABA = ["Ano", "Número (Cinza)", "Frente", "Tópico", "Subtópico 1", "Subtópico 2", "Tipo"]
+QUESTOES_POR_APLICACAO = 45  # Questões 91 a 135 do caderno cinza
+PRIMEIRA_QUESTAO = 91
+FILHOS_PADRAO = 3  # Tópicos/subtópicos de uma frente/tópico que não está no vocabulário
+
+
+def _pesos_zipf(n, assimetria):
+    pesos = 1.0 / np.arange(1, n + 1) ** assimetria
+    return pesos / pesos.sum()
+
+
+def _nomes(reais, quantidade, prefixo):
+    # Os primeiros rótulos são reais; se pedirem mais, completa com rótulos numerados
+    if quantidade is None:
+        # Níveis inventados (ex: frente além do vocabulário) ganham alguns filhos
+        quantidade = len(reais) or FILHOS_PADRAO
+    if quantidade <= len(reais):
+        return list(reais[:quantidade])
+    return list(reais) + [f"{prefixo} {i}" for i in range(len(reais) + 1, quantidade + 1)]
+
+
+def hierarquia(aba, frentes=None, topicos=None, subtopicos=None):
+    """
+    Lista de (Frente, Tópico, [Subtópicos]) da disciplina com as cardinalidades pedidas.
+    :param frentes: Frentes por disciplina (None = as do vocabulário)
+    :param topicos: Tópicos por frente (None = os do vocabulário)
+    :param subtopicos: Subtópicos por tópico (None = os do vocabulário)
+    """
+    vocabulario = VOCABULARIO[aba]
+    itens = []
+    for frente in _nomes(list(vocabulario), frentes, "Frente"):
+        conteudo = vocabulario.get(frente, {})
+        for topico in _nomes(list(conteudo), topicos, f"{frente} - Tópico"):
+            itens.append((frente, topico, _nomes(conteudo.get(topico, []), subtopicos, f"{topico} - Subtópico")))
+    return itens
+
+
+def gerar_aba(aba, n_questoes, rng, ano_inicial=1998, ano_final=2025, aplicacoes=1,
+              frentes=None, topicos=None, subtopicos=None, assimetria=1.1, prob_subtopico_2=0.18):
+    """
+    Questões sintéticas de uma disciplina, geradas de forma vetorizada.
+    :param aplicacoes: Aplicações da prova por ano (regular, PPL, reaplicação, ...); com
+                       mais de uma, as questões ganham a coluna Aplicação
+    :param assimetria: Expoente de Zipf: 0 = uniforme; quanto maior, mais concentrado
+    :param prob_subtopico_2: Proporção de questões com um segundo subtópico
+    :return: DataFrame com as colunas da planilha (COLUNAS_ABA, com Aplicação depois de Ano
+             se houver mais de uma aplicação), sem duas questões com o mesmo
+             (Ano, Aplicação, Número (Cinza))
+    """
+    itens = hierarquia(aba, frentes, topicos, subtopicos)
+
+    # Probabilidade conjunta (frente, tópico, subtópico): Zipf em cada nível
+    n_frentes = len({frente for frente, _, _ in itens})
+    peso_frente = dict(zip(dict.fromkeys(frente for frente, _, _ in itens), _pesos_zipf(n_frentes, assimetria)))
+    folhas, pesos = [], []
+    for frente, topico, subs in itens:
+        n_topicos = sum(1 for f, _, _ in itens if f == frente)
+        posicao = [t for f, t, _ in itens if f == frente].index(topico)
+        peso_topico = _pesos_zipf(n_topicos, assimetria)[posicao]
+        for posicao_sub, (sub, peso_sub) in enumerate(zip(subs, _pesos_zipf(len(subs), assimetria))):
+            folhas.append((frente, topico, sub, posicao_sub, len(subs) - posicao_sub))
+            pesos.append(peso_frente[frente] * peso_topico * peso_sub)
+    pesos = np.array(pesos) / np.sum(pesos)
+
+    escolha = rng.choice(len(folhas), size=n_questoes, p=pesos)
+    frente = np.array([f for f, _, _, _, _ in folhas], dtype=object)[escolha]
+    topico = np.array([t for _, t, _, _, _ in folhas], dtype=object)[escolha]
+    sub1 = np.array([s for _, _, s, _, _ in folhas], dtype=object)[escolha]
+
+    # Segundo subtópico: outro do mesmo tópico (a folha seguinte no mesmo tópico, circularmente)
+    deslocamento = np.array([d for _, _, _, _, d in folhas])[escolha]
+    posicao_sub = np.array([p for _, _, _, p, _ in folhas])[escolha]
+    tamanho = deslocamento + posicao_sub
+    tem_sub2 = (rng.random(n_questoes) < prob_subtopico_2) & (tamanho > 1)
+    passo = rng.integers(1, np.maximum(tamanho, 2))
+    sub2_folha = escolha - posicao_sub + (posicao_sub + passo) % np.maximum(tamanho, 1)
+    sub2 = np.where(tem_sub2, np.array([s for _, _, s, _, _ in folhas], dtype=object)[sub2_folha], None)
+
+    # Cada questão ocupa uma posição distinta (Ano, Aplicação, Número): a validação
+    # rejeita questões repetidas. Numeração do caderno cinza a partir de 91; com mais
+    # questões do que cabem em 45 por prova, cada prova ganha números além do 135
+    anos = np.arange(ano_inicial, ano_final + 1)
+    provas = len(anos) * aplicacoes
+    por_prova = max(QUESTOES_POR_APLICACAO, -(-n_questoes // provas))
+    posicao = rng.choice(provas * por_prova, size=n_questoes, replace=False)
+    prova, numero = np.divmod(posicao, por_prova)
+    ano = anos[prova // aplicacoes]
+    numero = PRIMEIRA_QUESTAO + numero
+    aplicacao = None
+    if aplicacoes > 1:
+        nomes = APLICACOES[:aplicacoes] + [f"Aplicação {i}" for i in range(len(APLICACOES) + 1, aplicacoes + 1)]
+        aplicacao = np.array(nomes, dtype=object)[prova % aplicacoes]
+
+    tipo = np.where(rng.random(n_questoes) < PROPORCAO_CONTA.get(aba, 0.4), "Conta", "Conceitual")
+
+    df = pd.DataFrame({
+        "Ano": ano,
+        **({"Aplicação": aplicacao} if aplicacao is not None else {}),
+        "Número (Cinza)": numero,
+        "Frente": frente,
+        "Tópico": topico,
+        "Subtópico 1": sub1,
+        "Subtópico 2": sub2,
+        "Tipo": tipo,
+    })
+    ordem = ["Ano", "Aplicação", "Número (Cinza)"] if aplicacao is not None else ["Ano", "Número (Cinza)"]
+    return df.sort_values(ordem, kind="stable").reset_index(drop=True)
+
+
+def gerar(n_questoes, disciplinas=None, semente=0, **opcoes):
+    """
+    Questões de todas as disciplinas, divididas igualmente entre elas.
+    :param opcoes: Repassadas a gerar_aba (anos, aplicações, cardinalidades, assimetria)
+    :return: dict {aba: DataFrame}, no formato de read_excel(sheet_name=None)
+    """
+    disciplinas = list(disciplinas or VOCABULARIO)
+    rng = np.random.default_rng(semente)
+    partes = np.full(len(disciplinas), n_questoes // len(disciplinas))
+    partes[: n_questoes % len(disciplinas)] += 1
+    return {aba: gerar_aba(aba, int(n), rng, **opcoes) for aba, n in zip(disciplinas, partes)}
+
+
+def escrever_planilha(caminho, abas):
+    """Grava as abas num .xlsx (modo write_only do openpyxl, linha a linha)."""
+    from openpyxl import Workbook
+
+    livro = Workbook(write_only=True)
+    for aba, df in abas.items():
+        planilha = livro.create_sheet(aba)
+        planilha.append(list(df.columns))
+        for linha in df.astype(object).where(df.notna(), None).itertuples(index=False):
+            planilha.append([valor.item() if isinstance(valor, np.generic) else valor for valor in linha])
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    livro.save(caminho)
+
+
+def escrever_arrow(diretorio, abas):
+    """Grava uma tabela Arrow/Feather por aba, com os tipos usados pelo app (utils.tipar_colunas)."""
+    os.makedirs(diretorio, exist_ok=True)
+    for aba, df in abas.items():
+        tabela = pa.Table.from_pandas(tipar_colunas(df), preserve_index=False)
+        feather.write_feather(tabela, os.path.join(diretorio, f"{aba}.arrow"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questoes", type=int, required=True, help="Total de questões (divididas entre as disciplinas)")
+    parser.add_argument("--saida", required=True, help="Diretório de saída")
+    parser.add_argument("--formato", choices=["xlsx", "arrow", "ambos"], default="xlsx")
+    parser.add_argument("--disciplinas", nargs="+", choices=list(VOCABULARIO), help="Abas geradas (padrão: todas)")
+    parser.add_argument("--ano-inicial", type=int, default=1998)
+    parser.add_argument("--ano-final", type=int, default=2025)
+    parser.add_argument("--aplicacoes", type=int, default=1, help="Aplicações da prova por ano")
+    parser.add_argument("--frentes", type=int, help="Frentes por disciplina (padrão: as do vocabulário)")
+    parser.add_argument("--topicos", type=int, help="Tópicos por frente (padrão: os do vocabulário)")
+    parser.add_argument("--subtopicos", type=int, help="Subtópicos por tópico (padrão: os do vocabulário)")
+    parser.add_argument("--assimetria", type=float, default=1.1, help="Expoente de Zipf (0 = uniforme)")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    abas = gerar(
+        args.questoes,
+        disciplinas=args.disciplinas,
+        semente=args.semente,
+        ano_inicial=args.ano_inicial,
+        ano_final=args.ano_final,
+        aplicacoes=args.aplicacoes,
+        frentes=args.frentes,
+        topicos=args.topicos,
+        subtopicos=args.subtopicos,
+        assimetria=args.assimetria,
+    )
+    if args.formato in ("xlsx", "ambos"):
+        escrever_planilha(os.path.join(args.saida, "dados_enem_natureza.xlsx"), abas)
+    if args.formato in ("arrow", "ambos"):
+        escrever_arrow(args.saida, abas)
+    for aba, df in abas.items():
+        print(f"  {aba}: {len(df)} questões, {df['Tópico'].nunique()} tópicos, {df['Subtópico 1'].nunique()} subtópicos")
+
+
+if __name__ == "__main__":
+    main()
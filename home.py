@@ -1,5 +1,6 @@
 import streamlit as st
-from utils import menu_lateral # Importa a função nova
+from menu import menu_lateral # Importa a função nova
+from imagens import imagem
 
 st.set_page_config(
     page_title="Dashboard ENEM - Ciências da Natureza EPUFABC",
@@ -30,17 +31,17 @@ col1, col2, col3 = st.columns(3)
 
 # Botão Física
 with col1:
-    st.image("https://img.icons8.com/ios/100/FFFFFF/atom-editor.png", width=80) # Exemplo de ícone
+    st.image(imagem("icone_fisica"), width=80) # Ícones locais (assets/icones), sem acesso à internet
     st.page_link("pages/fisica.py", label="FÍSICA", icon="⚛️", use_container_width=True)
 
 # Botão Química
 with col2:
-    st.image("https://img.icons8.com/ios/100/FFFFFF/test-tube.png", width=80) 
+    st.image(imagem("icone_quimica"), width=80)
     st.page_link("pages/quimica.py", label="QUÍMICA", icon="🧪", use_container_width=True)
 
 # Botão Biologia
 with col3:
-    st.image("https://img.icons8.com/ios/100/FFFFFF/dna-helix.png", width=80)
+    st.image(imagem("icone_biologia"), width=80)
     st.page_link("pages/biologia.py", label="BIOLOGIA", icon="🧬", use_container_width=True)
 
 st.markdown("---")
@@ -0,0 +1,57 @@
+import streamlit as st
+import json
+import os
+
+# Imagens do app servidas como arquivos estáticos do próprio Streamlit.
+#
+# preparar_imagens.py gera, a partir das originais em assets/, versões já no tamanho
+# de exibição em static/img/ (nome com o hash do conteúdo) e o índice imagens.json.
+# Com server.enableStaticServing (.streamlit/config.toml), st.image recebe só a URL
+# /app/static/img/...: o servidor não lê nem reprocessa a imagem a cada rerun e o
+# navegador a baixa uma vez. Sem o índice (ou sem static serving), usa a original.
+
+DIRETORIO_RAIZ = os.path.dirname(os.path.abspath(__file__))
+DIRETORIO_IMAGENS = os.path.join(DIRETORIO_RAIZ, "static", "img")
+CAMINHO_INDICE_IMAGENS = os.path.join(DIRETORIO_IMAGENS, "imagens.json")
+URL_IMAGENS = "/app/static/img"
+
+# Nome -> (arquivo original, largura de exibição em px; None = vetorial, sem redimensionar)
+IMAGENS = {
+    "logo": ("assets/Logo EPUFABC - Branco (2).png", 150),
+    "icone_fisica": ("assets/icones/atomo.svg", None),
+    "icone_quimica": ("assets/icones/tubo_ensaio.svg", None),
+    "icone_biologia": ("assets/icones/dna.svg", None),
+}
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _indice_imagens(mtime_ns):
+    # mtime_ns só entra na chave: imagens preparadas de novo valem sem reiniciar o app
+    with open(CAMINHO_INDICE_IMAGENS, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@st.cache_resource(show_spinner=False)
+def _bytes_original(nome):
+    # Sem as imagens preparadas: a original é lida do disco uma vez por processo
+    with open(os.path.join(DIRETORIO_RAIZ, IMAGENS[nome][0]), "rb") as f:
+        return f.read()
+
+
+def imagem(nome):
+    """
+    Imagem para passar ao st.image: a URL estática da versão preparada ou, se ela não
+    existir, os bytes da original.
+    :param nome: Uma das chaves de IMAGENS
+    """
+    if st.get_option("server.enableStaticServing"):
+        try:
+            arquivo = _indice_imagens(os.stat(CAMINHO_INDICE_IMAGENS).st_mtime_ns).get(nome)
+        except (OSError, ValueError):
+            arquivo = None
+        if arquivo and os.path.exists(os.path.join(DIRETORIO_IMAGENS, arquivo)):
+            return f"{URL_IMAGENS}/{arquivo}"
+
+    conteudo = _bytes_original(nome)
+    # st.image reconhece SVG pelo texto
+    return conteudo.decode("utf-8") if IMAGENS[nome][0].endswith(".svg") else conteudo
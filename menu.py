@@ -0,0 +1,26 @@
+import streamlit as st
+
+from imagens import imagem
+
+# Barra lateral comum a todas as páginas. Fica fora do utils.py para que a home
+# (só links e imagens) não precise carregar pandas/pyarrow para desenhá-la.
+
+
+def menu_lateral():
+    # Título ou Logo na barra lateral
+    # Logo já redimensionado, servido como arquivo estático (ver imagens.py):
+    # a barra lateral é redesenhada a cada rerun sem reler nem recodificar o PNG
+    st.sidebar.image(imagem("logo"), width=150)
+    st.sidebar.title("Navegação")
+    
+    # Links para as páginas
+    # Nota: O caminho deve ser relativo à raiz onde você roda o comando streamlit run
+    
+    st.sidebar.page_link("home.py", label="Página Inicial", icon="🏠")
+    
+    st.sidebar.markdown("---") # Separador visual
+    st.sidebar.subheader("Disciplinas")
+    
+    st.sidebar.page_link("pages/fisica.py", label="Física", icon="⚛️")
+    st.sidebar.page_link("pages/quimica.py", label="Química", icon="🧪")
+    st.sidebar.page_link("pages/biologia.py", label="Biologia", icon="🧬")
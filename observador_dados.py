@@ -0,0 +1,58 @@
+import streamlit as st
+import logging
+import threading
+import time
+
+from utils import atualizar_dados, usar_observador
+from agregados import carregar_cubo, carregar_indice_anos, carregar_subtopicos, carregar_coocorrencias
+
+# Observador das planilhas em dados/: uma thread por processo que confere a cada
+# INTERVALO_SEGUNDOS se a planilha principal mudou (ou se entrou/saiu outro .xlsx),
+# recompila só as abas alteradas e troca o estado dos dados de uma vez.
+# As sessões abertas veem a nova versão no próximo rerun, sem limpar caches:
+# cubos, índices e figuras são chaveados pela versão de cada aba, então as abas
+# que não mudaram continuam com tudo em cache.
+
+INTERVALO_SEGUNDOS = 5
+
+logger = logging.getLogger(__name__)
+
+
+def _preparar_agregados(estado):
+    # Monta cubo, índice de anos, subtópicos e coocorrências das abas novas antes de alguma sessão pedir
+    for aba, versao in estado["versoes_abas"].items():
+        cubo = carregar_cubo(estado, aba, versao)
+        carregar_indice_anos(cubo, aba, versao)
+        carregar_subtopicos(cubo, aba, versao)
+        carregar_coocorrencias(cubo, aba, versao)
+
+
+def _observar(intervalo):
+    versao_atual = None
+    while True:
+        try:
+            estado = atualizar_dados()
+            if estado["versao"] != versao_atual:
+                if versao_atual is not None:
+                    logger.info("Dados atualizados para a versão %s", estado["versao"])
+                _preparar_agregados(estado)
+                versao_atual = estado["versao"]
+        except Exception:
+            # A thread não pode morrer: segue com a versão atual e tenta de novo
+            logger.exception("Falha ao atualizar os dados")
+        time.sleep(intervalo)
+
+
+@st.cache_resource
+def iniciar_observador(intervalo=INTERVALO_SEGUNDOS):
+    """
+    Inicia (uma vez por processo) a thread que mantém os dados em dia.
+    :param intervalo: Segundos entre duas conferências das planilhas
+    :return: A thread do observador
+    """
+    # Carrega a versão atual antes de desligar a conferência por leitura
+    atualizar_dados()
+    usar_observador()
+    thread = threading.Thread(target=_observar, args=(intervalo,), name="observador-dados", daemon=True)
+    thread.start()
+    return thread
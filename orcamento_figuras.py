@@ -0,0 +1,76 @@
+import pandas as pd
+import numpy as np
+
+# Orçamento de payload dos gráficos com muitas categorias (heatmap Tópico × Ano e
+# barras de subtópicos da página de disciplina).
+#
+# O JSON de cada figura vai inteiro para o navegador a cada rerun, e com todos os anos
+# e subtópicos carregados ele cresce com o número de categorias. Por isso essas figuras
+# mostram, por padrão, só as LIMITE_CATEGORIAS categorias com mais questões e somam o
+# resto numa categoria "Outros"; a figura completa só é montada (e enviada) quando o
+# usuário pede para ver a cauda.
+#
+# Os números vão como arrays numpy no menor tipo inteiro que os comporta: o Plotly os
+# serializa em binário ({"dtype": "u1", "bdata": ...}) em vez de uma lista em texto.
+
+LIMITE_CATEGORIAS = 15
+ROTULO_OUTROS = "Outros"
+
+
+def rotulo_outros(cauda):
+    """Rótulo da categoria que junta as `cauda` categorias que ficaram de fora."""
+    return f"{ROTULO_OUTROS} ({cauda})"
+
+
+def array_compacto(valores):
+    """
+    Contagens (inteiros não negativos) no menor tipo sem sinal que as comporta.
+    :param valores: Array, lista ou Series de inteiros
+    """
+    valores = np.asarray(valores)
+    maximo = int(valores.max()) if valores.size else 0
+    for tipo in (np.uint8, np.uint16, np.uint32):
+        if maximo <= np.iinfo(tipo).max:
+            return valores.astype(tipo)
+    return valores.astype(np.int64)
+
+
+def limitar_categorias(contagem, coluna, limite=LIMITE_CATEGORIAS):
+    """
+    As `limite` categorias com mais questões, do maior para o menor, e uma linha
+    rotulo_outros() no fim com a soma das demais.
+    :param contagem: DataFrame [coluna, "Quantidade"], uma linha por categoria
+    :param limite: Categorias mantidas (None = todas, sem "Outros")
+    :return: (DataFrame [coluna, "Quantidade"], número de categorias somadas em "Outros")
+    """
+    contagem = contagem.sort_values("Quantidade", ascending=False, kind="stable").reset_index(drop=True)
+    if limite is None or len(contagem) <= limite:
+        return contagem, 0
+
+    cauda = len(contagem) - limite
+    outros = pd.DataFrame({coluna: [rotulo_outros(cauda)], "Quantidade": [contagem["Quantidade"].iloc[limite:].sum()]})
+    maiores = contagem.iloc[:limite].astype({coluna: object})
+    return pd.concat([maiores, outros], ignore_index=True), cauda
+
+
+def limitar_linhas(tabela, limite=LIMITE_CATEGORIAS):
+    """
+    Matriz (ex: Tópico × Ano) só com as `limite` linhas de maior total, na ordem
+    original, e uma linha rotulo_outros() no fim com a soma das demais.
+    :param tabela: DataFrame numérico, uma linha por categoria
+    :param limite: Linhas mantidas (None = todas, sem "Outros")
+    :return: (DataFrame, número de linhas somadas em "Outros")
+    """
+    if limite is None or len(tabela) <= limite:
+        return tabela, 0
+
+    totais = tabela.sum(axis=1).to_numpy()
+    # Ordem estável: no empate, fica a linha que vem antes
+    mantidas = np.zeros(len(tabela), dtype=bool)
+    mantidas[np.argsort(-totais, kind="stable")[:limite]] = True
+    cauda = len(tabela) - limite
+
+    maiores = tabela[mantidas]
+    maiores.index = maiores.index.astype(object)
+    outros = tabela[~mantidas].sum().to_frame(rotulo_outros(cauda)).T
+    return pd.concat([maiores, outros]), cauda
@@ -1,9 +1,5 @@
 # %%
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import altair as alt
 
 import sys
 import os
@@ -14,7 +10,9 @@ diretorio_raiz = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.append(diretorio_raiz)
 
 # Agora podemos importar a função
-from utils import carregar_dados, menu_lateral # Importa também o menu_lateral
+from menu import menu_lateral # Importa também o menu_lateral
+from disciplinas import QUIMICA
+from painel_disciplina import renderizar_painel
 
 # --- CÓDIGO DA PÁGINA ---
 st.set_page_config(
@@ -25,8 +23,5 @@ st.set_page_config(
 
 menu_lateral() # <--- Adicione aqui também
 
-st.title("🧪 Química ENEM")
-
-#alt.theme.enable("dark")
-alt.theme.enable("ggplot2")# estilo ggplot2
-
+# Todo o painel vem da especificação da disciplina (disciplinas.py)
+renderizar_painel(QUIMICA)
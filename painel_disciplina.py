@@ -0,0 +1,954 @@
+import streamlit as st
+import numpy as np
+
+from utils import estado_dados
+from agregados import (
+    carregar_cubo, carregar_indice_anos, carregar_subtopicos, carregar_coocorrencias, fatiar_anos, filtrar_cubo,
+    contar, contar_total, contar_por_categoria, contar_subtopicos, contar_coocorrencias, matriz_coocorrencias,
+)
+from consultas import grade_anos
+from busca import buscar, carregar_indice_busca, refinar, termos
+from base_questoes import aplicacoes_da_aba, dataframe
+from cache_figuras import figura_plotly, spec_altair
+from orcamento_figuras import LIMITE_CATEGORIAS, array_compacto, limitar_categorias, limitar_linhas
+from tendencias import NIVEIS_TENDENCIA, JANELA_MEDIA_MOVEL, ranking_tendencias
+from observador_dados import iniciar_observador
+from perfil import medir, medido, painel_perfil
+
+# Motor genérico das páginas de disciplina.
+# Cada página só define seu st.set_page_config e chama renderizar_painel(espec),
+# com a especificação da disciplina definida em disciplinas.py.
+#
+# As seções recebem um contexto (dict) com:
+#   espec, estado, cubo, indice_anos, subtopicos, coocorrencias, cubo_filtrado, ano_inicio,
+#   ano_fim, aplicacoes, filtros_ano, versao
+# (versao é a versão da aba da disciplina: muda só quando aquela aba muda;
+#  subtopicos é a tabela longa de agregados.carregar_subtopicos e coocorrencias os pares
+#  de conteúdos de agregados.carregar_coocorrencias; cubo, índice, subtópicos e
+#  coocorrências já vêm só das aplicações escolhidas, que também entram em filtros_ano)
+#
+# As grades Ano × Frente e Ano × Tópico (com zero nos anos sem questões) vêm do motor
+# de consultas (consultas.grade_anos), direto das questões do estado.
+#
+# Cada seção é medida por perfil.py (tempo, memória, cache); o decorador @medido
+# fica abaixo do @st.fragment para medir também os reruns só do fragmento.
+#
+# Plotly Express, graph_objects e Altair são importados dentro das funções que montam
+# as figuras: com as figuras em cache (ou nos snapshots), a página nem os carrega.
+#
+# Os heatmaps (Tópico × Ano e conteúdos cobrados juntos) e as barras de subtópicos seguem o orçamento de payload de
+# orcamento_figuras.py: as maiores categorias mais "Outros", e a figura completa só
+# quando o usuário liga o "Mostrar todos" do gráfico.
+
+
+def mostrar_todos(rotulo, categorias, chave):
+    """
+    Limite de categorias da figura: LIMITE_CATEGORIAS, ou None (todas) se couberem
+    no limite ou se o usuário pedir para ver todas.
+    :param rotulo: Nome das categorias no texto do botão (ex: "tópicos")
+    :param categorias: Número de categorias da figura completa
+    :param chave: Chave do widget
+    """
+    if categorias <= LIMITE_CATEGORIAS:
+        return None
+    todos = st.toggle(f"Mostrar todos os {categorias} {rotulo}", key=chave)
+    return None if todos else LIMITE_CATEGORIAS
+
+
+# ==============================================================================
+# 2. SEÇÃO DE KPIS (RESUMO EXECUTIVO - PORCENTAGENS + TOTAL)
+# ==============================================================================
+
+@medido("kpis")
+def secao_kpis(ctx):
+    espec, indice_anos = ctx["espec"], ctx["indice_anos"]
+    ano_inicio, ano_fim = ctx["ano_inicio"], ctx["ano_fim"]
+
+    # 1. Totalizador
+    total_questoes = contar_total(indice_anos, ano_inicio, ano_fim)
+
+    # Contagem por Frente (agrupada conforme a especificação da disciplina)
+    contagem_frentes = contar_por_categoria(indice_anos, "Frente", ano_inicio, ano_fim)
+    qtd_por_frente = dict(zip(contagem_frentes["Frente"], contagem_frentes["Quantidade"]))
+
+    # Sem agrupamento definido: usa as 3 frentes com mais questões
+    kpis = espec["kpis"]
+    if kpis is None:
+        kpis = [(frente, [frente]) for frente in contagem_frentes["Frente"][:3]]
+
+    porcentagens = []
+    for rotulo, frentes in kpis:
+        qtd = sum(qtd_por_frente.get(frente, 0) for frente in frentes)
+        porcentagens.append((qtd / total_questoes) * 100 if total_questoes > 0 else 0.0)
+
+    # 2. Visualização (Container com uma coluna por KPI + total)
+    with st.container(border=True):
+        colunas = st.columns(len(kpis) + 1)
+
+        for coluna, (rotulo, _), pct in zip(colunas, kpis, porcentagens):
+            coluna.metric(rotulo, f"{pct:.1f}%")
+
+        colunas[-1].metric("Total de Questões", f"{total_questoes}")
+
+    st.markdown("---")
+
+
+@medido("visao_geral")
+def secao_visao_geral(ctx):
+    espec, indice_anos = ctx["espec"], ctx["indice_anos"]
+    ano_inicio, ano_fim = ctx["ano_inicio"], ctx["ano_fim"]
+    filtros_ano, versao = ctx["filtros_ano"], ctx["versao"]
+    aba = espec["aba"]
+
+    contagem_frentes = contar_por_categoria(indice_anos, "Frente", ano_inicio, ano_fim)
+
+    st.markdown("## 🌎 Visão Geral")
+
+    with st.container(border=True):
+        colA, colB = st.columns([2, 1])
+
+        # --- GRÁFICO DE BARRAS (ESQUERDA) ---
+        with colA:
+            def construir_frentes():
+                import plotly.express as px
+
+                fig1 = px.bar(
+                    contagem_frentes,
+                    x="Frente",
+                    y="Quantidade",
+                    text="Quantidade",
+                    title="Volume de Questões por Frente",
+                    color="Quantidade",              # Gradiente baseado no valor
+                    color_continuous_scale="Greens"  # Paleta Verde
+                )
+                # Limpeza visual (Clean Academic Style)
+                fig1.update_layout(
+                    xaxis_title=None, # Remove título redundante
+                    yaxis_title=None,
+                    coloraxis_showscale=False, # Remove barra de cores lateral
+                    paper_bgcolor="rgba(0,0,0,0)", # Fundo transparente para integrar com o container
+                    plot_bgcolor="rgba(0,0,0,0)",
+                )
+                fig1.update_traces(textposition="outside")
+                return fig1
+
+            fig1 = figura_plotly(f"{aba}/frentes", filtros_ano, versao, construir_frentes)
+            st.plotly_chart(fig1, width='stretch')
+
+        # --- GRÁFICO DE PIZZA (DIREITA) ---
+        with colB:
+            def construir_pizza_frentes():
+                import plotly.express as px
+
+                fig_pizza = px.pie(
+                    contagem_frentes,
+                    names="Frente",
+                    values="Quantidade",
+                    title="Proporção",
+                    hole=0.4,
+                    # Usando tons de verde discretos (reverse para começar escuro)
+                    color_discrete_sequence=espec["cores_frentes"]
+                )
+                fig_pizza.update_layout(
+                    paper_bgcolor="rgba(0,0,0,0)", # Fundo transparente
+                    showlegend=False, # Opcional: remover legenda se houver pouco espaço
+                    #margin=dict(t=40, b=0, l=0, r=0)
+                )
+                fig_pizza.update_traces(textinfo="percent+label")
+                return fig_pizza
+
+            fig_pizza = figura_plotly(f"{aba}/pizza_frentes", filtros_ano, versao, construir_pizza_frentes)
+            st.plotly_chart(fig_pizza, width='stretch')
+
+    # ===== Linha 2 ===== #
+
+    # ===== GRÁFICO 2: Proporção de questões Conceituais vs Conta =====
+
+    #with st.container(border=True):
+
+    col1, col2 = st.columns(2)
+
+    def construir_tipos():
+        import plotly.express as px
+
+        contagem_tipos = contar_por_categoria(indice_anos, "Tipo", ano_inicio, ano_fim)
+
+        fig2 = px.pie(
+            contagem_tipos,
+            names="Tipo",
+            values="Quantidade",
+            title="Distribuição de tipos de questão (Conceitual vs Conta)",
+            hole=0.4,
+            # --- MUDANÇA AQUI ---
+            color="Tipo",                     # Diz qual coluna contém "Conta" ou "Conceitual"
+            color_discrete_map=espec["cores_tipo"]  # Aplica o dicionário fixo
+        )
+        return fig2
+
+    fig2 = figura_plotly(f"{aba}/tipos", filtros_ano, versao, construir_tipos)
+
+    with col1:
+        with st.container(border=True, height=500):
+            st.plotly_chart(fig2, width='stretch')
+
+
+    # ===== GRÁFICO 3: Tópicos mais cobrados (Plotly, com gradiente) =====
+
+    def construir_topicos():
+        import plotly.graph_objects as go
+
+        # preparar os dados
+        contagem_topicos = contar_por_categoria(indice_anos, "Tópico", ano_inicio, ano_fim)
+
+        # ordenar do maior para o menor (queremos os maiores no topo)
+        contagem_topicos = contagem_topicos.sort_values("Quantidade", ascending=False).reset_index(drop=True)
+
+        # normalizar para escala visual das barras (0..1)
+
+        contagem_topicos["Porcentagem"] = contagem_topicos["Quantidade"] / contagem_topicos["Quantidade"].max()
+
+        # construir a figura
+        fig_topicos = go.Figure()
+        fig_topicos.add_trace(
+            go.Bar(
+                x=contagem_topicos["Porcentagem"],     # comprimento da barra (normalizado)
+                y=contagem_topicos["Tópico"],
+                orientation="h",
+                marker=dict(
+                    color=contagem_topicos["Quantidade"],  # cor baseada na quantidade -> gradiente
+                    colorscale="Greens",
+                    showscale=False
+                ),
+                text=contagem_topicos["Quantidade"],    # valor numérico mostrado
+                textposition="outside",
+                hovertemplate="<b>%{y}</b><br>Questões: %{text}<extra></extra>",
+            )
+        )
+
+        # layout e estilo
+
+        fig_topicos.update_layout(
+            title="Tópicos mais cobrados",
+            xaxis=dict(visible=False),
+            yaxis=dict(autorange="reversed", title=""),  # autorange reversed para manter maiores no topo
+            height=500
+            #margin=dict(l=140, r=40, t=60, b=20)
+
+        )
+        return fig_topicos
+
+    fig_topicos = figura_plotly(f"{aba}/topicos", filtros_ano, versao, construir_topicos)
+
+
+    # desenhar no col3
+
+    with col2:
+        with st.container(border=True, height=500):
+            st.plotly_chart(fig_topicos, width='stretch')
+
+    #col2.plotly_chart(fig_topicos, width='stretch')
+
+
+# ==============================================================================
+# SEÇÕES COM RERUN PARCIAL (st.fragment)
+# Mexer num widget dentro de uma seção reexecuta só aquela seção.
+# Os filtros globais de Ano (barra lateral) continuam reexecutando a página toda.
+# ==============================================================================
+
+@st.fragment
+@medido("evolucao")
+def secao_evolucao(ctx):
+    espec, cubo = ctx["espec"], ctx["cubo"]
+    filtros_ano, versao = ctx["filtros_ano"], ctx["versao"]
+    aba = espec["aba"]
+
+    st.subheader("📈 Evolução da Cobrança por Frente ao Longo dos Anos")
+
+    # Frentes do cubo (rótulos já canônicos: ver validacao.py)
+    frentes_evolucao = sorted(cubo["Frente"].dropna().unique())
+
+    frentes_escolhidas_evolucao = st.multiselect(
+        "Selecione as frentes para visualizar a evolução:",
+        frentes_evolucao,
+        default=frentes_evolucao,
+        key=f"{aba}_frentes_evolucao"
+    )
+
+    def construir_evolucao():
+        import altair as alt
+
+        alt.theme.enable("ggplot2")  # estilo ggplot2 (vale para o to_dict do spec_altair)
+
+        # ==============================
+        # Contar Ano × Frente em todos os anos do intervalo, preenchendo com zero as
+        # combinações ausentes; só aqui (não na visão geral) filtra pelas frentes
+        # ==============================
+        evolucao_frentes = grade_anos(
+            ctx["estado"],
+            aba,
+            "Frente",
+            filtros_ano["ano_inicio"],
+            filtros_ano["ano_fim"],
+            aplicacoes=ctx["aplicacoes"],
+            filtros={"Frente": frentes_escolhidas_evolucao} if frentes_escolhidas_evolucao else None,
+        )
+
+        # ==============================
+        # 4. Gráfico de evolução (Altair)
+        # ==============================
+
+        # Sua paleta personalizada
+        #cores_personalizadas = ['#0c3d0e', '#ed3d00', '#f5ac19']
+
+        grafico_evolucao = (
+            alt.Chart(evolucao_frentes)
+            .mark_line(point=True)
+            .encode(
+                x=alt.X("Ano:O", sort="ascending", title="Ano"),
+                y=alt.Y("Quantidade:Q", title="Número de Questões", scale=alt.Scale(domainMin=0)),
+            
+                # --- MUDANÇA AQUI ---
+                color=alt.Color("Frente:N", scale=alt.Scale(scheme='tableau10')),
+                # --------------------
+
+                tooltip=[
+                    alt.Tooltip("Ano:O"),
+                    alt.Tooltip("Frente:N"),
+                    alt.Tooltip("Quantidade:Q", title="Questões")
+                ]
+            )
+            .properties(
+                width=600,
+                height=400
+            )
+            .interactive()
+        )
+        return grafico_evolucao
+
+    spec_evolucao = spec_altair(
+        f"{aba}/evolucao",
+        {**filtros_ano, "frentes": frentes_escolhidas_evolucao},
+        versao,
+        construir_evolucao,
+    )
+
+    # Nota: O parâmetro correto moderno no Streamlit é use_container_width=True
+    st.vega_lite_chart(spec_evolucao, width='stretch')
+
+
+@st.fragment
+@medido("tendencias")
+def secao_tendencias(ctx):
+    espec, cubo_filtrado, indice_anos = ctx["espec"], ctx["cubo_filtrado"], ctx["indice_anos"]
+    aba = espec["aba"]
+
+    st.subheader("📊 Ranking de Tendências")
+    st.caption(
+        f"Tendência: questões a mais (ou a menos) por ano. Média móvel: últimas {JANELA_MEDIA_MOVEL} provas. "
+        "Esperado: estimativa de questões na próxima prova (média móvel projetada pela tendência)."
+    )
+
+    nivel = st.radio(
+        "Agrupar por:",
+        list(NIVEIS_TENDENCIA),
+        horizontal=True,
+        key=f"{aba}_nivel_tendencias"
+    )
+
+    # Anos do período selecionado que têm prova cadastrada
+    anos = indice_anos["anos"]
+    anos = anos[(anos >= ctx["ano_inicio"]) & (anos <= ctx["ano_fim"])]
+
+    ranking = ranking_tendencias(cubo_filtrado, nivel, anos)
+
+    if ranking.empty:
+        st.warning("Não há dados para o período selecionado.")
+        return
+
+    st.dataframe(
+        ranking,
+        width='stretch',
+        hide_index=True,
+        column_config={
+            "Por ano": st.column_config.BarChartColumn(
+                f"Por ano ({anos[0]}–{anos[-1]})", y_min=0
+            ),
+            "Tendência": st.column_config.NumberColumn(format="%+.2f"),
+            "Média móvel": st.column_config.NumberColumn(format="%.2f"),
+            "Probabilidade": st.column_config.ProgressColumn(
+                "Chance de cair", min_value=0, max_value=1, format="percent"
+            ),
+            "Esperado": st.column_config.NumberColumn(format="%.1f"),
+        },
+    )
+
+
+# Resultados da busca mostrados na tabela (os mais recentes primeiro)
+LIMITE_RESULTADOS_BUSCA = 200
+COLUNAS_RESULTADOS_BUSCA = ["Ano", "Aplicação", "Número (Cinza)", "Frente", "Tópico", "Subtópico 1", "Subtópico 2", "Tipo"]
+
+
+@st.fragment
+@medido("busca")
+def secao_busca(ctx):
+    espec, estado = ctx["espec"], ctx["estado"]
+    ano_inicio, ano_fim = ctx["ano_inicio"], ctx["ano_fim"]
+    aba = espec["aba"]
+    questoes = estado["questoes"]
+
+    st.markdown("## 🔍 Buscar questões")
+
+    texto = st.text_input(
+        "Busque por tópico ou conteúdo (acentos e maiúsculas não importam; pode digitar só o começo das palavras):",
+        placeholder="ex: lei de ohm, eletrostát, calor específico",
+        key=f"{aba}_busca",
+    )
+    if not termos(texto):
+        return
+
+    # Índice invertido montado uma vez por versão da aba (busca.py); a busca não lê textos
+    indice = carregar_indice_busca(estado, aba, ctx["versao"])
+    resultado = buscar(indice, questoes, aba, texto, ano_inicio, ano_fim, ctx["aplicacoes"])
+    facetas = resultado["facetas"]
+
+    if not len(resultado["linhas"]):
+        st.info(f"Nenhuma questão encontrada para “{texto}” entre {ano_inicio} e {ano_fim}.")
+        return
+
+    # Facetas: quantas questões do resultado há em cada Frente e Tipo; escolher refina a lista.
+    # Uma busca nova começa sem refinamento
+    busca_atual = " ".join(termos(texto))
+    nova_busca = st.session_state.get(f"{aba}_busca_termos") != busca_atual
+    st.session_state[f"{aba}_busca_termos"] = busca_atual
+
+    col_frente, col_tipo = st.columns(2)
+    escolhas = {}
+    for coluna, col in (("Frente", col_frente), ("Tipo", col_tipo)):
+        contagem = dict(zip(facetas[coluna][coluna], facetas[coluna]["Quantidade"].tolist()))
+        chave = f"{aba}_busca_{coluna}"
+        # Só valores que ainda existem no resultado (o período também muda as opções)
+        st.session_state[chave] = [] if nova_busca else [
+            valor for valor in st.session_state.get(chave, []) if valor in contagem
+        ]
+        escolhas[coluna] = col.multiselect(
+            coluna,
+            list(contagem),
+            format_func=lambda valor, contagem=contagem: f"{valor} ({contagem[valor]})",
+            placeholder="Todas",
+            key=chave,
+        )
+    linhas = refinar(questoes, resultado["linhas"], escolhas)
+
+    # Ano: total e distribuição no período, já com o refinamento
+    anos = questoes["numeros"]["Ano"][linhas].astype(np.int64)
+    st.dataframe(
+        [{
+            "Questões": len(linhas),
+            "Por ano": np.bincount(anos - ano_inicio, minlength=ano_fim - ano_inicio + 1).tolist(),
+        }],
+        hide_index=True,
+        column_config={
+            "Por ano": st.column_config.BarChartColumn(f"Por ano ({ano_inicio}–{ano_fim})", y_min=0),
+        },
+    )
+
+    mostradas = linhas[::-1][:LIMITE_RESULTADOS_BUSCA]
+    if len(linhas) > len(mostradas):
+        st.caption(f"Mostrando as {len(mostradas)} questões mais recentes de {len(linhas)}.")
+    resultados = dataframe(questoes, linhas=mostradas)
+    st.dataframe(resultados[[coluna for coluna in COLUNAS_RESULTADOS_BUSCA if coluna in resultados.columns]], hide_index=True)
+
+
+@st.fragment
+@medido("tabela_subtopicos")
+def tabela_subtopicos(espec, cubo_detalhado, subtopicos, frente_escolhida, filtros_ano):
+    aba = espec["aba"]
+
+    # ====================== TABELA DE SUBTÓPICOS (COM FILTRO DE TÓPICO) ======================
+
+    # 1) Selecionar Tópico para filtrar a tabela
+    topicos_disponiveis = ["Todos os tópicos"] + sorted(cubo_detalhado["Tópico"].dropna().unique())
+
+    topico_filtro = st.selectbox(
+        "Filtrar tabela por Tópico:",
+        topicos_disponiveis,
+        key=f"{aba}_topico_tabela"
+    )
+
+    # 2) Subtópico 1 e 2 juntos, agrupados por Subtópico + Tópico, direto do trecho
+    #    da Frente (ou do Tópico) na tabela longa
+    tabela_final = contar_subtopicos(
+        subtopicos,
+        frente_escolhida,
+        filtros_ano["ano_inicio"],
+        filtros_ano["ano_fim"],
+        topico=None if topico_filtro == "Todos os tópicos" else topico_filtro,
+        por_topico=True,
+    )
+
+    # 6) Mostrar tabela
+    st.dataframe(
+        tabela_final,
+        width='stretch',
+        hide_index=True
+    )
+
+
+@st.fragment
+@medido("analise_subtopicos")
+def analise_especifica(espec, cubo_detalhado, subtopicos, frente_escolhida, filtros_ano, versao):
+    aba = espec["aba"]
+
+    # ==============================================================================
+    # NOVA SEÇÃO: ANÁLISE PROFUNDA DE CONTEÚDO (SUBTÓPICOS)
+    # ==============================================================================
+
+    st.markdown("---") # Separador visual
+    st.subheader(f"🔬 Análise Específica: Conteúdos de {frente_escolhida}")
+
+    # 1. Filtro de Tópico (Específico para esta seção)
+    # Pegamos os tópicos únicos do dataframe que já foi filtrado por Frente e Ano
+    lista_topicos_filtrada = sorted(cubo_detalhado["Tópico"].dropna().unique())
+
+    if lista_topicos_filtrada:
+        topico_selecionado = st.selectbox(
+            "Selecione um Tópico para ver os conteúdos mais cobrados:",
+            lista_topicos_filtrada,
+            key=f"{aba}_topico_analise"
+        )
+
+        # Recorte isolado do cubo para não afetar o resto do dashboard
+        cubo_topico = cubo_detalhado[cubo_detalhado["Tópico"] == topico_selecionado]
+
+        # --- PREPARAÇÃO DOS DADOS: SUBTÓPICOS ---
+        # Subtópico 1 e 2 juntos: trecho (Frente, Tópico) da tabela longa
+        contagem_subs = contar_subtopicos(
+            subtopicos, frente_escolhida, filtros_ano["ano_inicio"], filtros_ano["ano_fim"], topico=topico_selecionado
+        )
+        contagem_subs.columns = ["Subtópico", "Quantidade"]
+
+        # --- PREPARAÇÃO DOS DADOS: TIPO (CONTA vs CONCEITUAL) ---
+        contagem_tipo_topico = contar(cubo_topico, "Tipo")
+
+        # --- VISUALIZAÇÃO ---
+        col_sub1, col_sub2 = st.columns([2, 1]) # Coluna da esquerda maior para as barras
+
+        # Gráfico de Barras (Conteúdos)
+        with col_sub1:
+            grafico_subs = st.container(border=True, height=500)
+            limite_subs = mostrar_todos("conteúdos", len(contagem_subs), f"{aba}_subtopicos_todos")
+
+            # Maiores conteúdos + "Outros" (ou todos, se pedido)
+            barras_subs, _ = limitar_categorias(contagem_subs, "Subtópico", limite_subs)
+            barras_subs["Quantidade"] = array_compacto(barras_subs["Quantidade"])
+
+            # Ascendente para barra horizontal ficar certa (maior no topo, "Outros" embaixo)
+            barras_subs = barras_subs.iloc[::-1]
+
+            # Altura dinâmica: Se tiver muitos subtópicos, aumenta o gráfico
+            altura_grafico = max(400, len(barras_subs) * 40)
+            
+            def construir_subtopicos():
+                import plotly.express as px
+
+                fig_subs = px.bar(
+                    barras_subs,
+                    x="Quantidade",
+                    y="Subtópico",
+                    orientation='h', # Horizontal facilita a leitura de nomes longos de subtópicos
+                    title=f"Conteúdos mais cobrados em {topico_selecionado}",
+                    text="Quantidade",
+                    color="Quantidade",
+                    color_continuous_scale="Greens"
+                )
+            
+                fig_subs.update_layout(
+                    height=altura_grafico,
+                    xaxis_title=None,
+                    yaxis_title=None,
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    coloraxis_showscale=False
+                )
+                fig_subs.update_traces(textposition="outside")
+                return fig_subs
+
+            fig_subs = figura_plotly(
+                f"{aba}/subtopicos",
+                {**filtros_ano, "frente": frente_escolhida, "topico": topico_selecionado, "categorias": limite_subs},
+                versao,
+                construir_subtopicos,
+            )
+
+            with grafico_subs:
+                st.plotly_chart(fig_subs, width='content')
+
+        # Gráfico de Pizza (Tipo)
+        with col_sub2:
+            def construir_tipo_topico():
+                import plotly.express as px
+
+                fig_tipo_topico = px.pie(
+                    contagem_tipo_topico,
+                    names="Tipo",
+                    values="Quantidade",
+                    title=f"Perfil das questões ({topico_selecionado})",
+                    hole=0.4,
+                    # Mantendo a paleta personalizada que você gostou
+                    # --- MUDANÇA AQUI ---
+                    color="Tipo",                     # Diz qual coluna contém "Conta" ou "Conceitual"
+                    color_discrete_map=espec["cores_tipo"]  # Aplica o dicionário fixo
+                )
+            
+                fig_tipo_topico.update_layout(
+                    plot_bgcolor="rgba(0,0,0,0)",
+                    paper_bgcolor="rgba(0,0,0,0)",
+                    legend=dict(orientation="h", y=-0.1) # Legenda embaixo para economizar espaço lateral
+                )
+                return fig_tipo_topico
+
+            fig_tipo_topico = figura_plotly(
+                f"{aba}/tipo_topico",
+                {**filtros_ano, "frente": frente_escolhida, "topico": topico_selecionado},
+                versao,
+                construir_tipo_topico,
+            )
+
+            with st.container(border=True, height=500):
+                st.plotly_chart(fig_tipo_topico, width='content')
+
+    else:
+        st.warning("Não há dados de tópicos para o filtro selecionado.")
+
+
+
+
+@st.fragment
+@medido("detalhe")
+def secao_detalhe(ctx):
+    espec, cubo_filtrado, subtopicos = ctx["espec"], ctx["cubo_filtrado"], ctx["subtopicos"]
+    filtros_ano, versao = ctx["filtros_ano"], ctx["versao"]
+    aba = espec["aba"]
+
+    st.markdown("## 🔎 Análise detalhada por Frente")
+
+    # Filtro independente, respeitando o filtro de Ano
+    frentes_detalhe = sorted(cubo_filtrado["Frente"].dropna().unique())
+
+    frente_escolhida = st.selectbox(
+        "Selecione uma Frente para análise detalhada:",
+        frentes_detalhe,
+        key=f"{aba}_frente_detalhe"
+    )
+
+    # Filtrar pelo conjunto já filtrado por Ano + Frente
+    cubo_detalhado = filtrar_cubo(cubo_filtrado, frente_escolhida)
+
+    # Criar três colunas
+    colA, colB = st.columns(2)
+
+    # ====================== GRÁFICO 1: Tópicos ======================
+    def construir_topicos_frente():
+        import plotly.express as px
+
+        contagem_topicos = contar(cubo_detalhado, "Tópico")
+
+        fig3 = px.bar(
+            contagem_topicos,
+            x="Tópico",
+            y="Quantidade",
+            title=f"Quantidade de questões por tópico — Frente: {frente_escolhida}",
+            text="Quantidade",
+            color="Quantidade",
+            color_continuous_scale="Greens"
+        )
+
+        fig3.update_layout(xaxis_title="Tópico", yaxis_title="Quantidade")
+        fig3.update_traces(textposition="outside")
+        return fig3
+
+    fig3 = figura_plotly(f"{aba}/topicos_frente", {**filtros_ano, "frente": frente_escolhida}, versao, construir_topicos_frente)
+
+    with colA:
+        with st.container(border=True):
+            st.plotly_chart(fig3, width='content')
+
+
+    # ====================== TABELA DE SUBTÓPICOS (COM FILTRO DE TÓPICO) ======================
+    with colB:
+        tabela_subtopicos(espec, cubo_detalhado, subtopicos, frente_escolhida, filtros_ano)
+
+    #======================= SEGUNDA PARTE =======================================
+
+    colC, colD = st.columns(2) 
+
+
+    # ====================== GRÁFICO 3: Conceitual vs Conta ======================
+    def construir_tipos_frente():
+        import plotly.express as px
+
+        contagem_tipos = contar(cubo_detalhado, "Tipo")
+
+        fig5 = px.pie(
+            contagem_tipos,
+            names="Tipo",
+            values="Quantidade",
+            title=f"Distribuição de tipos — {frente_escolhida}",
+            hole=0.4,
+            # --- MUDANÇA AQUI ---
+            color="Tipo",                     # Diz qual coluna contém "Conta" ou "Conceitual"
+            color_discrete_map=espec["cores_tipo"]  # Aplica o dicionário fixo
+        )
+        return fig5
+
+    fig5 = figura_plotly(f"{aba}/tipos_frente", {**filtros_ano, "frente": frente_escolhida}, versao, construir_tipos_frente)
+
+    with colC:
+        with st.container(border=True, height=450):
+            st.plotly_chart(fig5, width='content')
+
+
+    #----------------------------------------------------------------------------
+    #----------------------------------------------------------------------------
+
+
+    # ====================== GRÁFICO: Heatmap Tópico × Ano ======================
+
+    with colD:
+        grafico_heat = st.container(border=True, height=450)
+        limite_heat = mostrar_todos("tópicos", cubo_detalhado["Tópico"].nunique(), f"{aba}_heatmap_todos")
+
+    def construir_heatmap():
+        import plotly.graph_objects as go
+
+        # Grade (Ano, Tópico) da Frente, nos anos do intervalo que têm questões dela
+        contagem = grade_anos(
+            ctx["estado"],
+            aba,
+            "Tópico",
+            filtros_ano["ano_inicio"],
+            filtros_ano["ano_fim"],
+            todos_os_anos=False,
+            aplicacoes=ctx["aplicacoes"],
+            filtros={"Frente": frente_escolhida},
+        )
+
+        # Pivot para formato matricial
+        tabela_heatmap = contagem.pivot_table(
+            index="Tópico",
+            columns="Ano",
+            values="Quantidade",
+            fill_value=0,
+            observed=True
+        )
+
+        # Ordena anos (colunas)
+        tabela_heatmap = tabela_heatmap.sort_index(axis=1)
+
+        # Tópicos de maior total + "Outros" (ou todos, se pedido)
+        tabela_heatmap, _ = limitar_linhas(tabela_heatmap, limite_heat)
+
+        # Cria o Heatmap (z e anos em arrays de inteiros compactos)
+        fig_heat = go.Figure(
+            data=go.Heatmap(
+                z=array_compacto(tabela_heatmap.to_numpy()),
+                x=array_compacto(tabela_heatmap.columns),
+                y=list(tabela_heatmap.index),
+                colorscale="Greens",
+                colorbar=dict(title="Qtd.")
+            )
+        )
+
+        fig_heat.update_layout(
+            title=f"Mapa de Calor — Questões por Tópico e Ano ({frente_escolhida})",
+            xaxis_title="Ano",
+            yaxis_title="Tópico",
+            #height=500
+        )
+        return fig_heat
+
+    with medir("heatmap"):
+        fig_heat = figura_plotly(
+            f"{aba}/heatmap", {**filtros_ano, "frente": frente_escolhida, "categorias": limite_heat}, versao, construir_heatmap
+        )
+
+        with grafico_heat:
+            st.plotly_chart(fig_heat, width='stretch')
+
+
+    analise_especifica(espec, cubo_detalhado, subtopicos, frente_escolhida, filtros_ano, versao)
+
+
+# ====================== CONTEÚDOS COBRADOS JUNTOS ======================
+
+OPCAO_TODAS_FRENTES = "Todas as frentes"
+
+
+@st.fragment
+@medido("coocorrencias")
+def secao_coocorrencias(ctx):
+    espec, coocorrencias = ctx["espec"], ctx["coocorrencias"]
+    filtros_ano, versao = ctx["filtros_ano"], ctx["versao"]
+    aba = espec["aba"]
+
+    st.markdown("## 🔗 Conteúdos cobrados juntos")
+    st.caption("Quantas questões combinam dois conteúdos (Subtópico 1 e Subtópico 2 da mesma questão).")
+
+    frente_escolhida = st.selectbox(
+        "Frente:",
+        [OPCAO_TODAS_FRENTES] + list(coocorrencias["trechos_frentes"]),
+        key=f"{aba}_frente_coocorrencias",
+    )
+    frente = None if frente_escolhida == OPCAO_TODAS_FRENTES else frente_escolhida
+
+    # Pares do período pela diferença de duas somas de prefixo (agregados.py)
+    pares = contar_coocorrencias(coocorrencias, ctx["ano_inicio"], ctx["ano_fim"], frente)
+    if pares.empty:
+        st.info("Nenhuma questão do período combina dois conteúdos.")
+        return
+
+    col_mapa, col_pares = st.columns([2, 1])
+
+    with col_mapa:
+        grafico_mapa = st.container(border=True)
+        n_conteudos = len(set(pares["Conteúdo A"]) | set(pares["Conteúdo B"]))
+        limite_mapa = mostrar_todos("conteúdos", n_conteudos, f"{aba}_coocorrencias_todos")
+
+    def construir_mapa_coocorrencias():
+        import plotly.graph_objects as go
+
+        # Conteúdos que mais aparecem em pares (ou todos, se pedido)
+        matriz = matriz_coocorrencias(pares, limite_mapa)
+
+        fig_mapa = go.Figure(
+            data=go.Heatmap(
+                z=array_compacto(matriz.to_numpy()),
+                x=list(matriz.columns),
+                y=list(matriz.index),
+                colorscale="Greens",
+                colorbar=dict(title="Qtd."),
+                hovertemplate="<b>%{y}</b> + <b>%{x}</b><br>Questões: %{z}<extra></extra>",
+            )
+        )
+        fig_mapa.update_layout(
+            title=f"Conteúdos cobrados juntos ({frente_escolhida})",
+            yaxis=dict(autorange="reversed"),  # maiores no topo
+            height=max(500, len(matriz) * 28),
+        )
+        return fig_mapa
+
+    fig_mapa = figura_plotly(
+        f"{aba}/coocorrencias", {**filtros_ano, "frente": frente, "categorias": limite_mapa}, versao, construir_mapa_coocorrencias
+    )
+
+    with grafico_mapa:
+        st.plotly_chart(fig_mapa, width='stretch')
+
+    with col_pares:
+        st.markdown("**Pares mais frequentes**")
+        st.dataframe(pares.head(LIMITE_CATEGORIAS), width='stretch', hide_index=True)
+
+
+# Seções disponíveis para a chave "secoes" da especificação
+SECOES = {
+    "kpis": secao_kpis,
+    "visao_geral": secao_visao_geral,
+    "evolucao": secao_evolucao,
+    "tendencias": secao_tendencias,
+    "busca": secao_busca,
+    "detalhe": secao_detalhe,
+    "coocorrencias": secao_coocorrencias,
+}
+
+
+def renderizar_painel(espec):
+    """
+    Desenha o painel completo de uma disciplina.
+    :param espec: Especificação da disciplina (ver disciplinas.py)
+    """
+    st.title(espec["titulo"])
+
+    aba = espec["aba"]
+
+    # Página das seções medidas nos reruns só de fragmento
+    st.session_state["perfil_pagina"] = aba
+
+    try:
+        # Mantém os dados em dia em segundo plano (uma thread por processo)
+        iniciar_observador()
+
+        with medir("carregamento", pagina=aba):
+            # Um único estado por rerun: dados, cubo e figuras sempre da mesma versão
+            estado = estado_dados()
+            versao = estado["versoes_abas"].get(aba)
+            if aba not in estado["limites"]:
+                st.error(f"A aba '{aba}' não foi encontrada no arquivo Excel.")
+            aplicacoes_disponiveis = aplicacoes_da_aba(estado["questoes"], aba)
+
+            aplicacoes_escolhidas = []
+            if aplicacoes_disponiveis:
+                # ==============================================================================
+                # 1. BARRA LATERAL (FILTROS)
+                # ==============================================================================
+                st.sidebar.header("Filtros Globais")
+                aplicacoes_escolhidas = st.sidebar.multiselect(
+                    "Aplicação",
+                    aplicacoes_disponiveis,
+                    default=aplicacoes_disponiveis,
+                    key=f"{aba}_aplicacoes",
+                )
+            # Todas (ou nenhuma) marcadas: a prova inteira, com o mesmo cubo e as mesmas figuras em cache
+            aplicacoes = None
+            if aplicacoes_escolhidas and len(aplicacoes_escolhidas) < len(aplicacoes_disponiveis):
+                aplicacoes = tuple(a for a in aplicacoes_disponiveis if a in aplicacoes_escolhidas)
+
+            # Cubo de contagens (sobre os códigos da base compacta, só das partições das
+            # aplicações escolhidas): construído uma vez por versão da aba, os gráficos só fatiam
+            cubo = carregar_cubo(estado, aba, versao, aplicacoes)
+            # Índice ano -> linhas do cubo e contagens acumuladas por ano
+            indice_anos = carregar_indice_anos(cubo, aba, versao, aplicacoes)
+            # Subtópico 1 e 2 numa tabela longa indexada por (Frente, Tópico)
+            subtopicos = carregar_subtopicos(cubo, aba, versao, aplicacoes)
+            # Pares de conteúdos da mesma questão, acumulados por ano
+            coocorrencias = carregar_coocorrencias(cubo, aba, versao, aplicacoes)
+
+        if cubo.empty:
+            st.info(f"Ainda não há questões de {espec['nome']} cadastradas na planilha.")
+            return
+
+        anos_disponiveis = indice_anos["anos"].tolist()
+
+        ano_inicio, ano_fim = st.sidebar.selectbox("Ano inicial", anos_disponiveis, key=f"{aba}_ano_inicio"), \
+                            st.sidebar.selectbox("Ano final", anos_disponiveis, key=f"{aba}_ano_fim")
+
+        if ano_inicio > ano_fim:
+            st.sidebar.error("O ano inicial deve ser menor ou igual ao ano final.")
+
+        # Chave das figuras em cache: seção + filtros + versão dos dados
+        filtros_ano = {"ano_inicio": ano_inicio, "ano_fim": ano_fim}
+        if aplicacoes is not None:
+            filtros_ano["aplicacoes"] = list(aplicacoes)
+
+        ctx = {
+            "espec": espec,
+            "estado": estado,
+            "cubo": cubo,
+            "indice_anos": indice_anos,
+            "subtopicos": subtopicos,
+            "coocorrencias": coocorrencias,
+            "cubo_filtrado": fatiar_anos(cubo, indice_anos, ano_inicio, ano_fim),
+            "ano_inicio": ano_inicio,
+            "ano_fim": ano_fim,
+            "aplicacoes": aplicacoes,
+            "filtros_ano": filtros_ano,
+            "versao": versao,
+        }
+
+        for secao in espec["secoes"]:
+            SECOES[secao](ctx)
+
+    except Exception as e:
+        st.error(f"Erro ao carregar dados da aba {espec['nome']}: {e}")
+
+    # Só com ?debug=1 na URL
+    painel_perfil()
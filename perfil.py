@@ -0,0 +1,226 @@
+import streamlit as st
+import pandas as pd
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Instrumentação por seção das páginas: tempo, memória e acertos/faltas de cache.
+#
+#   with medir("carregamento", pagina="Fisica"): ...   ou   @medido("kpis")
+#
+# - Tempo e cache são sempre medidos (custo desprezível).
+# - Memória (tracemalloc) só com ENEM_PERFIL_MEMORIA=1: deixa o app mais lento, e os
+#   números são do processo todo (outras sessões ao mesmo tempo entram na conta).
+# - ENEM_PERFIL_LOG=1 grava uma linha JSON por seção no log "perfil" (stderr).
+# - ENEM_METRICAS_PORTA=9108 expõe os totais do processo em http://host:9108/metrics
+#   (formato texto do Prometheus).
+# - O painel na barra lateral aparece ao abrir a página com ?debug=1.
+
+MEDIR_MEMORIA = os.environ.get("ENEM_PERFIL_MEMORIA") == "1"
+PORTA_METRICAS = os.environ.get("ENEM_METRICAS_PORTA")
+
+logger = logging.getLogger("perfil")
+if os.environ.get("ENEM_PERFIL_LOG") == "1" and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+if MEDIR_MEMORIA and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+# Seções abertas na thread atual (cada sessão roda o script na sua thread)
+_local = threading.local()
+
+# Totais do processo por (pagina, secao), para o endpoint de métricas
+_totais = {}
+_trava_totais = threading.Lock()
+
+
+def _pilha():
+    if not hasattr(_local, "pilha"):
+        _local.pilha = []
+    return _local.pilha
+
+
+def contar_cache(acerto):
+    """Registra um acerto (ou falta) de cache em todas as seções abertas nesta thread."""
+    for medicao in _pilha():
+        medicao["cache_acertos" if acerto else "cache_faltas"] += 1
+
+
+@contextmanager
+def medir(secao, pagina=None):
+    """
+    Mede o bloco como uma seção nomeada. Seções podem ser aninhadas: a de fora
+    inclui o tempo, a memória e o cache das de dentro.
+    :param secao: Nome da seção (ex: "kpis")
+    :param pagina: Página/aba; por padrão, a da seção de fora
+    """
+    pilha = _pilha()
+    if pagina is None and pilha:
+        pagina = pilha[-1]["pagina"]
+    if pagina is None:
+        # Rerun só de um fragmento: a página é a da última execução completa
+        try:
+            pagina = st.session_state.get("perfil_pagina")
+        except Exception:
+            pass
+    medicao = {
+        "pagina": pagina,
+        "secao": secao,
+        "ms": 0.0,
+        "cache_acertos": 0,
+        "cache_faltas": 0,
+        "alocado_kb": None,
+        "pico_kb": None,
+        "_pico_filhas": 0,
+    }
+    memoria = tracemalloc.is_tracing()
+    if memoria:
+        memoria_inicio = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    pilha.append(medicao)
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        medicao["ms"] = (time.perf_counter() - inicio) * 1000
+        pilha.pop()
+        if memoria:
+            atual, pico = tracemalloc.get_traced_memory()
+            # reset_peak das seções de dentro apaga o pico delas: guardamos à parte
+            pico = max(pico, medicao["_pico_filhas"]) - memoria_inicio
+            medicao["alocado_kb"] = (atual - memoria_inicio) / 1024
+            medicao["pico_kb"] = max(pico, 0) / 1024
+            if pilha:
+                pilha[-1]["_pico_filhas"] = max(pilha[-1]["_pico_filhas"], memoria_inicio + pico)
+        del medicao["_pico_filhas"]
+        _registrar(medicao)
+
+
+def medido(secao):
+    """Decorador: mede cada chamada da função como a seção `secao`."""
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with medir(secao):
+                return funcao(*args, **kwargs)
+        return envoltorio
+    return decorador
+
+
+def _registrar(medicao):
+    with _trava_totais:
+        total = _totais.setdefault((medicao["pagina"], medicao["secao"]), {
+            "execucoes": 0, "segundos": 0.0, "segundos_max": 0.0, "cache_acertos": 0, "cache_faltas": 0,
+        })
+        total["execucoes"] += 1
+        total["segundos"] += medicao["ms"] / 1000
+        total["segundos_max"] = max(total["segundos_max"], medicao["ms"] / 1000)
+        total["cache_acertos"] += medicao["cache_acertos"]
+        total["cache_faltas"] += medicao["cache_faltas"]
+
+    logger.info(json.dumps({"evento": "secao", **medicao}, ensure_ascii=False))
+
+    # Última medição de cada seção nesta sessão, para o painel de debug
+    try:
+        st.session_state.setdefault("perfil_secoes", {})[(medicao["pagina"], medicao["secao"])] = medicao
+    except Exception:
+        pass  # Fora de uma sessão (ex: scripts)
+
+
+def totais():
+    """Cópia dos totais do processo: {(pagina, secao): {...}}."""
+    with _trava_totais:
+        return {chave: dict(valor) for chave, valor in _totais.items()}
+
+
+def texto_metricas():
+    """Totais do processo no formato texto do Prometheus."""
+    linhas = []
+    series = [
+        ("enem_secao_execucoes_total", "counter", "execucoes"),
+        ("enem_secao_segundos_total", "counter", "segundos"),
+        ("enem_secao_segundos_max", "gauge", "segundos_max"),
+        ("enem_secao_cache_acertos_total", "counter", "cache_acertos"),
+        ("enem_secao_cache_faltas_total", "counter", "cache_faltas"),
+    ]
+    dados = totais()
+    for nome, tipo, campo in series:
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for (pagina, secao), total in sorted(dados.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+            linhas.append(f'{nome}{{pagina="{pagina}",secao="{secao}"}} {total[campo]}')
+    return "\n".join(linhas) + "\n"
+
+
+class _RespostaMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        corpo = texto_metricas().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass  # Sem uma linha de log por coleta
+
+
+def iniciar_metricas():
+    """
+    Sobe o endpoint /metrics se ENEM_METRICAS_PORTA estiver definido. Chamada uma vez por
+    processo, ao importar o módulo (fora da renderização das páginas). Com vários
+    processos na mesma porta, só o primeiro expõe as métricas: os demais registram um
+    aviso no log e seguem sem o endpoint.
+    """
+    if not PORTA_METRICAS:
+        return None
+    try:
+        servidor = ThreadingHTTPServer(("", int(PORTA_METRICAS)), _RespostaMetricas)
+    except OSError as erro:
+        logger.warning("Endpoint de métricas desligado neste processo (porta %s): %s", PORTA_METRICAS, erro)
+        return None
+    threading.Thread(target=servidor.serve_forever, name="metricas", daemon=True).start()
+    return servidor
+
+
+_servidor_metricas = iniciar_metricas()
+
+
+def painel_perfil():
+    """Painel de debug na barra lateral (só com ?debug=1 na URL)."""
+    if st.query_params.get("debug") != "1":
+        return
+
+    from cache_figuras import cache_figuras
+
+    with st.sidebar.expander("⏱️ Perfil (debug)", expanded=True):
+        secoes = st.session_state.get("perfil_secoes", {})
+        if secoes:
+            tabela = pd.DataFrame(list(secoes.values()))
+            colunas = ["pagina", "secao", "ms", "cache_acertos", "cache_faltas"]
+            if MEDIR_MEMORIA:
+                colunas += ["alocado_kb", "pico_kb"]
+            st.dataframe(tabela[colunas].round(1), hide_index=True)
+        else:
+            st.caption("Nenhuma seção medida ainda.")
+        if not MEDIR_MEMORIA:
+            st.caption("Memória: defina ENEM_PERFIL_MEMORIA=1 para medir.")
+
+        estatisticas = cache_figuras().estatisticas()
+        st.caption(
+            f"Cache de figuras: {estatisticas['entradas']} figuras, "
+            f"{estatisticas['bytes'] / 1024:.0f} KB, {estatisticas['acertos']} acertos, "
+            f"{estatisticas['faltas']} faltas"
+        )
@@ -0,0 +1,82 @@
+"""
+Prepara as imagens do app (imagens.IMAGENS) para serem servidas como arquivos estáticos.
+
+Para cada imagem, gera em static/img/:
+    - PNG: redimensionado para 2x a largura de exibição (telas de alta densidade),
+      em paleta de CORES_PALETA cores; o logo de 556 px e 16 KB vira 300 px e ~4 KB
+    - SVG: o próprio vetor, sem espaços supérfluos
+com o hash do conteúdo no nome (ex: logo-1a2b3c4d5e.png), e o índice imagens.json.
+Como o nome muda sempre que a imagem muda, um proxy na frente do Streamlit pode servir
+/app/static/img/ com cache longo (Cache-Control: max-age=31536000, immutable).
+
+Rode de novo sempre que uma imagem de assets/ mudar:
+    python preparar_imagens.py
+"""
+import hashlib
+import io
+import json
+import os
+import re
+
+from PIL import Image
+
+from imagens import CAMINHO_INDICE_IMAGENS, DIRETORIO_IMAGENS, DIRETORIO_RAIZ, IMAGENS
+
+CORES_PALETA = 64
+
+
+def _png_redimensionado(caminho, largura):
+    with Image.open(caminho) as original:
+        imagem = original.convert("RGBA")
+    if imagem.width > largura:
+        altura = round(imagem.height * largura / imagem.width)
+        imagem = imagem.resize((largura, altura), Image.Resampling.LANCZOS)
+    # Paleta com transparência: o logo é de poucas cores e cai para ~1/4 do tamanho
+    imagem = imagem.quantize(colors=CORES_PALETA, method=Image.Quantize.FASTOCTREE)
+    saida = io.BytesIO()
+    imagem.save(saida, format="PNG", optimize=True)
+    return saida.getvalue()
+
+
+def _svg_compacto(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        texto = f.read()
+    return re.sub(r">\s+<", "><", re.sub(r"\s+", " ", texto)).strip().encode("utf-8")
+
+
+def preparar():
+    """
+    Gera as imagens e o índice.
+    :return: Índice gravado {nome: arquivo em static/img/}
+    """
+    os.makedirs(DIRETORIO_IMAGENS, exist_ok=True)
+    indice = {}
+    for nome, (origem, largura) in IMAGENS.items():
+        caminho = os.path.join(DIRETORIO_RAIZ, origem)
+        if origem.endswith(".svg"):
+            conteudo, extensao = _svg_compacto(caminho), ".svg"
+        else:
+            conteudo, extensao = _png_redimensionado(caminho, 2 * largura), ".png"
+        arquivo = f"{nome}-{hashlib.sha256(conteudo).hexdigest()[:10]}{extensao}"
+        with open(os.path.join(DIRETORIO_IMAGENS, arquivo), "wb") as f:
+            f.write(conteudo)
+        indice[nome] = arquivo
+
+    # Índice por último; depois, apaga as versões que saíram dele
+    with open(CAMINHO_INDICE_IMAGENS, "w", encoding="utf-8") as f:
+        json.dump(indice, f, indent=2, sort_keys=True)
+    for arquivo in os.listdir(DIRETORIO_IMAGENS):
+        if arquivo != os.path.basename(CAMINHO_INDICE_IMAGENS) and arquivo not in indice.values():
+            os.remove(os.path.join(DIRETORIO_IMAGENS, arquivo))
+    return indice
+
+
+def main():
+    indice = preparar()
+    for nome, arquivo in indice.items():
+        tamanho = os.path.getsize(os.path.join(DIRETORIO_IMAGENS, arquivo))
+        print(f"  {nome:<16}{arquivo:<32}{tamanho / 1024:>6.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
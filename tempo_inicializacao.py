@@ -0,0 +1,126 @@
+"""
+Relatório do tempo de inicialização dos módulos e das páginas do app.
+
+Cada medição roda num processo Python novo, como um servidor recém-iniciado:
+    importação        `python -X importtime`: custo de importar cada módulo do app
+                      depois do Streamlit, e os pacotes que mais pesam nele
+    primeira execução a página roda uma vez sem navegador (AppTest); o tempo inclui
+                      as importações feitas pelo script e a carga dos dados
+
+Uso:
+    python tempo_inicializacao.py
+    python tempo_inicializacao.py --modulos utils painel_disciplina --maiores 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from disciplinas import DISCIPLINAS
+
+DIRETORIO_RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+MODULOS_PADRAO = [
+    "menu", "base_questoes", "utils", "agregados", "tendencias",
+    "perfil", "cache_figuras", "observador_dados", "painel_disciplina",
+]
+PAGINAS_PADRAO = ["home.py"] + [espec["pagina"] for espec in DISCIPLINAS]
+
+# Pacotes pesados cuja presença depois da primeira execução vale mostrar
+PACOTES_PESADOS = ["pandas", "numpy", "pyarrow", "plotly.express", "plotly.graph_objects", "altair"]
+
+
+def tempos_importacao(modulo):
+    """
+    Custo de importar o módulo num processo em que só o Streamlit já foi importado.
+    :return: (segundos, {pacote: segundos próprios}) com os pacotes de primeiro nível
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import streamlit; import {modulo}"],
+        cwd=DIRETORIO_RAIZ,
+        capture_output=True,
+        text=True,
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}:\n{processo.stderr}")
+
+    # Linhas "import time: <próprio us> | <acumulado us> | <módulo>", filhos antes do pai.
+    # O que vem depois da linha do streamlit (nível 0) é a árvore do módulo medido
+    linhas = [linha for linha in processo.stderr.splitlines() if linha.startswith("import time:")][1:]
+    pacotes = {}
+    total = 0.0
+    depois_do_streamlit = False
+    for linha in linhas:
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        nivel = (len(nome) - len(nome.lstrip())) // 2
+        nome = nome.strip()
+        if not depois_do_streamlit:
+            depois_do_streamlit = nivel == 0 and nome == "streamlit"
+            continue
+        pacote = nome.split(".")[0]
+        pacotes[pacote] = pacotes.get(pacote, 0.0) + int(proprio) / 1e6
+        if nivel == 0:
+            total += int(acumulado) / 1e6
+    return total, pacotes
+
+
+def primeira_execucao(pagina):
+    """
+    Primeira execução da página num processo novo (chamada no processo filho).
+    :return: dict com "segundos" e os PACOTES_PESADOS que a execução carregou
+    """
+    from streamlit.testing.v1 import AppTest
+
+    ja_importados = set(sys.modules)
+    at = AppTest.from_file(os.path.join(DIRETORIO_RAIZ, "home.py"), default_timeout=600)
+    if pagina != "home.py":
+        at.switch_page(pagina)
+    inicio = time.perf_counter()
+    at.run()
+    segundos = time.perf_counter() - inicio
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return {
+        "segundos": segundos,
+        "carregados": [pacote for pacote in PACOTES_PESADOS if pacote in sys.modules and pacote not in ja_importados],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modulos", nargs="+", default=MODULOS_PADRAO, help="Módulos do app medidos")
+    parser.add_argument("--paginas", nargs="+", default=PAGINAS_PADRAO, help="Páginas medidas")
+    parser.add_argument("--maiores", type=int, default=4, help="Pacotes mais pesados listados por módulo")
+    parser.add_argument("--pagina", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.pagina:
+        print(json.dumps(primeira_execucao(args.pagina)))
+        return
+
+    print("Importação (depois do streamlit)")
+    for modulo in args.modulos:
+        total, pacotes = tempos_importacao(modulo)
+        maiores = sorted(pacotes.items(), key=lambda item: -item[1])[:args.maiores]
+        detalhe = ", ".join(f"{pacote} {segundos:.2f}s" for pacote, segundos in maiores)
+        print(f"  {modulo:<20}{total:>7.2f}s   {detalhe}")
+
+    print("Primeira execução (processo novo)")
+    for pagina in args.paginas:
+        processo = subprocess.run(
+            [sys.executable, __file__, "--pagina", pagina],
+            cwd=DIRETORIO_RAIZ,
+            capture_output=True,
+            text=True,
+        )
+        if processo.returncode != 0:
+            raise RuntimeError(f"Falha ao rodar {pagina}:\n{processo.stderr}")
+        resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+        carregados = ", ".join(resultado["carregados"]) or "nenhum pacote pesado"
+        print(f"  {pagina:<20}{resultado['segundos']:>7.2f}s   {carregados}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import pandas as pd
+import numpy as np
+
+from agregados import COLUNAS_SUBTOPICOS
+
+# Estatísticas de tendência por categoria ao longo dos anos.
+# Tudo sai de uma única matriz Ano × categoria (contagens), montada com um
+# bincount sobre o cubo: nenhuma estatística percorre as categorias em Python.
+
+# Níveis do ranking: colunas que identificam cada categoria
+NIVEIS_TENDENCIA = {
+    "Frente": ["Frente"],
+    "Tópico": ["Frente", "Tópico"],
+    "Subtópico": ["Frente", "Tópico", "Subtópico"],
+}
+
+# Número de provas da média móvel
+JANELA_MEDIA_MOVEL = 3
+
+
+def matriz_anos(cubo, colunas, anos):
+    """
+    Matriz de contagens Ano × categoria, com zero nos anos sem questões.
+    :param cubo: Cubo de contagens (agregados.carregar_cubo), já recortado nos anos
+    :param colunas: Colunas que definem a categoria (ver NIVEIS_TENDENCIA);
+                    "Subtópico" junta Subtópico 1 e Subtópico 2
+    :param anos: Anos (ordenados) que formam as linhas da matriz
+    :return: (categorias, matriz) com categorias = DataFrame[colunas] e matriz (n_anos × n_categorias)
+    """
+    colunas = list(colunas)
+    if "Subtópico" in colunas:
+        outras = [coluna for coluna in colunas if coluna != "Subtópico"]
+        partes = [
+            cubo[["Ano", *outras, coluna, "Quantidade"]].rename(columns={coluna: "Subtópico"})
+            for coluna in COLUNAS_SUBTOPICOS
+        ]
+        # Categorias diferentes em cada coluna: o concat vira texto
+        tabela = pd.concat(partes, ignore_index=True)
+    else:
+        tabela = cubo[["Ano", *colunas, "Quantidade"]]
+    tabela = tabela.dropna(subset=colunas)
+
+    anos = np.asarray(anos)
+    codigos, categorias = pd.MultiIndex.from_frame(tabela[colunas].astype(str)).factorize()
+    posicao_ano = np.searchsorted(anos, tabela["Ano"].to_numpy())
+    n_categorias = len(categorias)
+
+    matriz = np.bincount(
+        posicao_ano * n_categorias + codigos,
+        weights=tabela["Quantidade"].to_numpy(dtype=np.int64),
+        minlength=len(anos) * n_categorias,
+    ).reshape(len(anos), n_categorias).astype(np.int64)
+
+    return categorias.to_frame(index=False, name=colunas), matriz
+
+
+def estatisticas_tendencia(matriz, anos, janela=JANELA_MEDIA_MOVEL):
+    """
+    Estatísticas de cada coluna da matriz Ano × categoria.
+    - inclinacao: questões a mais (ou a menos) por ano, pela reta de mínimos quadrados
+    - media_movel: média das últimas `janela` provas
+    - probabilidade: chance de cair na próxima prova pela regra de sucessão de
+      Laplace, (provas com a categoria + 1) / (provas + 2)
+    - esperado: média móvel projetada pela inclinação até a próxima prova (mínimo 0)
+    :param matriz: Matriz de matriz_anos
+    :param anos: Anos das linhas da matriz
+    :return: dict {nome: array com um valor por categoria}, incluindo "total"
+    """
+    matriz = np.asarray(matriz, dtype=float)
+    anos = np.asarray(anos, dtype=float)
+    n_anos = len(anos)
+
+    # Reta de mínimos quadrados: todas as categorias num só produto de matrizes
+    centrado = anos - anos.mean() if n_anos else anos
+    variancia = centrado @ centrado
+    inclinacao = centrado @ matriz / variancia if variancia > 0 else np.zeros(matriz.shape[1])
+
+    janela = max(1, min(janela, n_anos))
+    media_movel = matriz[n_anos - janela:].mean(axis=0) if n_anos else np.zeros(matriz.shape[1])
+
+    probabilidade = ((matriz > 0).sum(axis=0) + 1) / (n_anos + 2)
+
+    # O centro da janela está (janela - 1) / 2 anos antes da última prova,
+    # e a próxima prova é um ano depois dela
+    esperado = np.maximum(media_movel + inclinacao * (janela + 1) / 2, 0)
+
+    return {
+        "total": matriz.sum(axis=0),
+        "inclinacao": inclinacao,
+        "media_movel": media_movel,
+        "probabilidade": probabilidade,
+        "esperado": esperado,
+    }
+
+
+def ranking_tendencias(cubo, nivel, anos, janela=JANELA_MEDIA_MOVEL):
+    """
+    Ranking das categorias do nível pelo número esperado de questões na próxima prova.
+    :param cubo: Cubo de contagens recortado nos anos
+    :param nivel: Uma das chaves de NIVEIS_TENDENCIA
+    :param anos: Anos considerados (ordenados)
+    :return: DataFrame [colunas do nível..., "Questões", "Por ano", "Tendência",
+             "Média móvel", "Probabilidade", "Esperado"], do maior para o menor Esperado
+    """
+    categorias, matriz = matriz_anos(cubo, NIVEIS_TENDENCIA[nivel], anos)
+    estatisticas = estatisticas_tendencia(matriz, anos, janela)
+
+    ranking = categorias.assign(**{
+        "Questões": estatisticas["total"].astype(int),
+        "Por ano": matriz.T.tolist(),
+        "Tendência": estatisticas["inclinacao"],
+        "Média móvel": estatisticas["media_movel"],
+        "Probabilidade": estatisticas["probabilidade"],
+        "Esperado": estatisticas["esperado"],
+    })
+    # Empate no esperado: a mais frequente primeiro
+    ordem = np.lexsort((-estatisticas["probabilidade"], -estatisticas["esperado"]))
+    return ranking.iloc[ordem].reset_index(drop=True)
@@ -1,56 +1,628 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import xml.etree.ElementTree as ET
+import numpy as np
+import hashlib
+import json
 import os
+import re
+import threading
+import unicodedata
+import zipfile
 
-@st.cache_data
-def carregar_dados(nome_da_aba):
+from base_questoes import (
+    APLICACAO_PADRAO, anexar_base_questoes, construir_base_questoes, dataframe, publicar_base_questoes,
+)
+from arquivos import escrever_atomico
+from validacao import resumo_relatorio, validar_abas, versao_regras
+
+# 1. Encontrar o caminho do arquivo de forma robusta
+# Isso garante que funcione tanto rodando da Home quanto das Pages
+DIRETORIO_RAIZ = os.path.dirname(os.path.abspath(__file__))
+# ENEM_DIRETORIO_DADOS aponta o app para outra pasta de planilhas (ex: benchmark.py)
+DIRETORIO_DADOS = os.environ.get('ENEM_DIRETORIO_DADOS') or os.path.join(DIRETORIO_RAIZ, 'dados')
+CAMINHO_PLANILHA = os.path.join(DIRETORIO_DADOS, 'dados_enem_natureza.xlsx')
+
+# Cache colunar (Arrow/Feather) gerado a partir das planilhas
+DIRETORIO_CACHE = os.path.join(DIRETORIO_DADOS, 'cache')
+CAMINHO_MANIFESTO = os.path.join(DIRETORIO_CACHE, 'manifesto.json')
+
+# O cache é particionado por disciplina (aba), ano e aplicação da prova: um arquivo
+# Arrow por partição em particoes/<aba>/<ano>/<aplicação>-<hash do conteúdo>.arrow.
+# Uma partição que não mudou mantém o arquivo entre versões. O app lê todas as
+# partições uma vez por versão, para a base compacta compartilhada entre sessões e
+# processos; a poda por ano e aplicação é feita nela, sobre os trechos de linhas de
+# cada partição (base_questoes.trechos), sem reabrir arquivos a cada filtro.
+DIRETORIO_PARTICOES = os.path.join(DIRETORIO_CACHE, 'particoes')
+# Relatório da validação (validacao.py) de cada aba: validacao/<aba>.json, com as
+# linhas rejeitadas e os rótulos ajustados; o resumo fica no manifesto
+DIRETORIO_VALIDACAO = os.path.join(DIRETORIO_CACHE, 'validacao')
+
+# Esquema comum a todas as disciplinas. Aplicação (regular, PPL, reaplicação) é
+# opcional na planilha: linhas sem ela são da aplicação regular
+COLUNAS_BASE = ["Disciplina", "Ano", "Aplicação", "Número (Cinza)", "Frente", "Tópico", "Subtópico 1", "Subtópico 2", "Tipo"]
+
+# Colunas com poucos valores distintos e muito repetidos -> categóricas
+COLUNAS_CATEGORICAS = ["Disciplina", "Aplicação", "Frente", "Tópico", "Tipo", "Subtópico 1", "Subtópico 2"]
+
+# Muda quando o formato dos arquivos em dados/cache muda (invalida caches antigos)
+FORMATO_CACHE = 5
+PREFIXO_BASE = "base-"
+# Versão dos dados lidos direto do Excel, quando o cache não pode ser usado
+PREFIXO_SEM_CACHE = "sem-cache-"
+
+# Namespaces do XML das planilhas .xlsx
+_NS_PLANILHA = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_RELACOES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+# Células do XML de uma aba: <c r="A1" t="s" s="3"><v>0</v></c> (ou <c .../> vazia)
+_CELULA = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_REFERENCIA = re.compile(rb'\br="([^"]*)"')
+_TIPO = re.compile(rb'\bt="([^"]*)"')
+_VALOR = re.compile(rb'<v>(.*?)</v>', re.S)
+_TEXTO = re.compile(rb'<t\b[^>]*>(.*?)</t>', re.S)
+
+# Erros que impedem compilar o cache (planilha sendo salva, sem permissão de escrita...)
+ERROS_LEITURA = (OSError, ValueError, KeyError, zipfile.BadZipFile, ET.ParseError, pa.ArrowException)
+
+
+def _hash_texto(texto):
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def _ler_manifesto():
+    try:
+        with open(CAMINHO_MANIFESTO, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _escrever_json(caminho, conteudo):
+    def escrever(temporario):
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, ensure_ascii=False, indent=2)
+    escrever_atomico(caminho, escrever)
+
+
+def _escrever_manifesto(manifesto):
+    _escrever_json(CAMINHO_MANIFESTO, manifesto)
+
+
+def listar_fontes():
+    """
+    Planilhas de dados: a principal primeiro e depois qualquer outro .xlsx
+    colocado em dados/, em ordem alfabética. Abas de mesmo nome são somadas.
+    """
+    fontes = [CAMINHO_PLANILHA] if os.path.exists(CAMINHO_PLANILHA) else []
+    try:
+        nomes = sorted(os.listdir(DIRETORIO_DADOS))
+    except OSError:
+        return fontes
+    for nome in nomes:
+        caminho = os.path.join(DIRETORIO_DADOS, nome)
+        # "~$..." são os arquivos de trava que o Excel cria enquanto a planilha está aberta
+        if nome.endswith('.xlsx') and not nome.startswith('~$') and caminho != CAMINHO_PLANILHA:
+            fontes.append(caminho)
+    return fontes
+
+
+def impressoes_planilha(caminho):
+    """
+    Impressão digital (SHA-256) de cada aba de um .xlsx, sem montar DataFrames:
+    posição, tipo e valor de cada célula preenchida, com os textos compartilhados
+    já resolvidos. Editar uma aba não muda a impressão das outras, e formatação
+    ou a ordem da tabela de textos (que muda a cada gravação) não contam.
+    :return: dict {nome_da_aba: sha256}, na ordem das abas
+    """
+    with zipfile.ZipFile(caminho) as z:
+        livro = ET.fromstring(z.read("xl/workbook.xml"))
+        relacoes = ET.fromstring(z.read("xl/_rels/workbook.xml.rels"))
+        alvos = {r.get("Id"): r.get("Target") for r in relacoes}
+
+        textos = []
+        if "xl/sharedStrings.xml" in z.namelist():
+            for item in ET.fromstring(z.read("xl/sharedStrings.xml")):
+                textos.append("".join(t.text or "" for t in item.iter(f"{{{_NS_PLANILHA}}}t")))
+
+        impressoes = {}
+        for aba in livro.iter(f"{{{_NS_PLANILHA}}}sheet"):
+            alvo = alvos[aba.get(f"{{{_NS_RELACOES}}}id")]
+            xml = z.read(alvo.lstrip("/") if alvo.startswith("/") else f"xl/{alvo}")
+            h = hashlib.sha256()
+            for atributos, conteudo in _CELULA.findall(xml):
+                if not conteudo:
+                    continue
+                tipo = _TIPO.search(atributos)
+                tipo = tipo.group(1) if tipo else b"n"
+                if tipo == b"inlineStr":
+                    # Texto direto na célula vale o mesmo que texto compartilhado
+                    tipo, valor = b"s", b"".join(_TEXTO.findall(conteudo))
+                else:
+                    valor = _VALOR.search(conteudo)
+                    if valor is None:
+                        continue
+                    valor = valor.group(1)
+                    if tipo == b"s":
+                        valor = textos[int(valor)].encode('utf-8')
+                    elif tipo == b"n":
+                        # "2025" e "2025.0" são o mesmo número
+                        valor = repr(float(valor)).encode()
+                referencia = _REFERENCIA.search(atributos)
+                referencia = referencia.group(1) if referencia else b""
+                h.update(referencia + b"\t" + tipo + b"\t" + valor + b"\n")
+            impressoes[aba.get("name")] = h.hexdigest()
+    return impressoes
+
+
+def _abas_das_fontes(fontes):
+    # {aba: [(arquivo, impressão), ...]} na ordem em que as abas aparecem
+    partes = {}
+    for fonte in fontes:
+        for aba, impressao in impressoes_planilha(fonte).items():
+            partes.setdefault(aba, []).append((os.path.basename(fonte), impressao))
+    return partes
+
+
+def _estado_fontes(fontes):
+    # {arquivo: [mtime_ns, tamanho]}: muda quando alguma planilha é salva
+    estado_fontes = {}
+    for fonte in fontes:
+        info = os.stat(fonte)
+        estado_fontes[os.path.basename(fonte)] = [info.st_mtime_ns, info.st_size]
+    return estado_fontes
+
+
+def _impressoes_abas(partes, regras):
+    # Versão de cada aba. As regras entram na impressão: com outras regras, a mesma aba
+    # é outra versão (e os cubos, índices e figuras chaveados por ela são refeitos)
+    return {aba: _hash_texto(json.dumps([regras, lista])) for aba, lista in partes.items()}
+
+
+def _ler_abas(fontes, partes, abas):
+    """
+    Lê do Excel só as abas pedidas, juntando as linhas de todas as planilhas que as têm.
+    :return: dict {nome_da_aba: DataFrame}
+    """
+    lidas = {}
+    for fonte in fontes:
+        arquivo = os.path.basename(fonte)
+        nomes = [aba for aba in abas if any(a == arquivo for a, _ in partes[aba])]
+        if not nomes:
+            continue
+        for aba, df in pd.read_excel(fonte, sheet_name=nomes).items():
+            # Índice = linha de origem ("dados.xlsx:2" é a primeira depois do cabeçalho),
+            # para o relatório da validação
+            df.index = [f"{arquivo}:{linha}" for linha in range(2, len(df) + 2)]
+            lidas.setdefault(aba, []).append(df.rename(columns=lambda coluna: str(coluna).strip()))
+    return {
+        aba: lidas[aba][0] if len(lidas[aba]) == 1 else pd.concat(lidas[aba])
+        for aba in abas
+    }
+
+
+def tipar_colunas(df):
+    """
+    Converte as colunas para tipos compactos: Ano em int16 e rótulos em category.
+    :param df: DataFrame lido de uma aba da planilha
+    """
+    df = df.copy()
+    if "Ano" in df.columns:
+        df["Ano"] = df["Ano"].astype("int16")
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype("category").cat.remove_unused_categories()
+    return df
+
+
+def normalizar_abas(abas):
+    """
+    Junta as abas da planilha num único DataFrame com o esquema COLUNAS_BASE.
+    As linhas de cada aba ficam contíguas, na ordem das abas, e ordenadas por
+    (Ano, Aplicação): cada partição (aba, ano, aplicação) é um trecho contíguo.
+    :param abas: dict {nome_da_aba: DataFrame}, como devolvido por read_excel(sheet_name=None)
+    :return: (base, limites) com limites = {nome_da_aba: (inicio, fim)}
+    """
+    partes = []
+    limites = {}
+    inicio = 0
+    for nome_da_aba, df in abas.items():
+        df = df.rename(columns=lambda coluna: str(coluna).strip())
+        df = df.assign(Disciplina=nome_da_aba).reindex(columns=COLUNAS_BASE)
+        if df["Aplicação"].isna().any():
+            df["Aplicação"] = df["Aplicação"].astype(object).where(df["Aplicação"].notna(), APLICACAO_PADRAO)
+        # Ordenar por Ano permite recortar intervalos de anos por fatia
+        df = df.sort_values(["Ano", "Aplicação"], kind="stable")
+        limites[nome_da_aba] = (inicio, inicio + len(df))
+        inicio += len(df)
+        # Abas vazias só entram nos limites (evita colunas all-NA no concat)
+        if len(df):
+            partes.append(df)
+
+    if partes:
+        base = pd.concat(partes, ignore_index=True)
+    else:
+        base = pd.DataFrame(columns=COLUNAS_BASE)
+
+    # Tipar depois do concat para que as categorias sejam as mesmas em todas as abas
+    return tipar_colunas(base), limites
+
+
+def _slug(texto):
+    # Nome de pasta/arquivo sem acentos nem espaços ("Reaplicação" -> "reaplicacao")
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', texto.lower()).strip('-') or 'vazio'
+
+
+def _tabela_particao(df):
+    # Tipos fixos (rótulos em dicionário de texto, Ano int16, Número float64) e sem os
+    # metadados do pandas: partições de versões diferentes se juntam sem conversão e
+    # o mesmo conteúdo gera sempre os mesmos bytes (e o mesmo nome de arquivo)
+    colunas = {}
+    for coluna in COLUNAS_BASE:
+        valores = df[coluna]
+        if coluna in COLUNAS_CATEGORICAS:
+            categorias = valores.astype("category").cat.remove_unused_categories()
+            colunas[coluna] = pa.DictionaryArray.from_arrays(
+                pa.array(categorias.cat.codes.to_numpy(dtype=np.int32), mask=categorias.isna().to_numpy()),
+                pa.array(categorias.cat.categories.astype(str).tolist(), type=pa.large_string()),
+            )
+        elif coluna == "Ano":
+            colunas[coluna] = pa.array(valores.to_numpy(dtype=np.int16))
+        else:
+            colunas[coluna] = pa.array(pd.to_numeric(valores).to_numpy(dtype=np.float64), from_pandas=True)
+    return pa.table(colunas)
+
+
+def _gravar_particao(df, aba, ano, aplicacao):
+    """
+    Grava uma partição (já tipada e ordenada) no cache, se ainda não existir.
+    :return: Entrada do manifesto {"aba", "ano", "aplicacao", "arquivo", "linhas"}
+    """
+    tabela = _tabela_particao(df)
+    saida = pa.BufferOutputStream()
+    # Formato de arquivo do Arrow (o mesmo do Feather v2), sem compressão: memory-map na leitura
+    with pa.ipc.new_file(saida, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    conteudo = saida.getvalue()
+
+    nome = f"{_slug(aplicacao)}-{hashlib.sha256(conteudo).hexdigest()[:16]}.arrow"
+    arquivo = "/".join(["particoes", _slug(aba), str(ano), nome])
+    caminho = os.path.join(DIRETORIO_CACHE, *arquivo.split("/"))
+    # Mesmo conteúdo, mesmo nome: partições que não mudaram não são regravadas
+    if not os.path.exists(caminho):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        def escrever(temporario):
+            with open(temporario, 'wb') as f:
+                f.write(conteudo)
+        escrever_atomico(caminho, escrever)
+    return {"aba": aba, "ano": int(ano), "aplicacao": str(aplicacao), "arquivo": arquivo, "linhas": len(df)}
+
+
+def _gravar_particoes(base, limites):
+    """
+    Divide cada aba da base (normalizar_abas) em partições (ano, aplicação) e as grava.
+    :return: {nome_da_aba: [entradas do manifesto, na ordem da base]}
+    """
+    particoes = {}
+    for aba, (inicio, fim) in limites.items():
+        df = base.iloc[inicio:fim]
+        anos = df["Ano"].to_numpy()
+        aplicacoes = df["Aplicação"].astype(str).to_numpy()
+        # Trechos contíguos: a aba está ordenada por (Ano, Aplicação)
+        muda = np.ones(len(df), dtype=bool)
+        muda[1:] = (anos[1:] != anos[:-1]) | (aplicacoes[1:] != aplicacoes[:-1])
+        inicios = np.flatnonzero(muda)
+        fins = np.append(inicios[1:], len(df))
+        particoes[aba] = [
+            _gravar_particao(df.iloc[i:j], aba, anos[i], aplicacoes[i]) for i, j in zip(inicios, fins)
+        ]
+    return particoes
+
+
+def _gravar_relatorios(relatorios, regras):
+    """
+    Grava o relatório de validação de cada aba em validacao/<aba>.json.
+    :return: {nome_da_aba: resumo (validacao.resumo_relatorio) + "relatorio" (caminho no cache)}
+    """
+    os.makedirs(DIRETORIO_VALIDACAO, exist_ok=True)
+    resumos = {}
+    for aba, relatorio in relatorios.items():
+        arquivo = f"validacao/{_slug(aba)}.json"
+        _escrever_json(os.path.join(DIRETORIO_CACHE, *arquivo.split("/")), {"aba": aba, "regras": regras, **relatorio})
+        resumos[aba] = {**resumo_relatorio(relatorio), "relatorio": arquivo}
+    return resumos
+
+
+def _caminho_particao(particao):
+    return os.path.join(DIRETORIO_CACHE, *particao["arquivo"].split("/"))
+
+
+def _prefixo_questoes(manifesto):
+    # Base compacta publicada da versão (base_questoes.publicar_base_questoes)
+    return os.path.join(DIRETORIO_CACHE, f"{PREFIXO_BASE}{manifesto['versao'][:16]}.questoes")
+
+
+def _apagar_cache_antigo(manifesto):
+    # Arquivos antigos podem estar abertos (memory-map) por outro processo: tenta e segue.
+    # Fica a base compacta da versão atual e as partições que o manifesto usa
+    atual = os.path.basename(_prefixo_questoes(manifesto))
+    for nome in os.listdir(DIRETORIO_CACHE):
+        if nome.startswith(PREFIXO_BASE) and not nome.endswith(".tmp") and nome not in (f"{atual}.bin", f"{atual}.json"):
+            try:
+                os.remove(os.path.join(DIRETORIO_CACHE, nome))
+            except OSError:
+                pass
+
+    em_uso = {os.path.normpath(_caminho_particao(particao)) for particao in manifesto["particoes"]}
+    for raiz, _, nomes in os.walk(DIRETORIO_PARTICOES, topdown=False):
+        for nome in nomes:
+            caminho = os.path.normpath(os.path.join(raiz, nome))
+            if nome.endswith(".arrow") and caminho not in em_uso:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+        try:
+            os.rmdir(raiz)  # Só remove pastas que ficaram vazias
+        except OSError:
+            pass
+
+    # Relatórios de abas que saíram das planilhas
+    relatorios = {os.path.basename(resumo["relatorio"]) for resumo in manifesto["validacao"].values()}
+    if os.path.isdir(DIRETORIO_VALIDACAO):
+        for nome in os.listdir(DIRETORIO_VALIDACAO):
+            if nome.endswith(".json") and nome not in relatorios:
+                try:
+                    os.remove(os.path.join(DIRETORIO_VALIDACAO, nome))
+                except OSError:
+                    pass
+
+
+def compilar_cache_colunar(fontes=None, forcar=False):
+    """
+    Converte as abas das planilhas no cache particionado (um Arrow por aba, ano e aplicação).
+    Só relê do Excel as abas cuja impressão digital mudou; as partições das demais
+    continuam as mesmas (nem são abertas). As abas lidas passam antes pela validação
+    (validacao.py): só as linhas aceitas, com os rótulos canônicos, vão para o cache.
+    :param fontes: Planilhas de origem (padrão: listar_fontes())
+    :param forcar: Recompila todas as abas mesmo que o cache esteja em dia
+    :return: Manifesto do cache ({"versao": ..., "impressoes": {aba: sha256},
+             "abas": {aba: [inicio, fim]}, "particoes": [{aba, ano, aplicacao,
+             arquivo, linhas}, ...], "regras": versao_regras(), "validacao": {aba:
+             {linhas, aceitas, rejeitadas, ajustes, relatorio}}, ...})
+    """
+    if fontes is None:
+        fontes = listar_fontes()
+    if not fontes:
+        raise FileNotFoundError(f"Nenhuma planilha encontrada em {DIRETORIO_DADOS}")
+
+    estado_fontes = _estado_fontes(fontes)
+    regras = versao_regras()
+    manifesto = _ler_manifesto()
+    valido = (
+        manifesto is not None
+        and not forcar
+        and manifesto.get("formato") == FORMATO_CACHE
+        and manifesto.get("regras") == regras
+        and all(os.path.exists(_caminho_particao(particao)) for particao in manifesto["particoes"])
+    )
+
+    # Caminho rápido: mesmas planilhas, com mesmo mtime e tamanho -> nada a fazer
+    if valido and manifesto["fontes"] == estado_fontes:
+        return manifesto
+
+    partes = _abas_das_fontes(fontes)
+    impressoes = _impressoes_abas(partes, regras)
+
+    # mtime mudou (ex: checkout do git), mas o conteúdo pode ser o mesmo
+    if valido and manifesto["impressoes"] == impressoes:
+        manifesto["fontes"] = estado_fontes
+        _escrever_manifesto(manifesto)
+        return manifesto
+
+    anteriores = manifesto["impressoes"] if valido else {}
+    alteradas = [aba for aba in impressoes if anteriores.get(aba) != impressoes[aba]]
+
+    os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+    # Só as abas alteradas são lidas e particionadas; cada versão aponta para os seus
+    # arquivos, então quem ainda lê a versão anterior não é afetado pela troca
+    validas, relatorios = validar_abas(_ler_abas(fontes, partes, alteradas))
+    novas = _gravar_particoes(*normalizar_abas(validas))
+    resumos = _gravar_relatorios(relatorios, regras)
+    particoes_anteriores = {}
+    for particao in (manifesto["particoes"] if valido else []):
+        particoes_anteriores.setdefault(particao["aba"], []).append(particao)
+
+    particoes = []
+    limites = {}
+    inicio = 0
+    for aba in impressoes:
+        da_aba = novas[aba] if aba in novas else particoes_anteriores.get(aba, [])
+        particoes.extend(da_aba)
+        fim = inicio + sum(particao["linhas"] for particao in da_aba)
+        limites[aba] = [inicio, fim]
+        inicio = fim
+
+    validacao = {aba: resumos[aba] if aba in resumos else manifesto["validacao"][aba] for aba in impressoes}
+
+    manifesto = {
+        "formato": FORMATO_CACHE,
+        "regras": regras,
+        "fontes": estado_fontes,
+        # Regras diferentes, conteúdo diferente: a versão muda junto
+        "versao": _hash_texto(json.dumps([regras, impressoes])),
+        "impressoes": impressoes,
+        "abas": limites,
+        "particoes": particoes,
+        "validacao": validacao,
+    }
+    _escrever_manifesto(manifesto)
+    _apagar_cache_antigo(manifesto)
+    return manifesto
+
+
+def ler_base_colunar(manifesto):
+    """
+    Lê a base completa do cache particionado (sem parsear XML): as partições de cada
+    aba, na ordem do manifesto, cada arquivo via memory-map.
+    :return: (base, limites) no mesmo formato de normalizar_abas
+    """
+    tabelas = []
+    limites = {}
+    inicio = 0
+    for aba in manifesto["abas"]:
+        linhas = 0
+        for particao in manifesto["particoes"]:
+            if particao["aba"] != aba:
+                continue
+            tabelas.append(feather.read_table(_caminho_particao(particao), memory_map=True))
+            linhas += particao["linhas"]
+        limites[aba] = (inicio, inicio + linhas)
+        inicio += linhas
+
+    if not tabelas:
+        return tipar_colunas(pd.DataFrame(columns=COLUNAS_BASE)), limites
+    # Mesmo esquema em todas as partições; só os dicionários dos rótulos são unificados
+    tabela = pa.concat_tables(tabelas).unify_dictionaries()
+    return tipar_colunas(tabela.to_pandas()), limites
+
+
+def carregar_questoes(manifesto):
+    """
+    Base compacta da versão do manifesto, compartilhada entre processos: o primeiro
+    processo a precisar dela a publica no cache (base_questoes.publicar_base_questoes);
+    os seguintes só a anexam por memory-map, sem ler planilha nem Arrow.
+    """
+    prefixo = _prefixo_questoes(manifesto)
+    try:
+        return anexar_base_questoes(prefixo, manifesto["versao"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    base, limites = ler_base_colunar(manifesto)
+    questoes = construir_base_questoes(base, limites)
+    try:
+        publicar_base_questoes(questoes, prefixo, manifesto["versao"])
+    except OSError:
+        pass  # Sem permissão de escrita: cada processo fica com a sua cópia
+    return questoes
+
+
+# Estado dos dados no processo, compartilhado (somente leitura) por todas as sessões.
+# É trocado por inteiro numa única atribuição: quem leu o estado antigo continua com
+# base, limites e versões coerentes entre si até o próximo rerun.
+_estado = None
+_trava_atualizacao = threading.Lock()
+# Com o observador de dados rodando (observador_dados.py) as leituras não conferem
+# as planilhas: quem atualiza o estado é a thread do observador
+_conferir_a_cada_leitura = True
+
+
+def _estado_sem_cache(anterior):
+    """
+    Estado lido direto do Excel, sem o cache colunar (sem permissão de escrita ou cache
+    corrompido). As planilhas só são relidas quando alguma muda (mtime e tamanho, como
+    no caminho rápido do manifesto); as versões das abas são as impressões do cache.
+    :param anterior: Estado atual, devolvido se as planilhas não mudaram
+    """
+    fontes = listar_fontes()
+    if not fontes:
+        raise FileNotFoundError(f"Arquivo não encontrado em: {CAMINHO_PLANILHA}")
+    regras = versao_regras()
+    versao = PREFIXO_SEM_CACHE + _hash_texto(json.dumps([regras, _estado_fontes(fontes)]))
+    if anterior is not None and anterior["versao"] == versao:
+        return anterior
+
+    partes = _abas_das_fontes(fontes)
+    base, limites = normalizar_abas(validar_abas(_ler_abas(fontes, partes, list(partes)))[0])
+    return {
+        "versao": versao,
+        "versoes_abas": _impressoes_abas(partes, regras),
+        "questoes": construir_base_questoes(base, limites),
+        "limites": limites,
+    }
+
+
+def atualizar_dados(forcar=False):
+    """
+    Confere as planilhas e, se algo mudou, recompila as abas alteradas e troca o estado.
+    Várias threads podem chamar ao mesmo tempo: uma compila e as outras esperam.
+    :param forcar: Recompila todas as abas
+    :return: Estado atual (ver estado_dados)
+    """
+    global _estado
+    with _trava_atualizacao:
+        try:
+            manifesto = compilar_cache_colunar(forcar=forcar)
+        except ERROS_LEITURA:
+            # Sem permissão de escrita, cache corrompido ou planilha no meio de uma gravação
+            manifesto = None
+
+        if manifesto is None:
+            if _estado is not None and not _estado["versao"].startswith(PREFIXO_SEM_CACHE):
+                # O cache já funcionou neste processo: segue com a versão atual
+                return _estado
+            try:
+                _estado = _estado_sem_cache(_estado)
+            except ERROS_LEITURA:
+                if _estado is not None:
+                    return _estado
+                raise
+        elif _estado is None or _estado["versao"] != manifesto["versao"]:
+            questoes = carregar_questoes(manifesto)
+            _estado = {
+                "versao": manifesto["versao"],
+                "versoes_abas": dict(manifesto["impressoes"]),
+                "questoes": questoes,
+                "limites": questoes["limites"],
+            }
+        return _estado
+
+
+def estado_dados():
+    """
+    Estado atual dos dados: dict com "versao" (da base toda), "versoes_abas"
+    ({aba: versão}, muda só quando a aba muda), "questoes" (base compacta, ver
+    base_questoes.py) e "limites".
+    Guarde o dict e use sempre ele no mesmo rerun, para não misturar versões.
+    """
+    estado = _estado
+    if estado is None or _conferir_a_cada_leitura:
+        return atualizar_dados()
+    return estado
+
+
+def usar_observador():
+    """Passa a confiar no observador de dados em vez de conferir as planilhas a cada leitura."""
+    global _conferir_a_cada_leitura
+    _conferir_a_cada_leitura = False
+
+
+def carregar_dados(nome_da_aba, estado=None):
     """
     Carrega uma aba específica do arquivo Excel local.
+    Devolve uma vista (sem cópia) da base compacta do estado; não modifique o resultado.
+    Para recortar anos ou aplicações, use base_questoes.filtrar sobre estado["questoes"].
     :param nome_da_aba: Nome da aba (Planilha) no arquivo Excel (ex: 'Fisica')
+    :param estado: Estado de estado_dados() já obtido neste rerun (opcional)
     """
-    
-    # 1. Encontrar o caminho do arquivo de forma robusta
-    # Isso garante que funcione tanto rodando da Home quanto das Pages
-    diretorio_atual = os.path.dirname(__file__)
-    caminho_arquivo = os.path.join(diretorio_atual, 'dados', 'dados_enem_natureza.xlsx')
-    
-    # Verifica se o arquivo existe para dar um erro amigável se não achar
-    if not os.path.exists(caminho_arquivo):
-        st.error(f"Arquivo não encontrado em: {caminho_arquivo}")
-        return pd.DataFrame() # Retorna vazio para não quebrar o app
+    if estado is None:
+        try:
+            estado = estado_dados()
+        except FileNotFoundError as e:
+            # Erro amigável se não achar a planilha
+            st.error(str(e))
+            return pd.DataFrame() # Retorna vazio para não quebrar o app
+        except Exception as e:
+            st.error(f"Erro ao ler o arquivo local: {e}")
+            return pd.DataFrame()
 
-    try:
-        # 2. Ler o Excel usando Pandas
-        # sheet_name é o equivalente ao worksheet do gsheets
-        df = pd.read_excel(caminho_arquivo, sheet_name=nome_da_aba)
-        
-        return df
-        
-    except ValueError:
+    limites = estado["limites"]
+    if nome_da_aba not in limites:
         st.error(f"A aba '{nome_da_aba}' não foi encontrada no arquivo Excel.")
         return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Erro ao ler o arquivo local: {e}")
-        return pd.DataFrame()
-    
-    # No final do arquivo utils.py
-
-def menu_lateral():
-    caminho_logo = "assets/Logo EPUFABC - Branco (2).png"
-    # Título ou Logo na barra lateral
-    # Exibe a imagem local. 
-    # use_column_width=False permite controlar o tamanho com 'width'
-    st.sidebar.image(caminho_logo, width=150)    
-    st.sidebar.title("Navegação")
-    
-    # Links para as páginas
-    # Nota: O caminho deve ser relativo à raiz onde você roda o comando streamlit run
-    
-    st.sidebar.page_link("home.py", label="Página Inicial", icon="🏠")
-    
-    st.sidebar.markdown("---") # Separador visual
-    st.sidebar.subheader("Disciplinas")
-    
-    st.sidebar.page_link("pages/fisica.py", label="Física", icon="⚛️")
-    st.sidebar.page_link("pages/quimica.py", label="Química", icon="🧪")
-    st.sidebar.page_link("pages/biologia.py", label="Biologia", icon="🧬")
\ No newline at end of file
+
+    return dataframe(estado["questoes"], nome_da_aba)
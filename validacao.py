@@ -0,0 +1,191 @@
+import pandas as pd
+import datetime
+import re
+import unicodedata
+from collections import Counter
+
+from base_questoes import APLICACOES, APLICACAO_PADRAO
+
+# Validação e canonização das abas da planilha, feitas uma vez, na compilação do cache
+# (utils.compilar_cache_colunar), antes de particionar. Depois disso as páginas recebem
+# rótulos já limpos e tipados e não corrigem nada a cada rerun.
+#
+# Rótulos (Frente, Tópico, Subtópicos, Tipo, Aplicação):
+#   - Unicode NFC, sem espaços nas pontas nem repetidos; vazio vira ausente
+#   - variantes que só diferem em maiúsculas/minúsculas viram a forma mais frequente
+#     na aba ("mecânica" e "Mecânica " -> "Mecânica"); os dois Subtópicos juntos
+#   - Tipo: um de TIPOS_QUESTAO, sem diferenciar maiúsculas nem espaços ("?" e
+#     "( ? )" -> "(?)"); qualquer outro valor vira TIPO_INCERTO
+#   - Aplicação: uma de APLICACOES, sem diferenciar maiúsculas nem acentos; vazia é
+#     a aplicação regular
+# Número (Cinza) que não é número fica vazio. Linhas rejeitadas (fora da base): sem Ano
+# válido, com Aplicação desconhecida ou repetidas (mesmo Ano, Aplicação e Número de
+# uma linha anterior, que seria contada duas vezes).
+#
+# Cada ajuste e cada rejeição vai para o relatório da aba (gravado junto do cache).
+
+# Muda quando as regras mudam: caches compilados com regras antigas são refeitos
+# (o cache guarda versao_regras(), que também leva o último Ano aceito)
+VERSAO_REGRAS = 1
+
+ANO_MINIMO = 1998  # Primeiro ENEM
+TIPO_INCERTO = "(?)"
+TIPOS_QUESTAO = ["Conta", "Conceitual", "Mista", TIPO_INCERTO]
+
+# Colunas que compartilham o vocabulário: a forma canônica é escolhida entre todas elas
+GRUPOS_ROTULOS = [["Frente"], ["Tópico"], ["Subtópico 1", "Subtópico 2"]]
+
+
+def ano_maximo():
+    """Último Ano aceito: o ano que vem (a prova pode ser cadastrada antes de acontecer)."""
+    return datetime.date.today().year + 1
+
+
+def versao_regras():
+    """
+    Identificador das regras em vigor: VERSAO_REGRAS e o último Ano aceito. Muda na
+    virada do ano, e o cache compilado antes dela é validado de novo.
+    """
+    return f"{VERSAO_REGRAS}-{ano_maximo()}"
+
+
+def limpar_rotulo(valor):
+    """Rótulo em NFC, sem espaços nas pontas nem repetidos; None se vazio."""
+    if pd.isna(valor):
+        return None
+    texto = re.sub(r"\s+", " ", unicodedata.normalize("NFC", str(valor))).strip()
+    return texto or None
+
+
+def _chave_vocabulario(texto):
+    # Comparação com vocabulário fixo: sem acentos, maiúsculas, espaços nem parênteses
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[\s()]+", "", texto.casefold())
+
+
+def _mapa_vocabulario(valores, vocabulario):
+    """{valor limpo: forma do vocabulário}; valores fora do vocabulário ficam fora do mapa."""
+    formas = {_chave_vocabulario(forma): forma for forma in vocabulario}
+    return {valor: formas[_chave_vocabulario(valor)] for valor in valores if _chave_vocabulario(valor) in formas}
+
+
+def _mapa_canonico(series):
+    """
+    {valor limpo: forma canônica} das variantes de caixa nas colunas dadas: a forma
+    mais frequente (no empate, a que aparece primeiro).
+    :param series: Colunas (já limpas) que compartilham o vocabulário
+    """
+    frequencias = Counter()
+    for serie in series:
+        frequencias.update(serie.dropna().tolist())
+    canonicas = {}
+    for valor, quantidade in frequencias.items():
+        chave = valor.casefold()
+        if chave not in canonicas or quantidade > frequencias[canonicas[chave]]:
+            canonicas[chave] = valor
+    return {valor: canonicas[valor.casefold()] for valor in frequencias}
+
+
+def _ajustar(df, coluna, original, novos, ajustes, motivo):
+    # Registra no relatório cada troca de valor (uma entrada por par de/para)
+    mudou = (original.astype(object).ne(novos.astype(object))) & ~(original.isna() & novos.isna())
+    if mudou.any():
+        pares = Counter(zip(original[mudou].astype(object), novos[mudou].astype(object)))
+        for (de, para), linhas in pares.items():
+            ajustes.append({
+                "coluna": coluna,
+                "de": None if pd.isna(de) else str(de),
+                "para": None if pd.isna(para) else para,
+                "linhas": linhas,
+                "motivo": motivo,
+            })
+    df[coluna] = novos
+
+
+def _rejeitar(df, mascara, motivo, coluna, rejeitadas):
+    for origem, valor in df.loc[mascara, coluna].items():
+        rejeitadas.append({"linha": str(origem), "motivo": motivo, "valor": None if pd.isna(valor) else str(valor)})
+    return df[~mascara]
+
+
+def validar_aba(df, nome_da_aba):
+    """
+    Valida e canoniza uma aba lida da planilha.
+    :param df: DataFrame da aba; o índice identifica a linha de origem (ex: "dados.xlsx:12")
+    :param nome_da_aba: Nome da aba, para as mensagens de erro
+    :return: (DataFrame só com as linhas aceitas, relatório {"linhas", "aceitas",
+             "rejeitadas": [{linha, motivo, valor}], "ajustes": [{coluna, de, para, linhas, motivo}]})
+    """
+    df = df.rename(columns=lambda coluna: str(coluna).strip()).copy()
+    relatorio = {"linhas": len(df), "aceitas": len(df), "rejeitadas": [], "ajustes": []}
+    if df.empty:
+        return df, relatorio
+    if "Ano" not in df.columns:
+        raise ValueError(f"A aba '{nome_da_aba}' não tem a coluna Ano")
+    rejeitadas, ajustes = relatorio["rejeitadas"], relatorio["ajustes"]
+
+    # Ano: inteiro entre o primeiro ENEM e o ano que vem
+    ano = pd.to_numeric(df["Ano"], errors="coerce")
+    ano_valido = ano.notna() & (ano == ano.round()) & (ano >= ANO_MINIMO) & (ano <= ano_maximo())
+    df = _rejeitar(df, ~ano_valido, "Ano inválido", "Ano", rejeitadas)
+    df["Ano"] = ano[ano_valido].astype("int16")
+
+    # Rótulos livres: limpos e com uma única forma por variante de caixa
+    for grupo in GRUPOS_ROTULOS:
+        presentes = [coluna for coluna in grupo if coluna in df.columns]
+        limpas = {coluna: df[coluna].map(limpar_rotulo, na_action="ignore").astype(object) for coluna in presentes}
+        mapa = _mapa_canonico(limpas.values())
+        for coluna in presentes:
+            _ajustar(df, coluna, df[coluna], limpas[coluna].map(mapa, na_action="ignore"), ajustes, "Forma canônica")
+
+    # Vocabulários fixos
+    if "Tipo" in df.columns:
+        limpos = df["Tipo"].map(limpar_rotulo, na_action="ignore").astype(object)
+        mapa = _mapa_vocabulario(limpos.dropna().unique(), TIPOS_QUESTAO)
+        desconhecido = limpos.notna() & ~limpos.isin(list(mapa))
+        _ajustar(df, "Tipo", df["Tipo"], limpos.map(mapa).where(~desconhecido, df["Tipo"]), ajustes, "Forma canônica")
+        _ajustar(df, "Tipo", df["Tipo"], df["Tipo"].where(~desconhecido, TIPO_INCERTO), ajustes, "Tipo desconhecido")
+
+    if "Aplicação" in df.columns:
+        limpas = df["Aplicação"].map(limpar_rotulo, na_action="ignore").astype(object)
+        mapa = _mapa_vocabulario(limpas.dropna().unique(), APLICACOES)
+        desconhecida = limpas.notna() & ~limpas.isin(list(mapa))
+        df = _rejeitar(df, desconhecida, "Aplicação desconhecida", "Aplicação", rejeitadas)
+        aplicacoes = limpas[~desconhecida].map(mapa, na_action="ignore").fillna(APLICACAO_PADRAO)
+        _ajustar(df, "Aplicação", df["Aplicação"], aplicacoes, ajustes, "Forma canônica")
+
+    if "Número (Cinza)" in df.columns:
+        numero = pd.to_numeric(df["Número (Cinza)"], errors="coerce")
+        invalido = df["Número (Cinza)"].notna() & numero.isna()
+        _ajustar(df, "Número (Cinza)", numero.astype(object).where(~invalido, df["Número (Cinza)"]), numero, ajustes, "Número inválido")
+
+        # Mesma questão duas vezes (ex: em duas planilhas): fica a primeira
+        chave = ["Ano", "Aplicação", "Número (Cinza)"] if "Aplicação" in df.columns else ["Ano", "Número (Cinza)"]
+        repetida = df["Número (Cinza)"].notna() & df.duplicated(subset=chave, keep="first")
+        df = _rejeitar(df, repetida, "Questão repetida", "Número (Cinza)", rejeitadas)
+
+    relatorio["aceitas"] = len(df)
+    return df, relatorio
+
+
+def validar_abas(abas):
+    """
+    Valida e canoniza as abas lidas (validar_aba).
+    :param abas: dict {nome_da_aba: DataFrame}
+    :return: (dict {nome_da_aba: DataFrame}, dict {nome_da_aba: relatório})
+    """
+    validas = {}
+    relatorios = {}
+    for nome_da_aba, df in abas.items():
+        validas[nome_da_aba], relatorios[nome_da_aba] = validar_aba(df, nome_da_aba)
+    return validas, relatorios
+
+
+def resumo_relatorio(relatorio):
+    """Contagens do relatório de uma aba: {"linhas", "aceitas", "rejeitadas", "ajustes"}."""
+    return {
+        "linhas": relatorio["linhas"],
+        "aceitas": relatorio["aceitas"],
+        "rejeitadas": len(relatorio["rejeitadas"]),
+        "ajustes": sum(ajuste["linhas"] for ajuste in relatorio["ajustes"]),
+    }